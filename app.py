@@ -1,13 +1,12 @@
 from dotenv import load_dotenv
 load_dotenv()  # ✅ Load environment variables before anything else
 
-from flask import Flask, render_template, g, request
+from flask import Flask, render_template, g, request, session
 from config import Config
 from extensions import db, login_manager
 from datetime import timedelta
 import os
 import time
-import jobapi_client
 
 
 def create_app():
@@ -33,18 +32,19 @@ def create_app():
     # -------------------------------------------------------
     # Load User for Flask-Login
     # -------------------------------------------------------
-    from models.simple_models import User
+    from services.identity_service import identity_cache, SESSION_KEY
 
     @login_manager.user_loader
     def load_user(user_id):
+        """Cached identity (services/identity_service.py); the session keeps its version stamp."""
         try:
-            print(f"🔍 Loading user with ID: {user_id}")
-            user = db.session.get(User, int(user_id))  # ✅ SQLAlchemy 2.0 compatible
-            print(f"✅ User loaded: {user}")
-            return user
+            user, version = identity_cache.load(int(user_id), session.get(SESSION_KEY))
         except Exception as e:
-            print(f"❌ Error loading user {user_id}: {e}")
+            app.logger.warning(f"❌ Error loading user {user_id}: {e}")
             return None
+        if user is not None and session.get(SESSION_KEY) != version:
+            session[SESSION_KEY] = version
+        return user
 
     # -------------------------------------------------------
     # Request Performance Timer
@@ -59,6 +59,18 @@ def create_app():
             g.request_time = round(time.time() - g.start_time, 3)
         return response
 
+    # -------------------------------------------------------
+    # Job Catalog & Search History: batch writes at request end
+    # -------------------------------------------------------
+    @app.teardown_request
+    def flush_job_catalog(exc):
+        from services.catalog_service import catalog_service, pending_count
+        from services.ingestion_service import pending_searches
+        if exc is not None:
+            return  # a failed request writes nothing; staged jobs wait for the next one
+        if pending_count() or pending_searches():
+            catalog_service.flush_later(app)  # upserted on the flusher thread's own connection
+
     # -------------------------------------------------------
     # Register Blueprints
     # -------------------------------------------------------
@@ -88,20 +100,53 @@ def create_app():
         """Quick health check endpoint."""
         return {"status": "ok", "message": "JobSeeker backend running", "time": time.ctime()}
 
+    @app.route("/health/transport")
+    def transport_health():
+        """Provider connection pools (requests, retries, saturation per host), coalescing and negative cache."""
+        import provider_transport
+        from utils.cache import provider_flight, negative_cache
+        return {"hosts": provider_transport.transport_stats(), "single_flight": provider_flight.stats(),
+                "negative_cache": negative_cache.stats()}
+
+    @app.route("/health/providers")
+    def providers_health():
+        """Circuit breaker state, health score, failure rate and p95 latency per provider."""
+        import provider_health
+        return {"providers": provider_health.provider_health()}
+
+    @app.route("/health/users")
+    def users_health():
+        """Identity cache behind Flask-Login's user_loader (hit rate, stale stamps, invalidations)."""
+        from services.identity_service import identity_cache
+        return {"identity_cache": identity_cache.stats()}
+
+    @app.route("/health/jobs")
+    def job_id_health():
+        """Job id scheme counters (native vs hashed ids, repeats, collisions)."""
+        from utils.job_ids import id_stats
+        return {"ids": id_stats()}
+
     # -------------------------------------------------------
-    # ✅ Auto-create database tables (fixes Render issue)
+    # ✅ Database schema: check the version stamp (migrations.py)
     # -------------------------------------------------------
     with app.app_context():
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        tables = inspector.get_table_names()
+        import migrations
+        version = migrations.check(db.engine)
+        app.logger.info(f"📊 Database schema version {version} (latest {migrations.LATEST})")
 
-        if not tables:
-            print("📦 No tables found — initializing database...")
-            db.create_all()
-            print("✅ Tables created successfully.")
-        else:
-            print(f"📊 Existing tables found: {tables}")
+    # -------------------------------------------------------
+    # 🔥 Warm-up: templates and provider clients, off the boot path (utils/warmup.py)
+    # -------------------------------------------------------
+    from utils.warmup import use_template_bytecode_cache, start_warmup
+    use_template_bytecode_cache(app)
+    start_warmup(app)
+
+    # -------------------------------------------------------
+    # Background ingestion (pre-warms popular searches)
+    # -------------------------------------------------------
+    if os.getenv("INGEST_SCHEDULER", "").lower() == "inprocess":
+        from services.ingestion_service import start_in_process
+        start_in_process(app)
 
     return app
 
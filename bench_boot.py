@@ -0,0 +1,84 @@
+"""
+Benchmark worker boot: time-to-first-request over fresh interpreters, and what each
+module imported by app.py costs.
+
+    python bench_boot.py                 # 5 boots, first request to /
+    python bench_boot.py 10 /about       # boots, then the path to request
+    BOOT_WARMUP=sync python bench_boot.py
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+BOOT_SNIPPET = """
+import json, time
+started = time.perf_counter()
+import app
+booted = time.perf_counter()
+response = app.app.test_client().get({path!r})
+served = time.perf_counter()
+print(json.dumps({{"boot": booted - started, "first": served - booted, "status": response.status_code}}))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    # A scratch database that is migrated once, so boots measure the stamp check only
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'jobseeker_bench_boot.db')}")
+    return env
+
+
+def boot_once(path):
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", BOOT_SNIPPET.format(path=path)], cwd=ROOT, env=_env(),
+                         capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["wall"] = time.perf_counter() - started
+    return result
+
+
+def import_costs():
+    """(module, self µs, cumulative µs) for everything app.py imports directly."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"], cwd=ROOT, env=_env(),
+                         capture_output=True, text=True, check=True)
+    children = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2  # -X importtime indents two spaces per level
+        row = (name.strip(), int(self_us.split(":")[-1]), int(cumulative_us))
+        if depth == 1:
+            children.append(row)
+        elif depth == 0:
+            if row[0] == "app":  # rows are post-order: app's direct imports were listed just before it
+                return children + [row]
+            children = []
+    return []
+
+
+def main():
+    boots = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    path = sys.argv[2] if len(sys.argv) > 2 else "/"
+    boot_once(path)  # migrates the scratch database, fills the template bytecode cache
+
+    print(f"🚀 {boots} boots, first request GET {path} (BOOT_WARMUP={os.getenv('BOOT_WARMUP', 'background')})")
+    runs = [boot_once(path) for _ in range(boots)]
+    for key, label in (("boot", "import + create_app"), ("first", "first request"), ("wall", "process to response")):
+        values = sorted(r[key] * 1000 for r in runs)
+        print(f"⏱️  {label:<20} median {values[len(values) // 2]:7.1f} ms   min {values[0]:7.1f} ms")
+    print(f"   status {sorted({r['status'] for r in runs})}")
+
+    print("\n📦 Import cost (modules imported by app.py, cumulative)")
+    for name, self_us, cumulative_us in sorted(import_costs(), key=lambda c: -c[2])[:15]:
+        print(f"   {cumulative_us / 1000:7.1f} ms  (self {self_us / 1000:5.1f} ms)  {name}")
+
+
+if __name__ == "__main__":
+    main()
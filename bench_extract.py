@@ -0,0 +1,60 @@
+"""
+Benchmark the scraper's HTML extraction engines over the saved result pages.
+
+    python bench_extract.py              # every available engine, 50 rounds
+    python bench_extract.py 200 stream   # rounds, then engine names
+"""
+
+import os
+import sys
+import glob
+import time
+import tracemalloc
+
+from utils.html_extract import ENGINES
+from services.scraper_service import parse_naukri, parse_indeed
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "scraper")
+
+
+def load_pages():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            parse = parse_naukri if os.path.basename(path).startswith("naukri") else parse_indeed
+            pages.append((parse, f.read()))
+    return pages
+
+
+def bench(engine, pages, rounds):
+    jobs = sum(len(parse(html, "Bengaluru", engine)) for parse, html in pages)  # warm-up + sanity count
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for parse, html in pages:
+            parse(html, "Bengaluru", engine)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for parse, html in pages:
+        parse(html, "Bengaluru", engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return jobs, rounds * len(pages) / elapsed, peak
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    names = sys.argv[2:] or list(ENGINES)
+    pages = load_pages()
+    print(f"📄 {len(pages)} pages, {rounds} rounds")
+    for name in names:
+        if not ENGINES[name].available():
+            print(f"⏭️  {name:<7} not installed")
+            continue
+        jobs, rate, peak = bench(ENGINES[name](), pages, rounds)
+        print(f"⚡ {name:<7} {rate:8.1f} pages/s   peak {peak / 1024:8.1f} KiB   {jobs} jobs")
+
+
+if __name__ == "__main__":
+    main()
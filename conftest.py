@@ -0,0 +1,16 @@
+import os
+import shutil
+import tempfile
+
+# Tests get process-local caches: the default SQLite L2 cache (jobseeker_cache.db) would
+# carry entries from one run into the next. Set before any test imports utils.cache.
+os.environ.setdefault("CACHE_BACKEND", "memory")
+
+# Tests that go through create_app() (config.Config reads DATABASE_URL at import) get a
+# scratch database instead of the developer's jobseeker.db.
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="jobseeker-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_TEST_DB_DIR, 'jobseeker.db')}")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_TEST_DB_DIR, ignore_errors=True)
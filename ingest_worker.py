@@ -0,0 +1,33 @@
+"""
+Standalone ingestion worker: pre-warms popular searches outside the web workers.
+
+    python ingest_worker.py            # run forever (INGEST_INTERVAL seconds between ticks)
+    python ingest_worker.py --once     # single tick, e.g. from cron
+"""
+
+import sys
+import logging
+
+from app import app
+from services.ingestion_service import IngestionScheduler
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    scheduler = IngestionScheduler(app)
+
+    if "--once" in sys.argv:
+        count = scheduler.run_once()
+        print(f"✅ Ingested {count} jobs ({dict(scheduler.stats)})")
+        return
+
+    print("🌡️ Ingestion worker running. Press Ctrl+C to stop.")
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+        print("\n🛑 Ingestion worker stopped.")
+
+
+if __name__ == "__main__":
+    main()
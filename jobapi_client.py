@@ -4,8 +4,22 @@ Priority: Mantiks -> Jooble -> Adzuna -> Mock Data
 """
 
 import os
+import time
+import threading
 import requests
 import logging
+import provider_transport
+import provider_health
+from provider_health import CircuitOpen
+from utils.cache import search_cache, search_key, provider_flight, negative_cache, NOT_FOUND
+from services.catalog_service import stage_job
+from services.query_planner import QueryPlan, ADZUNA_JOB_TYPES
+from utils.salary import with_salary_fields
+from utils.locations import with_location_fields
+from utils.dedup import NearDuplicateFilter
+from utils.job_ids import make_job_id, provider_native_id
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -22,14 +36,28 @@ ADZUNA_COUNTRY = os.getenv("ADZUNA_COUNTRY", "in")  # 'in' for India
 
 DEFAULT_TIMEOUT = 10
 
+# Fan-out settings (parallel provider search)
+FANOUT_WORKERS_PER_PROVIDER = int(os.getenv("FANOUT_WORKERS_PER_PROVIDER", "4"))
+FANOUT_DEADLINE = float(os.getenv("FANOUT_DEADLINE", "4"))
+HEDGE_DEFAULT_DELAY = float(os.getenv("HEDGE_DEFAULT_DELAY", "1.5"))
+HEDGE_MIN_DELAY = 0.05
+HEDGE_MIN_SAMPLES = 5
+
 
 # -----------------------------
 # Normalizer & Helpers
 # -----------------------------
+def _call_budget(deadline_at=None):
+    """(timeout, retries) for one provider call: inside a fan-out, its remaining time and no retries."""
+    if deadline_at is None:
+        return DEFAULT_TIMEOUT, None
+    return max(0.1, min(DEFAULT_TIMEOUT, deadline_at - time.monotonic())), 0
+
+
 def _norm(job: dict, source: str) -> dict:
-    """Normalize job dict from any provider to a common shape."""
-    return {
-        "id": str(job.get("id") or job.get("job_id") or job.get("unique_id") or job.get("url") or ""),
+    """Normalize job dict from any provider to a common shape (and stage it for the catalog)."""
+    normalized = {
+        "id": "",
         "title": job.get("title") or job.get("job_title") or job.get("position") or "Untitled Job",
         "company": job.get("company") or job.get("company_name") or job.get("employer") or "Unknown Company",
         "location": job.get("location") or job.get("area") or job.get("city") or "Not specified",
@@ -41,62 +69,97 @@ def _norm(job: dict, source: str) -> dict:
         "remote": bool(job.get("remote", False)),
         "source": source
     }
+    normalized["id"] = make_job_id(source, job.get("id") or job.get("job_id") or job.get("unique_id"),
+                                   normalized["title"], normalized["company"], normalized["location"],
+                                   normalized["url"])
+    with_salary_fields(normalized)
+    with_location_fields(normalized)
+    stage_job(normalized)
+    return normalized
 
 
 # -----------------------------
 # Mantiks API
 # -----------------------------
-def _mantiks_search(title=None, location=None, limit=25, page=1):
+def _mantiks_search(title=None, location=None, limit=25, page=1, job_type=None, deadline_at=None):
     if not MANTIKS_API_KEY:
         logger.info("Mantiks key not set")
         return []
     endpoint = f"{MANTIKS_BASE_URL.rstrip('/')}/api/v1/jobs/search"
-    params = {"title": title, "location": location, "limit": limit, "page": page}
+    params = {"title": title, "location": location, "limit": limit, "page": page, "job_type": job_type}
     params = {k: v for k, v in params.items() if v}
     headers = {"Authorization": f"Bearer {MANTIKS_API_KEY}", "Accept": "application/json"}
+    miss_key = ("search", title, location, job_type, page)
+    if negative_cache.hit("Mantiks", miss_key):
+        return []
 
     try:
         logger.info(f"🔹 Calling Mantiks: {endpoint} params={params}")
-        resp = requests.get(endpoint, headers=headers, params=params, timeout=DEFAULT_TIMEOUT)
-        resp.raise_for_status()
-        data = resp.json()
+        with provider_health.breaker("Mantiks").guard():
+            timeout, retries = _call_budget(deadline_at)
+            resp = provider_transport.get(endpoint, headers=headers, params=params, timeout=timeout, retries=retries)
+            resp.raise_for_status()
+            data = resp.json()
         jobs = data.get("jobs") or data.get("data") or data.get("results") or []
+        negative_cache.record("Mantiks", miss_key, jobs)
         return [_norm(j, "Mantiks") for j in jobs]
+    except CircuitOpen:
+        logger.info("⏭️ Mantiks circuit open, skipped")
+        return []
     except Exception as e:
         logger.error(f"Mantiks API error: {e}")
+        negative_cache.record_error("Mantiks", miss_key, e)
         return []
 
 
 # -----------------------------
 # Jooble API
 # -----------------------------
-def _jooble_search(keyword=None, location=None, limit=25):
+def _jooble_search(keyword=None, location=None, limit=25, page=1, salary_min=None, deadline_at=None):
     if not JOOBLE_API_KEY:
         logger.info("Jooble key not set")
         return []
     endpoint = "https://jooble.org/api/search"
     headers = {"Content-Type": "application/json", "X-Api-Key": JOOBLE_API_KEY}
-    payload = {"keyword": keyword or "", "location": location or "", "page": 1, "limit": limit}
+    payload = {"keyword": keyword or "", "location": location or "", "page": page, "limit": limit}
+    if salary_min:
+        payload["salary"] = int(salary_min)
+    miss_key = ("search", keyword, location, salary_min, page)
+    if negative_cache.hit("Jooble", miss_key):
+        return []
 
     try:
         logger.info(f"🔹 Calling Jooble: {endpoint}")
-        resp = requests.post(endpoint, json=payload, headers=headers, timeout=DEFAULT_TIMEOUT)
-        resp.raise_for_status()
-        data = resp.json()
+        # Search is read-only, so it is safe to retry like a GET
+        with provider_health.breaker("Jooble").guard():
+            timeout, retries = _call_budget(deadline_at)
+            resp = provider_transport.post(endpoint, json=payload, headers=headers, timeout=timeout,
+                                           idempotent=True, retries=retries)
+            resp.raise_for_status()
+            data = resp.json()
         jobs = data.get("jobs") or data.get("results") or []
+        negative_cache.record("Jooble", miss_key, jobs)
         return [_norm(j, "Jooble") for j in jobs]
+    except CircuitOpen:
+        logger.info("⏭️ Jooble circuit open, skipped")
+        return []
     except Exception as e:
         logger.error(f"Jooble API error: {e}")
+        negative_cache.record_error("Jooble", miss_key, e)
         return []
 
 
 # -----------------------------
 # Adzuna API
 # -----------------------------
-def _adzuna_search(keyword=None, location=None, limit=25, page=1):
+def _adzuna_search(keyword=None, location=None, limit=25, page=1, job_type=None, salary_min=None,
+                   deadline_at=None):
     if not (ADZUNA_APP_ID and ADZUNA_APP_KEY):
         logger.info("Adzuna credentials not set")
         return []
+    miss_key = ("search", keyword, location, job_type, salary_min, page)
+    if negative_cache.hit("Adzuna", miss_key):
+        return []
     try:
         endpoint = f"https://api.adzuna.com/v1/api/jobs/{ADZUNA_COUNTRY}/search/{page}"
         params = {
@@ -106,14 +169,26 @@ def _adzuna_search(keyword=None, location=None, limit=25, page=1):
             "where": location or "",
             "results_per_page": limit
         }
+        if salary_min:
+            params["salary_min"] = int(salary_min)
+        contract_flag = ADZUNA_JOB_TYPES.get((job_type or "").lower())
+        if contract_flag:
+            params[contract_flag] = 1
         logger.info(f"🔹 Calling Adzuna: {endpoint}")
-        r = requests.get(endpoint, params=params, timeout=DEFAULT_TIMEOUT)
-        r.raise_for_status()
-        data = r.json()
+        with provider_health.breaker("Adzuna").guard():
+            timeout, retries = _call_budget(deadline_at)
+            r = provider_transport.get(endpoint, params=params, timeout=timeout, retries=retries)
+            r.raise_for_status()
+            data = r.json()
         jobs = data.get("results") or []
+        negative_cache.record("Adzuna", miss_key, jobs)
         return [_norm(j, "Adzuna") for j in jobs]
+    except CircuitOpen:
+        logger.info("⏭️ Adzuna circuit open, skipped")
+        return []
     except Exception as e:
         logger.error(f"Adzuna API error: {e}")
+        negative_cache.record_error("Adzuna", miss_key, e)
         return []
 
 
@@ -187,7 +262,26 @@ MANTIKS_API_URL = "https://api.mantiks.io/api/v1/jobs/search"
 def fetch_jobs(title=None, location=None, limit=25, page=1, **kwargs):
     """
     Fetch jobs from Mantiks API. Falls back gracefully to mock data if unavailable.
+    Pass fanout=True to query every provider in parallel instead (see fetch_jobs_fanout).
+    Results are served from the shared search cache when available.
     """
+    if kwargs.get("fanout"):
+        plan = QueryPlan(title, location, kwargs.get("job_type"), kwargs.get("salary_min"), limit)
+        key = search_key(title, location, plan.signature(), page, "fanout", limit)
+        deadline = kwargs.get("timeout") or FANOUT_DEADLINE
+        jobs = search_cache.get_or_load(key, lambda: fetch_jobs_fanout(
+            title=title, location=location, limit=limit, page=page,
+            deadline=deadline, min_results=kwargs.get("min_results"), plan=plan),
+            deadline_at=time.monotonic() + deadline)  # a follower waits no longer than its own search
+        return (jobs or [])[:limit]
+
+    key = search_key(title, location, None, page, "Mantiks", limit)
+    jobs = search_cache.get_or_load(key, lambda: _fetch_mantiks_jobs(title, location, limit, page))
+    return (jobs or [])[:limit]
+
+
+def _fetch_mantiks_jobs(title=None, location=None, limit=25, page=1):
+    """Uncached Mantiks search returning the raw provider records."""
     api_key = os.getenv("MANTIKS_API_KEY")
     headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
     
@@ -197,28 +291,52 @@ def fetch_jobs(title=None, location=None, limit=25, page=1, **kwargs):
         "limit": limit,
         "page": page
     }
+    miss_key = ("search", params["title"], params["location"], None, page)
+    if negative_cache.hit("Mantiks", miss_key):
+        return []
 
     try:
         print(f"🔍 Fetching jobs from Mantiks: {params}")
-        response = requests.get(MANTIKS_API_URL, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        with provider_health.breaker("Mantiks").guard():
+            response = provider_transport.get(MANTIKS_API_URL, headers=headers, params=params, timeout=10)
+            response.raise_for_status()
+            data = response.json()
 
         if isinstance(data, dict) and "results" in data:
-            return data["results"]
+            results = data["results"]
         elif isinstance(data, list):
-            return data  # Some APIs return raw list
+            results = data  # Some APIs return raw list
         else:
             print("⚠️ Unexpected Mantiks API response structure.")
-            return []
+            results = []
+        negative_cache.record("Mantiks", miss_key, results)
+        return results
 
-    except requests.exceptions.RequestException as e:
+    except CircuitOpen:
+        print("⏭️ Mantiks circuit open, skipping fetch")
+        return []
+    except (requests.exceptions.RequestException, ValueError) as e:
         print(f"❌ Mantiks API fetch failed: {e}")
+        negative_cache.record_error("Mantiks", miss_key, e)
         return []
 
 
-def fetch_job_by_id(job_id):
-    """Fetch detailed job info by ID from Mantiks API."""
+def fetch_job_by_id(job_id, deadline_at=None):
+    """
+    Fetch detailed job info by ID from Mantiks API. Concurrent calls for one id share a
+    request, and ids Mantiks recently did not know (mock ids, other providers' ids) or
+    failed on are answered from the negative cache. With `deadline_at` (the resolver's race)
+    the call gets only the remaining time and no retries.
+    """
+    if provider_native_id(job_id, "Mantiks") is None:
+        return None  # another provider's id
+    if negative_cache.hit("Mantiks", ("detail", job_id)):
+        return None
+    return provider_flight.do(("mantiks-detail", str(job_id)), lambda: _fetch_mantiks_job(job_id, deadline_at),
+                              deadline_at)
+
+
+def _fetch_mantiks_job(job_id, deadline_at=None):
     api_key = os.getenv("MANTIKS_API_KEY")
     if not api_key:
         print("⚠️ No Mantiks API key found.")
@@ -226,15 +344,203 @@ def fetch_job_by_id(job_id):
 
     headers = {"Authorization": f"Bearer {api_key}"}
     try:
-        url = f"https://api.mantiks.io/api/v1/jobs/{job_id}"
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        url = f"https://api.mantiks.io/api/v1/jobs/{provider_native_id(job_id, 'Mantiks')}"
+        with provider_health.breaker("Mantiks").guard():
+            timeout, retries = _call_budget(deadline_at)
+            response = provider_transport.get(url, headers=headers, timeout=timeout, retries=retries)
+            response.raise_for_status()
+            job = response.json()
+        if not job:
+            negative_cache.remember("Mantiks", ("detail", job_id), NOT_FOUND)
+        return job
+    except CircuitOpen:
+        print(f"⏭️ Mantiks circuit open, skipping job {job_id}")
+        return None
+    except (requests.exceptions.RequestException, ValueError) as e:
         print(f"❌ Mantiks job detail fetch failed: {e}")
+        negative_cache.record_error("Mantiks", ("detail", job_id), e)
         return None
 
 
+# -----------------------------
+# JSearch (RapidAPI)
+# -----------------------------
+def _jsearch_search(keyword=None, location=None, limit=25, deadline_at=None):
+    from rapidapi_client import fetch_jobs_from_rapidapi
+    return fetch_jobs_from_rapidapi(title=keyword, location=location, limit=limit, deadline_at=deadline_at)
+
+
+# -----------------------------
+# Parallel fan-out with hedging
+# -----------------------------
+class _ProviderStats:
+    """Rolling latency window for one provider, used to decide when to hedge."""
+
+    def __init__(self, window=100):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p95(self):
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def hedge_delay(self):
+        p95 = self.p95()
+        return HEDGE_DEFAULT_DELAY if p95 is None else max(HEDGE_MIN_DELAY, p95)
+
+
+_fanout_pools = {}  # provider name -> its own small pool, so one hung provider cannot starve the rest
+_provider_stats = {}
+_provider_stats_lock = threading.Lock()
+
+
+def _pool_for(name):
+    with _provider_stats_lock:
+        if name not in _fanout_pools:
+            _fanout_pools[name] = ThreadPoolExecutor(max_workers=FANOUT_WORKERS_PER_PROVIDER,
+                                                     thread_name_prefix=f"fanout-{name.lower()}")
+        return _fanout_pools[name]
+
+
+def _stats_for(name):
+    with _provider_stats_lock:
+        if name not in _provider_stats:
+            _provider_stats[name] = _ProviderStats()
+        return _provider_stats[name]
+
+
+def _timed_call(fn):
+    started = time.monotonic()
+    jobs = fn()
+    return jobs, time.monotonic() - started
+
+
+def _fanout_providers(title, location, limit, page, plan=None, deadline_at=None, quota=None):
+    """
+    One call per provider. Filters the provider supports go into its request (see
+    services.query_planner.PUSHDOWN); the rest are checked on its results, paging on
+    until `limit` jobs pass or the planner's budget is spent. `quota(name)` is asked before
+    every provider request (each page, each hedged copy); False skips that request.
+    """
+    plan = plan or QueryPlan(title, location, limit=limit)
+    job_type = plan.job_type if "job_type" in plan.pushed("Mantiks") else None
+    salary = plan.salary_min
+
+    pages = {
+        "Mantiks": lambda p: _mantiks_search(title=title, location=location, limit=limit, page=p,
+                                             job_type=job_type, deadline_at=deadline_at),
+        "Jooble": lambda p: _jooble_search(keyword=title, location=location, limit=limit, page=p,
+                                           salary_min=salary, deadline_at=deadline_at),
+        "Adzuna": lambda p: _adzuna_search(keyword=title, location=location, limit=limit, page=p,
+                                           job_type=plan.job_type, salary_min=salary, deadline_at=deadline_at),
+        # JSearch is single-page: the query already carries the location
+        "JSearch": lambda p: (_jsearch_search(keyword=title, location=location, limit=limit, deadline_at=deadline_at)
+                              if p == 1 else []),
+    }
+    if quota is not None:
+        pages = {name: (lambda p, name=name, fetch_page=fetch_page: fetch_page(p) if quota(name) else [])
+                 for name, fetch_page in pages.items()}
+    return {name: (lambda name=name, fetch_page=fetch_page: plan.fetch(name, fetch_page, page, deadline_at))
+            for name, fetch_page in pages.items()}
+
+
+def fetch_jobs_fanout(title=None, location=None, limit=25, page=1, deadline=None, min_results=None,
+                      providers=None, provider_names=None, plan=None, quota=None):
+    """
+    Query every provider at once (each on its own small worker pool) and merge results as
+    they arrive. Provider calls made for the fan-out time out at its deadline and are not
+    retried, so stragglers and hedged copies cannot outlive the search that started them.
+    A provider that is still running after its p95 latency gets one hedged duplicate request;
+    whichever copy answers first wins. Returns once `min_results` jobs (default: limit) are in
+    or the deadline passes, whichever comes first. `provider_names` restricts the fan-out
+    to a subset of providers and `quota` charges every request made to them (both used by
+    the ingestion scheduler). `plan` carries the search filters (see services.query_planner.QueryPlan).
+    """
+    deadline_at = time.monotonic() + (deadline or FANOUT_DEADLINE)
+    calls = providers or _fanout_providers(title, location, limit, page, plan, deadline_at, quota)
+    if provider_names is not None:
+        calls = {name: fn for name, fn in calls.items() if name in provider_names}
+    skipped = [name for name in calls if not provider_health.is_available(name)]
+    if skipped:
+        logger.info(f"⏭️ Skipping providers with open circuits: {skipped}")
+        calls = {name: fn for name, fn in calls.items() if name not in skipped}
+    want = min_results or limit
+
+    pending = {}      # future -> provider name
+    started_at = {}   # provider name -> monotonic start of first attempt
+    hedged, finished = set(), set()
+    merged = []
+    dedup = NearDuplicateFilter()  # one posting listed by several providers is kept once
+
+    for name, fn in calls.items():
+        pending[_pool_for(name).submit(_timed_call, fn)] = name
+        started_at[name] = time.monotonic()
+
+    while pending and len(merged) < want:
+        now = time.monotonic()
+        if now >= deadline_at:
+            break
+
+        # Hedge providers that are slower than their usual p95
+        wake_at = deadline_at
+        for name, fn in calls.items():
+            if name in finished or name in hedged:
+                continue
+            hedge_at = started_at[name] + _stats_for(name).hedge_delay()
+            if now >= hedge_at:
+                logger.info(f"🔁 Hedging slow provider {name}")
+                pending[_pool_for(name).submit(_timed_call, fn)] = name
+                hedged.add(name)
+            else:
+                wake_at = min(wake_at, hedge_at)
+
+        done, _ = wait(list(pending), timeout=max(0, wake_at - now), return_when=FIRST_COMPLETED)
+        for fut in done:
+            name = pending.pop(fut)
+            if name in finished:
+                continue  # the other copy of a hedged request already answered
+            try:
+                jobs, elapsed = fut.result()
+            except Exception as e:
+                logger.error(f"{name} fan-out call failed: {e}")
+                if name not in pending.values():
+                    finished.add(name)
+                continue
+
+            finished.add(name)
+            _stats_for(name).record(elapsed)
+            for other, other_name in list(pending.items()):
+                if other_name == name:
+                    other.cancel()
+                    pending.pop(other)
+
+            for job in jobs or []:
+                kept = dedup.add(job)
+                if kept is not None:
+                    merged.append(kept)
+                else:
+                    stage_job(dedup.merged_into)  # the kept copy may have picked up salary, description, ...
+            logger.info(f"✅ {name} returned {len(jobs or [])} jobs in {elapsed:.2f}s")
+
+    if pending:
+        logger.info(f"⏱️ Fan-out returned without: {sorted(set(pending.values()))}")
+    if dedup.dropped:
+        logger.info(f"🧬 Merged {dedup.dropped} duplicate listings into {len(merged)} jobs")
+    return merged[:limit]
+
+
+# Cheap 1-result searches let the probe scheduler close a breaker without a user request
+provider_health.register_probe("Mantiks", lambda: _mantiks_search(title="python", limit=1))
+provider_health.register_probe("Jooble", lambda: _jooble_search(keyword="python", limit=1))
+provider_health.register_probe("Adzuna", lambda: _adzuna_search(keyword="python", limit=1))
+
 
 # -----------------------------
 # Test Run
@@ -0,0 +1,249 @@
+import os
+import sys
+import logging
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import (BigInteger, Boolean, Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text,
+                        UniqueConstraint, inspect, select, text)
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------
+# 🗂️ Versioned schema migrations
+# -----------------------------------------------
+# Each migration is idempotent (safe on a database that already has some or all of its
+# changes) and is stamped into schema_version in the same transaction that applies it.
+# Worker boot only reads the stamp; it upgrades when the stamp is behind (fresh /tmp
+# database on Render) unless SCHEMA_AUTO_UPGRADE=0, in which case run
+# `python migrations.py upgrade` as a deploy step.
+AUTO_UPGRADE = os.getenv("SCHEMA_AUTO_UPGRADE", "1") != "0"
+
+Migration = namedtuple("Migration", "version name upgrade")
+
+_stamp_metadata = MetaData()
+schema_version = Table(
+    "schema_version", _stamp_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+# -----------------------------------------------
+# 🧊 Frozen DDL: what each version created when it was written, never the current models
+# -----------------------------------------------
+_v1 = MetaData()
+Table("user", _v1,
+      Column("id", Integer, primary_key=True),
+      Column("username", String(80), nullable=False, unique=True),
+      Column("email", String(120), nullable=False, unique=True),
+      Column("first_name", String(100)),
+      Column("last_name", String(100)),
+      Column("password_hash", String(256), nullable=False),
+      Column("created_at", DateTime))
+for _name, _stamp in (("saved_job", "saved_at"), ("application", "applied_at")):
+    Table(_name, _v1,
+          Column("id", Integer, primary_key=True),
+          Column("user_id", Integer, ForeignKey("user.id"), nullable=False),
+          Column("job_id", String(100), nullable=False),
+          Column("job_title", String(200), nullable=False),
+          Column("job_company", String(100), nullable=False),
+          Column("job_location", String(100), nullable=False),
+          Column("job_type", String(50)),
+          Column("job_salary", String(100)),
+          Column("job_description", Text),
+          Column("job_url", String(500)),
+          Column("job_posted_date", String(50)),
+          Column("job_remote", Boolean),
+          Column("job_source", String(100)),
+          Column(_stamp, DateTime),
+          *([Column("status", String(50)), Column("notes", Text), Column("resume_file", String(255))]
+            if _name == "application" else []),
+          UniqueConstraint("user_id", "job_id",
+                           name="unique_user_job" if _name == "saved_job" else "unique_user_job_application"))
+Table("job_catalog", _v1,
+      Column("id", String(255), primary_key=True),
+      Column("title", String(200), nullable=False),
+      Column("company", String(200)),
+      Column("location", String(200)),
+      Column("job_type", String(50)),
+      Column("salary", String(100)),
+      Column("description", Text),
+      Column("url", String(1000)),
+      Column("posted_date", String(50)),
+      Column("remote", Boolean),
+      Column("source", String(100)),
+      Column("fetched_at", DateTime))
+Table("search_history", _v1,
+      Column("id", Integer, primary_key=True),
+      Column("keyword", String(200), nullable=False),
+      Column("location", String(100), nullable=False),
+      Column("hits", Integer, nullable=False),
+      Column("last_searched_at", DateTime),
+      UniqueConstraint("keyword", "location", name="unique_search_query"))
+
+# Nullable columns version 2 adds to tables created before them
+_V2_COLUMNS = [
+    ("job_catalog", "company", String(200)), ("job_catalog", "location", String(200)),
+    ("job_catalog", "job_type", String(50)), ("job_catalog", "salary", String(100)),
+    ("job_catalog", "description", Text()), ("job_catalog", "url", String(1000)),
+    ("job_catalog", "posted_date", String(50)), ("job_catalog", "remote", Boolean()),
+    ("job_catalog", "source", String(100)), ("job_catalog", "fetched_at", DateTime()),
+    ("job_catalog", "location_id", String(64)), ("job_catalog", "location_state", String(64)),
+    ("job_catalog", "salary_min", BigInteger()), ("job_catalog", "salary_max", BigInteger()),
+    ("job_catalog", "salary_currency", String(3)), ("job_catalog", "salary_period", String(10)),
+]
+
+# Indexes version 3 adds: (name, table, columns)
+_V3_INDEXES = [
+    ("ix_saved_job_user_saved_at", "saved_job", ("user_id", "saved_at")),
+    ("ix_application_user_applied_at", "application", ("user_id", "applied_at")),
+    ("ix_job_catalog_location_id", "job_catalog", ("location_id",)),
+    ("ix_job_catalog_location_state", "job_catalog", ("location_state",)),
+    ("ix_job_catalog_source", "job_catalog", ("source",)),
+    ("ix_job_catalog_fetched_at", "job_catalog", ("fetched_at",)),
+    ("ix_job_catalog_salary_min", "job_catalog", ("salary_currency", "salary_min")),
+    ("ix_job_catalog_salary_max", "job_catalog", ("salary_currency", "salary_max")),
+    ("ix_search_history_last_searched_at", "search_history", ("last_searched_at",)),
+]
+
+
+class MigrationError(RuntimeError):
+    """A migration could not complete; it is not stamped and is retried on the next upgrade."""
+
+
+def _create_tables(conn):
+    """Every version-1 table that does not exist yet."""
+    _v1.create_all(conn, checkfirst=True)
+
+
+def _add_missing_columns(conn):
+    """Catalog columns added after the table was first created (salary / location)."""
+    inspector = inspect(conn)
+    existing = {}
+    added = []
+    for table, name, column_type in _V2_COLUMNS:
+        if table not in existing:
+            existing[table] = ({c["name"] for c in inspector.get_columns(table)}
+                               if inspector.has_table(table) else None)
+        if existing[table] is None or name in existing[table]:
+            continue
+        conn.execute(text(f'ALTER TABLE "{table}" ADD COLUMN "{name}" {column_type.compile(dialect=conn.dialect)}'))
+        added.append(f"{table}.{name}")
+    if added:
+        logger.info(f"✅ Added columns: {added}")
+
+
+def _create_model_indexes(conn):
+    """Catalog salary/location, saved/applied by user + date and search history indexes."""
+    for name, table, columns in _V3_INDEXES:
+        quoted = ", ".join(f'"{c}"' for c in columns)
+        conn.execute(text(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({quoted})'))
+
+
+def _user_lookup_indexes(conn):
+    """Login and signup look users up by email and username; make sure both are indexed."""
+    inspector = inspect(conn)
+    leading = {ix["column_names"][0] for ix in inspector.get_indexes("user") if ix["column_names"]}
+    leading |= {uc["column_names"][0] for uc in inspector.get_unique_constraints("user") if uc["column_names"]}
+    for column in ("email", "username"):
+        if column not in leading:  # tables built by hand without the UNIQUE constraints
+            conn.execute(text(f'CREATE INDEX IF NOT EXISTS "ix_user_{column}" ON "user" ("{column}")'))
+
+
+def _full_text_index(conn):
+    if conn.dialect.name != "sqlite":
+        return  # FTS5 is SQLite-only; other databases search the catalog with LIKE
+    from services.search_index import search_index
+    if not search_index.ensure_index(conn):
+        raise MigrationError("could not create the catalog full-text index (FTS5 and its triggers)")
+
+
+MIGRATIONS = [
+    Migration(1, "create tables", _create_tables),
+    Migration(2, "catalog salary and location columns", _add_missing_columns),
+    Migration(3, "hot-path indexes", _create_model_indexes),
+    Migration(4, "user lookup indexes", _user_lookup_indexes),
+    Migration(5, "catalog full-text index", _full_text_index),
+]
+LATEST = MIGRATIONS[-1].version
+
+
+def current_version(engine):
+    """Highest applied migration, 0 for a database that was never stamped."""
+    try:
+        with engine.connect() as conn:
+            if not inspect(conn).has_table("schema_version"):
+                return 0
+            return max((row.version for row in conn.execute(select(schema_version.c.version))), default=0)
+    except SQLAlchemyError as e:
+        logger.warning(f"⚠️ Could not read schema version: {e}")
+        return 0
+
+
+def _applied(conn, version):
+    return conn.execute(select(schema_version.c.version).where(schema_version.c.version == version)).first() is not None
+
+
+def upgrade(engine, target=LATEST):
+    """Apply every pending migration up to `target`, each in its own transaction. Returns the versions applied."""
+    _stamp_metadata.create_all(engine, checkfirst=True)
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version > target:
+            break
+        try:
+            with engine.begin() as conn:
+                if _applied(conn, migration.version):
+                    continue
+                migration.upgrade(conn)
+                conn.execute(schema_version.insert().values(
+                    version=migration.version, name=migration.name, applied_at=datetime.utcnow()))
+            applied.append(migration.version)
+            logger.info(f"🗂️ Applied migration {migration.version}: {migration.name}")
+        except SQLAlchemyError:
+            # Another worker booting at the same time may have applied and stamped it first
+            with engine.connect() as conn:
+                if not _applied(conn, migration.version):
+                    raise
+    return applied
+
+
+def check(engine, auto_upgrade=AUTO_UPGRADE):
+    """Worker boot: one read of the stamp; upgrade only when it is behind and auto-upgrade is on."""
+    version = current_version(engine)
+    if version >= LATEST:
+        return version
+    if not auto_upgrade:
+        logger.warning(f"⚠️ Database schema is at version {version}, code expects {LATEST}; "
+                       f"run `python migrations.py upgrade`")
+        return version
+    try:
+        upgrade(engine)
+    except MigrationError as e:
+        logger.warning(f"⚠️ Schema upgrade stopped, retried on next boot: {e}")
+    return current_version(engine)
+
+
+# -----------------------------------------------
+# 🖥️ CLI: python migrations.py [status|upgrade]
+# -----------------------------------------------
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from flask import Flask
+    from config import Config
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    cli_app = Flask(__name__)
+    cli_app.config.from_object(Config)
+    db.init_app(cli_app)
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    with cli_app.app_context():
+        if command == "upgrade":
+            print(f"✅ Applied: {upgrade(db.engine) or 'nothing, already current'}")
+        print(f"📊 Schema version {current_version(db.engine)} (latest {LATEST})")
@@ -61,7 +61,10 @@ class SavedJob(db.Model):
     saved_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Prevent duplicate saves
-    __table_args__ = (db.UniqueConstraint('user_id', 'job_id', name='unique_user_job'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'job_id', name='unique_user_job'),
+        db.Index('ix_saved_job_user_saved_at', 'user_id', 'saved_at'),  # a user's saved list, newest first
+    )
 
     def __repr__(self):
         return f"<SavedJob {self.job_id} for user {self.user_id}>"
@@ -90,7 +93,10 @@ class Application(db.Model):
     resume_file = db.Column(db.String(255), nullable=True)
 
     # Prevent duplicate applications
-    __table_args__ = (db.UniqueConstraint('user_id', 'job_id', name='unique_user_job_application'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'job_id', name='unique_user_job_application'),
+        db.Index('ix_application_user_applied_at', 'user_id', 'applied_at'),  # a user's applications, newest first
+    )
 
     def to_dict(self):
         return {
@@ -118,3 +124,76 @@ class Application(db.Model):
 
     def __repr__(self):
         return f"<Application {self.job_id} by user {self.user_id}>"
+
+
+# =======================================================
+# JOB CATALOG MODEL
+# =======================================================
+class JobCatalog(db.Model):
+    """Normalized copy of every job seen from a provider, keyed by its job id."""
+    id = db.Column(db.String(255), primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    company = db.Column(db.String(200))
+    location = db.Column(db.String(200))
+    # Canonical gazetteer ids resolved at ingest (utils/locations.py), e.g. "city:pune"
+    location_id = db.Column(db.String(64), index=True)
+    location_state = db.Column(db.String(64), index=True)
+    job_type = db.Column(db.String(50))
+    salary = db.Column(db.String(100))
+    # Parsed from `salary` at ingest (utils/salary.py); amounts are annualized
+    salary_min = db.Column(db.BigInteger)
+    salary_max = db.Column(db.BigInteger)
+    salary_currency = db.Column(db.String(3))
+    salary_period = db.Column(db.String(10))
+    description = db.Column(db.Text)
+    url = db.Column(db.String(1000))
+    posted_date = db.Column(db.String(50))
+    remote = db.Column(db.Boolean, default=False)
+    source = db.Column(db.String(100), index=True)
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        db.Index('ix_job_catalog_salary_min', 'salary_currency', 'salary_min'),
+        db.Index('ix_job_catalog_salary_max', 'salary_currency', 'salary_max'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'company': self.company,
+            'location': self.location,
+            'location_id': self.location_id,
+            'location_state': self.location_state,
+            'job_type': self.job_type,
+            'salary': self.salary,
+            'salary_min': self.salary_min,
+            'salary_max': self.salary_max,
+            'salary_currency': self.salary_currency,
+            'salary_period': self.salary_period,
+            'description': self.description,
+            'url': self.url,
+            'posted_date': self.posted_date,
+            'remote': bool(self.remote),
+            'source': self.source,
+        }
+
+    def __repr__(self):
+        return f"<JobCatalog {self.id} from {self.source}>"
+
+
+# =======================================================
+# SEARCH HISTORY MODEL
+# =======================================================
+class SearchHistory(db.Model):
+    """Aggregated user searches; the ingestion scheduler pre-warms the most popular ones."""
+    id = db.Column(db.Integer, primary_key=True)
+    keyword = db.Column(db.String(200), nullable=False)
+    location = db.Column(db.String(100), nullable=False, default='')
+    hits = db.Column(db.Integer, default=0, nullable=False)
+    last_searched_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (db.UniqueConstraint('keyword', 'location', name='unique_search_query'),)
+
+    def __repr__(self):
+        return f"<SearchHistory '{self.keyword}' in '{self.location}' x{self.hits}>"
@@ -0,0 +1,249 @@
+"""
+Per-provider circuit breakers shared by every job provider client.
+
+Each provider (Mantiks, Jooble, Adzuna, JSearch) gets a breaker with a rolling window
+of call outcomes and latencies:
+
+  closed     calls flow; the breaker opens once the window's failure rate (errors plus
+             calls slower than BREAKER_SLOW_CALL) reaches BREAKER_FAILURE_RATE
+  open       calls fail fast with CircuitOpen, so a dead provider costs nothing
+  half_open  after the cool-down a single probe call is let through; success closes the
+             breaker, failure re-opens it with a doubled cool-down
+
+Providers may register a cheap probe, run by a background scheduler when a cool-down
+ends, so user requests do not have to pay for finding out a provider is back.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Environment config
+BREAKER_WINDOW = int(os.getenv("BREAKER_WINDOW", "20"))                  # outcomes kept per provider
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "5"))             # before the rate is trusted
+BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_SLOW_CALL = float(os.getenv("BREAKER_SLOW_CALL", "8"))           # seconds; slower counts as failure
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))            # first open period
+BREAKER_MAX_COOLDOWN = float(os.getenv("BREAKER_MAX_COOLDOWN", "600"))
+BREAKER_PROBE_INTERVAL = float(os.getenv("BREAKER_PROBE_INTERVAL", "5"))  # 0 disables background probes
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpen(Exception):
+    """The provider's breaker is open: the call was skipped without touching the network."""
+
+
+def _is_failure(exc):
+    """Client errors (bad id, bad params) say nothing about provider health; 429 and 5xx do."""
+    import requests  # already loaded by whichever provider call raised; kept out of worker boot
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return True
+
+
+# -----------------------------
+# Breaker
+# -----------------------------
+class CircuitBreaker:
+    def __init__(self, name, window=None, min_calls=None, failure_rate=None, slow_call=None,
+                 cooldown=None, max_cooldown=None, clock=time.monotonic):
+        self.name = name
+        self.min_calls = BREAKER_MIN_CALLS if min_calls is None else min_calls
+        self.failure_rate = BREAKER_FAILURE_RATE if failure_rate is None else failure_rate
+        self.slow_call = BREAKER_SLOW_CALL if slow_call is None else slow_call
+        self.base_cooldown = BREAKER_COOLDOWN if cooldown is None else cooldown
+        self.max_cooldown = BREAKER_MAX_COOLDOWN if max_cooldown is None else max_cooldown
+        self.clock = clock
+        self._outcomes = deque(maxlen=window or BREAKER_WINDOW)  # (ok, seconds)
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.cooldown = self.base_cooldown
+        self.retry_at = 0.0
+        self._probing = False
+        self.probe = None
+        self.stats = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0, "probes": 0}
+
+    # ---- state ----
+    def available(self):
+        """Would a call be let through right now? (Does not claim the half-open probe.)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                return self.clock() >= self.retry_at
+            return not self._probing
+
+    def _admit(self):
+        """Claim permission for one call; returns True when it is the half-open probe."""
+        with self._lock:
+            if self.state == OPEN and self.clock() >= self.retry_at:
+                self.state = HALF_OPEN
+                logger.info(f"🟡 {self.name} circuit half-open, probing")
+            if self.state == CLOSED:
+                return False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                self.stats["probes"] += 1
+                return True
+            self.stats["rejected"] += 1
+        raise CircuitOpen(f"{self.name} circuit is open")
+
+    def record(self, ok, seconds, probe=False):
+        ok = ok and seconds <= self.slow_call
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["failures"] += 0 if ok else 1
+            if probe:
+                self._probing = False
+                if ok:
+                    self._close()
+                else:
+                    self._open(backoff=True)
+                return
+            self._outcomes.append((ok, seconds))
+            if self.state == CLOSED and self._failure_rate() >= self.failure_rate:
+                self._open(backoff=False)
+
+    def _failure_rate(self):
+        if len(self._outcomes) < self.min_calls:
+            return 0.0
+        return sum(1 for ok, _ in self._outcomes if not ok) / len(self._outcomes)
+
+    def _open(self, backoff):
+        self.cooldown = min(self.cooldown * 2, self.max_cooldown) if backoff else self.base_cooldown
+        self.state = OPEN
+        self.retry_at = self.clock() + self.cooldown
+        self.stats["opened"] += 1
+        logger.warning(f"🔴 {self.name} circuit open for {self.cooldown:.0f}s")
+        _scheduler.wake()
+
+    def _close(self):
+        self.state = CLOSED
+        self.cooldown = self.base_cooldown
+        self._outcomes.clear()
+        logger.info(f"🟢 {self.name} circuit closed")
+
+    # ---- calls ----
+    @contextmanager
+    def guard(self):
+        """`with breaker.guard(): ...` — raises CircuitOpen when open, records the outcome otherwise."""
+        probe = self._admit()
+        started = self.clock()
+        try:
+            yield
+        except Exception as e:
+            self.record(not _is_failure(e), self.clock() - started, probe)
+            raise
+        except BaseException:
+            if probe:
+                with self._lock:
+                    self._probing = False
+            raise
+        self.record(True, self.clock() - started, probe)
+
+    def call(self, fn, *args, **kwargs):
+        with self.guard():
+            return fn(*args, **kwargs)
+
+    # ---- metrics ----
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(s for _, s in self._outcomes)
+            failure_rate = (sum(1 for ok, _ in self._outcomes if not ok) / len(self._outcomes)
+                            if self._outcomes else 0.0)
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+            if self.state != CLOSED:
+                score = 0.0
+            else:
+                # 1.0 = no failures and fast; slow p95 latencies pull the score down
+                speed = 1.0 if p95 is None else max(0.0, 1 - p95 / self.slow_call)
+                score = round((1 - failure_rate) * (0.5 + 0.5 * speed), 3)
+            return dict(self.stats,
+                        state=self.state,
+                        health=score,
+                        failure_rate=round(failure_rate, 3),
+                        p95_latency=round(p95, 3) if p95 is not None else None,
+                        window=len(self._outcomes),
+                        retry_in=round(max(0.0, self.retry_at - self.clock()), 1) if self.state == OPEN else None,
+                        probe_registered=self.probe is not None)
+
+
+# -----------------------------
+# Probe scheduler
+# -----------------------------
+class _ProbeScheduler:
+    """Daemon thread that runs a provider's probe when its open cool-down ends."""
+
+    def __init__(self):
+        self._thread = None
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+
+    def wake(self):
+        if BREAKER_PROBE_INTERVAL <= 0:
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="breaker-probes", daemon=True)
+                self._thread.start()
+        self._event.set()
+
+    def _run(self):
+        while True:
+            self._event.wait(BREAKER_PROBE_INTERVAL)
+            self._event.clear()
+            if run_due_probes() is None:
+                return  # nothing open any more; the next open starts a new thread
+
+
+_scheduler = _ProbeScheduler()
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(name):
+    """The process-wide breaker for provider `name`, created on first use."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def is_available(name):
+    """False only for a provider whose breaker is open (unknown providers are available)."""
+    with _breakers_lock:
+        found = _breakers.get(name)
+    return found is None or found.available()
+
+
+def register_probe(name, probe):
+    """`probe()` is a cheap provider call made through the breaker's guard, e.g. a 1-result search."""
+    breaker(name).probe = probe
+
+
+def run_due_probes():
+    """Probe every open breaker whose cool-down has ended; None when no breaker is open."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    still_open = [b for b in breakers if b.state != CLOSED]
+    for b in still_open:
+        if b.probe is not None and b.available():
+            try:
+                b.probe()
+            except Exception as e:
+                logger.info(f"🩺 {b.name} probe failed: {e}")
+    return len(still_open) or None
+
+
+def provider_health():
+    """State, health score, failure rate and latency per provider (for /health/providers)."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.snapshot() for b in breakers}
@@ -0,0 +1,180 @@
+"""
+Shared HTTP transport for every job provider client.
+One keep-alive requests.Session with a connection pool per host, retry with
+backoff on idempotent calls that never reached the provider or hit a 5xx, and
+pool saturation metrics.
+"""
+
+import os
+import time
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Environment config
+POOL_HOSTS = int(os.getenv("PROVIDER_POOL_HOSTS", "16"))      # distinct host pools kept alive
+POOL_SIZE = int(os.getenv("PROVIDER_POOL_SIZE", "10"))        # connections per host
+MAX_RETRIES = int(os.getenv("PROVIDER_MAX_RETRIES", "2"))
+BACKOFF_FACTOR = float(os.getenv("PROVIDER_BACKOFF", "0.3"))
+MAX_RETRY_AFTER = float(os.getenv("PROVIDER_MAX_RETRY_AFTER", "1"))  # longer 429 waits are not retried
+# Per-host overrides, e.g. "api.mantiks.io=20,jsearch.p.rapidapi.com=5"
+POOL_SIZE_OVERRIDES = os.getenv("PROVIDER_POOL_SIZES", "")
+
+RETRY_STATUSES = {500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+def _retry_after(resp):
+    """Seconds a 429 asks us to wait, or None when it gives none we can honour cheaply."""
+    try:
+        seconds = float(resp.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+    return seconds if 0 <= seconds <= MAX_RETRY_AFTER else None
+
+
+def _parse_overrides(raw):
+    sizes = {}
+    for item in raw.split(","):
+        host, _, size = item.strip().partition("=")
+        if host and size.isdigit():
+            sizes[host.strip().lower()] = int(size)
+    return sizes
+
+
+# -----------------------------
+# Session & Pools
+# -----------------------------
+_session = None
+_session_lock = threading.Lock()
+_pool_sizes = _parse_overrides(POOL_SIZE_OVERRIDES)
+_mounted_hosts = set()
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _host_stats(host):
+    if host not in _stats:
+        _stats[host] = {
+            "pool_size": _pool_sizes.get(host, POOL_SIZE),
+            "requests": 0,
+            "retries": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "saturated": 0,
+        }
+    return _stats[host]
+
+
+def get_session():
+    """Return the process-wide provider session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _ensure_host_pool(session, scheme, host):
+    """Mount a dedicated adapter for hosts that have a configured pool size."""
+    if host not in _pool_sizes or host in _mounted_hosts:
+        return
+    with _session_lock:
+        if host in _mounted_hosts:
+            return
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_pool_sizes[host], max_retries=0)
+        session.mount(f"{scheme}://{host}", adapter)
+        _mounted_hosts.add(host)
+
+
+# -----------------------------
+# Requests
+# -----------------------------
+def request(method, url, idempotent=None, retries=None, **kwargs):
+    """
+    Send a request through the shared session.
+    Idempotent calls (GET by default, or idempotent=True) are retried with exponential
+    backoff on connection errors (connect timeouts included) and 5xx responses. Read
+    timeouts are not retried: the provider is slow, and asking again only doubles the wait.
+    A 429 is retried only when its Retry-After is at most MAX_RETRY_AFTER seconds.
+    """
+    method = method.upper()
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    session = get_session()
+    _ensure_host_pool(session, parts.scheme, host)
+
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    attempts = 1 + (MAX_RETRIES if retries is None else retries) if idempotent else 1
+
+    for attempt in range(attempts):
+        with _stats_lock:
+            stats = _host_stats(host)
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+            stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+            if stats["in_flight"] > stats["pool_size"]:
+                stats["saturated"] += 1
+        wait_for = None
+        try:
+            resp = session.request(method, url, **kwargs)
+        except requests.exceptions.ConnectionError as e:  # includes ConnectTimeout, not ReadTimeout
+            with _stats_lock:
+                stats["errors"] += 1
+            if attempt + 1 >= attempts:
+                raise
+            logger.info(f"🔁 Retrying {method} {host} after error: {e}")
+        else:
+            if resp.status_code == 429:
+                wait_for = _retry_after(resp)
+            if (resp.status_code not in RETRY_STATUSES and wait_for is None) or attempt + 1 >= attempts:
+                return resp
+            logger.info(f"🔁 Retrying {method} {host} after HTTP {resp.status_code}")
+            resp.close()
+        finally:
+            with _stats_lock:
+                stats["in_flight"] -= 1
+
+        with _stats_lock:
+            stats["retries"] += 1
+        time.sleep(BACKOFF_FACTOR * (2 ** attempt) if wait_for is None else wait_for)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+# -----------------------------
+# Metrics
+# -----------------------------
+def transport_stats():
+    """Per-host counters: requests, retries, errors, in-flight and pool saturation events."""
+    with _stats_lock:
+        return {host: dict(values) for host, values in _stats.items()}
+
+
+def close():
+    """Close pooled connections (tests, worker shutdown)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _mounted_hosts.clear()
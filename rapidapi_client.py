@@ -1,7 +1,16 @@
 import os
-import requests
 import time
-from flask import current_app
+import logging
+import provider_transport
+import provider_health
+from provider_health import CircuitOpen
+from utils.cache import search_cache, search_key, detail_cache, negative_cache, provider_flight, NOT_FOUND
+from utils.salary import with_salary_fields
+from utils.locations import with_location_fields
+from utils.job_ids import make_job_id, provider_native_id
+
+# Module logger (not current_app.logger) so searches can run on fan-out worker threads
+logger = logging.getLogger(__name__)
 
 # -----------------------------------------------
 # 🔑 Configuration
@@ -12,25 +21,52 @@ RAPIDAPI_HOST = "jsearch.p.rapidapi.com"
 # -----------------------------------------------
 # ⚙️ Global caches
 # -----------------------------------------------
-_cache = {"timestamp": 0, "query": "", "data": []}  # List search cache (for /jobs)
-_job_cache = {}  # Per-job detail cache (for /jobs/<id>)
+_cache = search_cache  # List search cache (for /jobs), shared with jobapi_client
+_job_cache = detail_cache  # Per-job detail cache (for /jobs/<id>), bounded by bytes + TTL
 
 # -----------------------------------------------
 # 🔍 Fetch jobs from RapidAPI (JSearch)
 # -----------------------------------------------
-def fetch_jobs_from_rapidapi(title=None, location=None, limit=20):
+def fetch_jobs_from_rapidapi(title=None, location=None, limit=20, deadline_at=None):
     """
     Fetch job listings using the JSearch (RapidAPI) endpoint.
     Includes caching for both list results and per-job details.
     """
-    global _cache, _job_cache
+    key = search_key(title or "developer", location or "India", None, 1, "JSearch", limit)
+    jobs = _cache.get_or_load(key, lambda: _fetch_from_jsearch(title, location, limit, deadline_at), deadline_at,
+                              refresh_loader=lambda: _fetch_from_jsearch(title, location, limit))
+    return (jobs or [])[:limit]
+
+
+def _jsearch_job(job):
+    """Normalize one JSearch record to the common job shape."""
+    job_obj = {
+        "id": job.get("job_id", ""),
+        "title": job.get("job_title", "Untitled"),
+        "company": job.get("employer_name", "Unknown"),
+        "location": job.get("job_city") or job.get("job_country") or "India",
+        "job_type": job.get("job_employment_type", "Full-time"),
+        "salary": (
+            job.get("job_min_salary")
+            and f"₹{job.get('job_min_salary')}+"
+        )
+        or "₹ Not Specified",
+        "description": (job.get("job_description") or "No description available")[:400],
+        "url": job.get("job_apply_link", "#"),
+        "posted_date": job.get("job_posted_at_datetime_utc", "Recently"),
+        "remote": bool(job.get("job_is_remote", False)),
+        "source": "RapidAPI (JSearch)",
+    }
+    job_obj["id"] = make_job_id(job_obj["source"], job_obj["id"], job_obj["title"],
+                                job_obj["company"], job_obj["location"], job_obj["url"])
+    with_salary_fields(job_obj)
+    with_location_fields(job_obj)
+    return job_obj
 
-    query = f"{title or 'developer'} in {location or 'India'}"
 
-    # ✅ Return cached results if recent (within 60s) and same query
-    if time.time() - _cache["timestamp"] < 60 and _cache["query"] == query:
-        current_app.logger.info(f"♻️ Using cached RapidAPI results for '{query}'")
-        return _cache["data"]
+def _fetch_from_jsearch(title=None, location=None, limit=20, deadline_at=None):
+    """Uncached JSearch call; also fills the per-job detail cache."""
+    query = f"{title or 'developer'} in {location or 'India'}"
 
     url = f"https://{RAPIDAPI_HOST}/search"
     headers = {
@@ -38,86 +74,127 @@ def fetch_jobs_from_rapidapi(title=None, location=None, limit=20):
         "x-rapidapi-host": RAPIDAPI_HOST,
     }
     params = {"query": query, "num_pages": 1}
+    if negative_cache.hit("JSearch", ("search", query)):
+        return []
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=5)
-        response.raise_for_status()
-        data = response.json().get("data", [])
+        with provider_health.breaker("JSearch").guard():
+            # Inside a fan-out: its remaining time, no retries
+            timeout = 5 if deadline_at is None else max(0.1, min(5, deadline_at - time.monotonic()))
+            response = provider_transport.get(url, headers=headers, params=params, timeout=timeout,
+                                              retries=None if deadline_at is None else 0)
+            response.raise_for_status()
+            data = response.json().get("data", [])
 
         jobs = []
         for job in data[:limit]:
-            job_obj = {
-                "id": job.get("job_id", ""),
-                "title": job.get("job_title", "Untitled"),
-                "company": job.get("employer_name", "Unknown"),
-                "location": job.get("job_city") or job.get("job_country") or "India",
-                "job_type": job.get("job_employment_type", "Full-time"),
-                "salary": (
-                    job.get("job_min_salary")
-                    and f"₹{job.get('job_min_salary')}+"
-                )
-                or "₹ Not Specified",
-                "description": (job.get("job_description") or "No description available")[:400],
-                "url": job.get("job_apply_link", "#"),
-                "posted_date": job.get("job_posted_at_datetime_utc", "Recently"),
-                "remote": bool(job.get("job_is_remote", False)),
-                "source": "RapidAPI (JSearch)",
-            }
-
+            job_obj = _jsearch_job(job)
             jobs.append(job_obj)
 
             # ✅ Store job in detail cache
             if job_obj["id"]:
-                _job_cache[job_obj["id"]] = job_obj
+                _job_cache.set(job_obj["id"], job_obj)
 
-        # ✅ Update list cache
-        _cache = {"timestamp": time.time(), "query": query, "data": jobs}
-        current_app.logger.info(f"✅ RapidAPI returned {len(jobs)} jobs for query '{query}'")
+        logger.info(f"✅ RapidAPI returned {len(jobs)} jobs for query '{query}'")
+        negative_cache.record("JSearch", ("search", query), jobs)
 
         return jobs
 
+    except CircuitOpen:
+        logger.info("⏭️ JSearch circuit open, skipped")
+        return []
     except Exception as e:
-        current_app.logger.warning(f"⚠️ RapidAPI fetch failed: {e}")
+        logger.warning(f"⚠️ RapidAPI fetch failed: {e}")
+        negative_cache.record_error("JSearch", ("search", query), e)
         return []
 
 
+# -----------------------------------------------
+# 🧾 Fetch one job from JSearch by id
+# -----------------------------------------------
+def fetch_jsearch_job(job_id, deadline_at=None):
+    """
+    JSearch /job-details lookup (coalesced, negative-cached, behind the JSearch breaker).
+    With `deadline_at` (the resolver's race) it gets only the remaining time and no retries.
+    """
+    if not RAPIDAPI_KEY or not provider_native_id(job_id, "RapidAPI (JSearch)"):
+        return None  # no key, or another provider's id
+    if negative_cache.hit("JSearch", ("detail", job_id)):
+        return None
+    return provider_flight.do(("jsearch-detail", str(job_id)), lambda: _fetch_jsearch_job(job_id, deadline_at),
+                              deadline_at)
+
+
+def _fetch_jsearch_job(job_id, deadline_at=None):
+    headers = {"x-rapidapi-key": RAPIDAPI_KEY, "x-rapidapi-host": RAPIDAPI_HOST}
+    try:
+        with provider_health.breaker("JSearch").guard():
+            timeout = 5 if deadline_at is None else max(0.1, min(5, deadline_at - time.monotonic()))
+            response = provider_transport.get(f"https://{RAPIDAPI_HOST}/job-details", headers=headers,
+                                              params={"job_id": provider_native_id(job_id, "RapidAPI (JSearch)")},
+                                              timeout=timeout, retries=None if deadline_at is None else 0)
+            response.raise_for_status()
+            data = response.json().get("data") or []
+        if not data:
+            negative_cache.remember("JSearch", ("detail", job_id), NOT_FOUND)
+            return None
+        job_obj = _jsearch_job(data[0])
+        _job_cache.set(str(job_id), job_obj)
+        return job_obj
+    except CircuitOpen:
+        logger.info(f"⏭️ JSearch circuit open, skipping job {job_id}")
+        return None
+    except Exception as e:
+        logger.warning(f"⚠️ JSearch job detail fetch failed: {e}")
+        negative_cache.record_error("JSearch", ("detail", job_id), e)
+        return None
+
+
+# Cheap probe for the breaker scheduler (bypasses the search cache)
+provider_health.register_probe("JSearch", lambda: _fetch_from_jsearch("python", "India", limit=1))
+
+
 # -----------------------------------------------
 # 🔎 Get job by ID from cache
 # -----------------------------------------------
 def get_job_by_id_from_cache(job_id):
     """
-    Retrieve a single job by ID from RapidAPI cache (either _job_cache or _cache["data"]).
+    Retrieve a single job by ID from the detail cache, falling back to cached search results.
     Ensures job detail pages work even after refresh.
     """
-    global _cache, _job_cache
-
     if not job_id:
         return None
 
     # 1️⃣ Try per-job detail cache
-    if job_id in _job_cache:
-        current_app.logger.info(f"♻️ Found job {job_id} in detailed RapidAPI cache")
-        return _job_cache[job_id]
+    job = _job_cache.get(job_id)
+    if job is not None:
+        logger.info(f"♻️ Found job {job_id} in detail cache")
+        return job
 
     # 2️⃣ Try list cache
-    if _cache.get("data"):
-        match = next((j for j in _cache["data"] if str(j.get("id")) == str(job_id)), None)
+    for jobs in _cache.values():
+        match = next((j for j in jobs if str(j.get("id")) == str(job_id)), None)
         if match:
-            _job_cache[job_id] = match  # store for next time
-            current_app.logger.info(f"♻️ Found job {job_id} in list cache")
+            _job_cache.set(job_id, match)  # store for next time
+            logger.info(f"♻️ Found job {job_id} in list cache")
             return match
 
     # 3️⃣ Not found
-    current_app.logger.warning(f"⚠️ Job {job_id} not found in RapidAPI cache")
+    logger.warning(f"⚠️ Job {job_id} not found in RapidAPI cache")
     return None
 
 
+def remember_jobs(jobs):
+    """Put listed jobs from any provider into the detail cache so their detail pages hit."""
+    _job_cache.set_many((str(job["id"]), dict(job)) for job in jobs if job.get("id"))
+
+
 # -----------------------------------------------
 # 🧹 Optional utility: clear caches (for testing)
 # -----------------------------------------------
 def clear_rapidapi_cache():
     """Manually clear RapidAPI caches (useful for debugging)."""
-    global _cache, _job_cache
-    _cache = {"timestamp": 0, "query": "", "data": []}
-    _job_cache = {}
-    current_app.logger.info("🧹 Cleared all RapidAPI caches.")
+    _cache.clear()
+    _job_cache.clear()
+    negative_cache.clear()
+    logger.info("🧹 Cleared all RapidAPI caches.")
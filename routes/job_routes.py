@@ -1,12 +1,20 @@
-from rapidapi_client import fetch_jobs_from_rapidapi, _cache, get_job_by_id_from_cache
 from flask import Blueprint, render_template, request, jsonify, current_app, send_from_directory, redirect, url_for
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
 from extensions import db
 from models.simple_models import SavedJob, Application
-import os, random, time, re, uuid
+import os, random, time, uuid, json, base64, hashlib, hmac
 from datetime import datetime, timedelta
-from jobapi_client import fetch_jobs, fetch_job_by_id
+from utils.cache import SearchCache, shared_backend
+from services.catalog_service import stage_job
+from services.job_resolver import JobResolver
+from services.membership_service import membership_service
+from services.ingestion_service import record_search
+from services.search_index import search_index
+from services.query_planner import QueryPlan
+from utils.salary import with_salary_fields, parse_salary_filter
+from utils.locations import canonical_name, with_location_fields
+from utils.job_ids import make_job_id
 
 # -----------------------------------------------
 # 🔰 Blueprint
@@ -14,35 +22,38 @@ from jobapi_client import fetch_jobs, fetch_job_by_id
 jobs_bp = Blueprint("jobs_bp", __name__)
 
 # -----------------------------------------------
-# 🗺️ Indian City Normalization
+# 🔌 Provider clients, imported on first search (keeps requests out of worker boot)
 # -----------------------------------------------
-INDIAN_CITIES = {
-    "delhi": "New Delhi", "new delhi": "New Delhi",
-    "mumbai": "Mumbai", "bombay": "Mumbai",
-    "bangalore": "Bengaluru", "banglore": "Bengaluru", "bengaluru": "Bengaluru",
-    "chennai": "Chennai", "hyderabad": "Hyderabad", "pune": "Pune",
-    "kolkata": "Kolkata", "gurgaon": "Gurugram", "gurugram": "Gurugram",
-    "noida": "Noida", "ahmedabad": "Ahmedabad", "jaipur": "Jaipur",
-    "lucknow": "Lucknow", "kochi": "Kochi", "indore": "Indore",
-}
+def fetch_jobs(*args, **kwargs):
+    from jobapi_client import fetch_jobs as _fetch_jobs
+    return _fetch_jobs(*args, **kwargs)
 
+
+def remember_jobs(jobs):
+    from rapidapi_client import remember_jobs as _remember_jobs
+    return _remember_jobs(jobs)
+
+# -----------------------------------------------
+# 🗺️ Indian City Normalization (gazetteer in utils/locations.py)
+# -----------------------------------------------
 def normalize_location(city_name):
-    if not city_name:
-        return "India"
-    city = city_name.strip().lower()
-    return INDIAN_CITIES.get(city, city_name.title())
+    """Canonical name for a searched place: "banglore" -> "Bengaluru", "tamilnadu" -> "Tamil Nadu"."""
+    return canonical_name(city_name)
 
 # -----------------------------------------------
 # 💾 Fast Mock Job Generator (with caching)
 # -----------------------------------------------
-_mock_cache = {"timestamp": 0, "data": []}
+# Shared across workers so mock ids resolve to the same job on every worker
+_mock_cache = SearchCache(max_entries=1, default_ttl=60, stale_ttl=0, backend=shared_backend, namespace="mock")
+_MOCK_KEY = ("mock",)
+SNAPSHOT_TTL = int(os.getenv("SEARCH_SNAPSHOT_TTL", "600"))  # seconds a cursor stays valid
 
 def generate_mock_jobs(count=15):
     """Generate fake jobs if API fails."""
-    global _mock_cache
-    if time.time() - _mock_cache["timestamp"] < 60 and _mock_cache["data"]:
+    cached, state = _mock_cache.get(_MOCK_KEY)
+    if state == "fresh" and cached:
         current_app.logger.info("♻️ Using cached mock jobs.")
-        return _mock_cache["data"]
+        return cached
 
     titles = [
         "Python Developer", "Full Stack Engineer", "Frontend Developer",
@@ -71,10 +82,9 @@ def generate_mock_jobs(count=15):
             "remote": remote,
             "source": "MOCK",
         }
-        jobs.append(job)
+        jobs.append(with_location_fields(with_salary_fields(job)))
 
-    _mock_cache["data"] = jobs
-    _mock_cache["timestamp"] = time.time()
+    _mock_cache.set(_MOCK_KEY, jobs)
     current_app.logger.info("💾 Generated and cached fresh mock jobs.")
     return jobs
 
@@ -82,13 +92,13 @@ def generate_mock_jobs(count=15):
 # 🧩 Normalize API Job Data
 # -----------------------------------------------
 def normalize_api_job(api_job):
-    """Convert Mantiks or RapidAPI response to a unified structure."""
-    return {
-        "id": str(api_job.get("id") or api_job.get("job_id") or api_job.get("url") or ""),
+    """Convert Mantiks or RapidAPI response to a unified structure (and stage it for the catalog)."""
+    job = {
+        "id": "",
         "title": api_job.get("title") or "Untitled",
         "company": api_job.get("company") or "Unknown",
         "location": api_job.get("location") or "India",
-        "job_type": api_job.get("type") or "Full-time",
+        "job_type": api_job.get("type") or api_job.get("job_type") or "Full-time",
         "salary": api_job.get("salary") or "",
         "description": api_job.get("description") or "",
         "url": api_job.get("url") or "",
@@ -96,13 +106,31 @@ def normalize_api_job(api_job):
         "remote": bool(api_job.get("remote", False)),
         "source": api_job.get("source") or "API",
     }
+    job["id"] = make_job_id(job["source"], api_job.get("id") or api_job.get("job_id"),
+                            job["title"], job["company"], job["location"], job["url"])
+    with_salary_fields(job)
+    with_location_fields(job)
+    stage_job(job)
+    return job
+
+def _normalize_remote(raw, source):
+    """Provider detail payload -> common job shape (staged for the catalog)."""
+    return normalize_api_job(dict(raw, source=raw.get("source") or source))
+
+job_resolver = JobResolver(normalize=_normalize_remote, mock_jobs=generate_mock_jobs)
+
+def resolve_job(job_id):
+    """Find a job for detail/save/apply: every local source first, remote providers raced on a miss."""
+    user_id = current_user.id if current_user.is_authenticated else None
+    job, _ = job_resolver.resolve(job_id, user_id)
+    return job
 
 # -----------------------------------------------
 # ⚡ JOB LIST
 # -----------------------------------------------
 @jobs_bp.route("/")
 def job_list():
-    """Show job listings from Mantiks, RapidAPI, or fallback to mock data."""
+    """Show job listings from all providers in parallel, or fallback to mock data."""
     q = request.args.get("q")
     location = request.args.get("location")
     job_type = request.args.get("type")
@@ -111,53 +139,11 @@ def job_list():
     normalized_location = normalize_location(location)
 
     current_app.logger.info(f"🔍 Searching jobs for '{q}' in '{normalized_location}'")
-    jobs, data_source = [], "Mantiks"
+    record_search(q, normalized_location)
     start_time = time.time()
 
-    # 1️⃣ Mantiks API
-    try:
-        api_jobs = fetch_jobs(title=q, location=normalized_location, limit=limit, timeout=3)
-        jobs = [normalize_api_job(j) for j in api_jobs] if api_jobs else []
-        if not jobs:
-            raise Exception("Empty Mantiks API result")
-    except Exception as e:
-        current_app.logger.warning(f"⚠️ Mantiks API failed: {e}")
-        jobs = []
-
-    # 2️⃣ RapidAPI fallback
-    if not jobs:
-        current_app.logger.info("🔁 Trying RapidAPI JSearch...")
-        jobs = fetch_jobs_from_rapidapi(title=q, location=normalized_location, limit=limit)
-        data_source = "RapidAPI" if jobs else "MOCK"
-        if not jobs:
-            jobs = generate_mock_jobs(limit)
-            current_app.logger.info("💾 Using mock data (offline mode).")
-
-    # 3️⃣ Apply filters
-    if job_type:
-        jobs = [j for j in jobs if job_type.lower() in (j.get("job_type") or "").lower()]
-    if normalized_location.lower() != "india":
-        jobs = [j for j in jobs if normalized_location.lower() in (j.get("location") or "").lower()]
-    if salary_min:
-        try:
-            min_salary = int(salary_min)
-            def parse_salary(s):
-                match = re.search(r"(\d+)", s.replace(",", ""))
-                return int(match.group(1)) if match else 0
-            jobs = [j for j in jobs if parse_salary(j.get("salary", "0")) >= min_salary]
-        except Exception:
-            pass
-
-    # 4️⃣ Mark saved/applied jobs
-    if current_user.is_authenticated:
-        saved_ids = {s.job_id for s in SavedJob.query.filter_by(user_id=current_user.id)}
-        applied_ids = {a.job_id for a in Application.query.filter_by(user_id=current_user.id)}
-        for j in jobs:
-            j["is_saved"] = j["id"] in saved_ids
-            j["is_applied"] = j["id"] in applied_ids
-    else:
-        for j in jobs:
-            j["is_saved"] = j["is_applied"] = False
+    jobs, data_source = search_jobs(q, normalized_location, job_type, salary_min, limit)
+    mark_user_jobs(jobs)
 
     total_time = round(time.time() - start_time, 2)
     current_app.logger.info(f"⚡ Job fetch completed in {total_time}s from {data_source}")
@@ -172,57 +158,190 @@ def job_list():
         using_api=(data_source != "MOCK"),
     )
 
+def search_jobs(q, normalized_location, job_type=None, salary_min=None, limit=25):
+    """
+    Fetch from all providers (or mock) with the filters pushed down to the providers that
+    support them; the planner checks the rest per provider. Returns (jobs, data_source).
+    """
+    # 1️⃣ All providers in parallel (Mantiks, Jooble, Adzuna, JSearch)
+    try:
+        api_jobs = fetch_jobs(title=q, location=normalized_location, limit=limit, fanout=True, timeout=3,
+                              job_type=job_type, salary_min=salary_min)
+        jobs = [normalize_api_job(j) for j in api_jobs] if api_jobs else []
+    except Exception as e:
+        current_app.logger.warning(f"⚠️ Provider fan-out failed: {e}")
+        jobs = []
+
+    # 2️⃣ Mock fallback (filtered locally)
+    if jobs:
+        data_source = ", ".join(sorted({j["source"] for j in jobs}))
+        remember_jobs(jobs)
+    else:
+        data_source = "MOCK"
+        plan = QueryPlan(q, normalized_location, job_type, salary_min, limit)
+        jobs = [dict(j) for j in generate_mock_jobs(limit) if plan.matches(j)]
+        current_app.logger.info("💾 Using mock data (offline mode).")
+    return jobs, data_source
+
+def mark_user_jobs(jobs):
+    """Set is_saved / is_applied on each job for the current user (one job_id-only query per page)."""
+    user_id = current_user.id if current_user.is_authenticated else None
+    return membership_service.mark(jobs, user_id)
+
 # -----------------------------------------------
-# 🧾 JOB DETAIL
+# 📡 JOB SEARCH JSON API (cursor pages, projection, ETags)
 # -----------------------------------------------
-@jobs_bp.route("/<path:job_id>")
-def job_detail(job_id):
-    """Show detailed job info (Mantiks → RapidAPI → DB → Mock)."""
-    current_app.logger.info(f"🔎 Loading job details for ID: {job_id}")
+# The first request runs the search once and stores the filtered result as a snapshot;
+# the opaque cursor points into that snapshot, so later pages are plain slices.
+_snapshots = SearchCache(max_entries=512, default_ttl=SNAPSHOT_TTL, stale_ttl=0,
+                         backend=shared_backend, namespace="snapshot")
+API_FIELDS = ("id", "title", "company", "location", "job_type", "salary", "salary_min", "salary_max",
+              "salary_currency", "salary_period", "description", "url", "posted_date", "remote", "source",
+              "location_id", "is_saved", "is_applied")
+API_DEFAULT_FIELDS = tuple(f for f in API_FIELDS if f != "description")
+API_MAX_PAGE_SIZE = 100
+
+API_PARAMS = ("q", "location", "type", "salary_min", "limit")
+
+def _cursor_signature(raw):
+    key = str(current_app.config["SECRET_KEY"]).encode()
+    return base64.urlsafe_b64encode(hmac.new(key, raw, hashlib.sha256).digest()[:16]).decode().rstrip("=")
+
+def encode_cursor(snapshot_id, offset, params):
+    raw = json.dumps({"s": snapshot_id, "o": offset, "p": params}, separators=(",", ":")).encode()
+    return f"{base64.urlsafe_b64encode(raw).decode().rstrip('=')}.{_cursor_signature(raw)}"
+
+def decode_cursor(cursor):
+    """Return (snapshot_id, offset, params); raises ValueError on a malformed or tampered cursor."""
+    try:
+        body, signature = cursor.split(".", 1)
+        raw = base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
+        if not hmac.compare_digest(signature, _cursor_signature(raw)):
+            raise ValueError("bad signature")
+        data = json.loads(raw)
+        params = data["p"]
+        if not isinstance(params, dict) or not set(API_PARAMS) <= params.keys():
+            raise ValueError("missing params")
+        return str(data["s"]), max(0, int(data["o"])), api_search_params(params)
+    except Exception:
+        raise ValueError("invalid cursor")
+
+def api_search_params(args):
+    """Normalized, clamped search parameters, from the query string or a decoded cursor."""
+    return {
+        "q": str(args.get("q") or ""),
+        "location": normalize_location(args.get("location") or None),
+        "type": str(args.get("type") or ""),
+        "salary_min": str(args.get("salary_min") or ""),
+        "limit": max(1, min(_int_or(args.get("limit"), 100), 200)),
+    }
 
-    # 1️⃣ Mantiks API
+def _int_or(value, default):
     try:
-        job = fetch_job_by_id(job_id)
-        if job:
-            job["source"] = "Mantiks"
-            return render_template("jobs/detail.html", job=job)
-    except Exception as e:
-        current_app.logger.warning(f"❌ Mantiks job detail fetch failed: {e}")
+        return int(value) or default
+    except (TypeError, ValueError):
+        return default
+
+def _parse_fields(raw):
+    if not raw:
+        return API_DEFAULT_FIELDS
+    if raw == "*":
+        return API_FIELDS
+    fields = [f.strip() for f in raw.split(",") if f.strip() in API_FIELDS]
+    return tuple(dict.fromkeys(["id"] + fields))
+
+def _snapshot(params):
+    """Run the search for `params` once and store it. Returns (snapshot_id, jobs, data_source)."""
+    jobs, data_source = search_jobs(params["q"], params["location"], params["type"],
+                                    params["salary_min"], params["limit"])
+    jobs = [{k: v for k, v in j.items() if k not in ("is_saved", "is_applied")} for j in jobs]
+    digest = hashlib.sha256(json.dumps([params, [j["id"] for j in jobs]], sort_keys=True).encode())
+    snapshot_id = digest.hexdigest()[:24]
+    _snapshots.set((snapshot_id,), {"jobs": jobs, "source": data_source})
+    return snapshot_id, jobs, data_source
+
+@jobs_bp.route("/api/jobs")
+def api_jobs():
+    """JSON job search: ?q=&location=&type=&salary_min=&page_size=&fields=&cursor="""
+    page_size = max(1, min(request.args.get("page_size", 20, type=int) or 20, API_MAX_PAGE_SIZE))
+    fields = _parse_fields(request.args.get("fields"))
+    cursor = request.args.get("cursor")
+    start_time = time.time()
+
+    if cursor:
+        try:
+            snapshot_id, offset, params = decode_cursor(cursor)
+        except ValueError:
+            return jsonify({"success": False, "error": "invalid cursor"}), 400
+        snapshot, _ = _snapshots.get((snapshot_id,))
+        if snapshot is None:
+            # Snapshot expired: rerun the same query once and continue at the same offset
+            current_app.logger.info(f"⌛ Search snapshot {snapshot_id} expired, recomputing")
+            snapshot_id, jobs, data_source = _snapshot(params)
+        else:
+            jobs, data_source = snapshot["jobs"], snapshot["source"]
+    else:
+        params = api_search_params(request.args)
+        record_search(params["q"], params["location"])
+        snapshot_id, jobs, data_source = _snapshot(params)
+        offset = 0
+
+    page = mark_user_jobs([dict(j) for j in jobs[offset:offset + page_size]])
+    next_offset = offset + page_size
+    payload = {
+        "success": True,
+        "count": len(jobs),
+        "source": data_source,
+        "jobs": [{f: j.get(f) for f in fields} for j in page],
+        "next_cursor": encode_cursor(snapshot_id, next_offset, params) if next_offset < len(jobs) else None,
+    }
+
+    # Strong ETag over the exact body: unchanged pages answer 304 without a body
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    response = current_app.response_class(body, mimetype="application/json")
+    response.set_etag(hashlib.sha256(body.encode()).hexdigest())
+    response.headers["Cache-Control"] = "private, no-cache"
+    took_ms = round((time.time() - start_time) * 1000, 1)
+    current_app.logger.info(f"📡 API page offset={offset} size={len(page)} of {len(jobs)} in {took_ms}ms")
+    return response.make_conditional(request)
+
+# -----------------------------------------------
+# 🔎 KEYWORD SEARCH API (local full-text index)
+# -----------------------------------------------
+@jobs_bp.route("/api/search")
+def api_search():
+    """Keyword search over catalogued jobs for jobsearch.js — never calls a provider."""
+    q = request.args.get("q", "")
+    location = request.args.get("location", "")
+    limit = max(1, min(request.args.get("limit", 25, type=int) or 25, 100))
+    salary_min = parse_salary_filter(request.args.get("salary_min"))
+    sort = request.args.get("sort")
+    start_time = time.time()
 
-    # 2️⃣ RapidAPI cache lookup
     try:
-        cached_job = get_job_by_id_from_cache(job_id)
-        if cached_job:
-            current_app.logger.info(f"♻️ Found RapidAPI job from cache: {job_id}")
-            return render_template("jobs/detail.html", job=cached_job)
-        if _cache.get("data"):
-            match = next((j for j in _cache["data"] if str(j.get("id")) == str(job_id)), None)
-            if match:
-                current_app.logger.info(f"♻️ Found RapidAPI job in list cache: {job_id}")
-                return render_template("jobs/detail.html", job=match)
+        jobs, total = search_index.search(q, normalize_location(location) if location else None, limit=limit,
+                                          salary_min=salary_min, sort=sort)
     except Exception as e:
-        current_app.logger.warning(f"⚠️ RapidAPI cache lookup failed: {e}")
-
-    # 3️⃣ Saved job fallback
-    if current_user.is_authenticated:
-        saved = SavedJob.query.filter_by(user_id=current_user.id, job_id=job_id).first()
-        if saved:
-            job = {
-                "id": saved.job_id,
-                "title": saved.job_title,
-                "company": saved.job_company,
-                "location": saved.job_location,
-                "salary": saved.job_salary,
-                "description": saved.job_description,
-                "url": saved.job_url,
-                "source": saved.job_source or "Saved",
-            }
-            return render_template("jobs/detail.html", job=job)
-
-    # 4️⃣ Mock fallback
-    job = next((j for j in generate_mock_jobs() if str(j["id"]) == str(job_id)), None)
+        current_app.logger.error(f"❌ Full-text search failed for '{q}': {e}")
+        return jsonify({"success": False, "count": 0, "jobs": []}), 500
+
+    for j in jobs:
+        j["description"] = (j.get("description") or "")[:300]
+    took_ms = round((time.time() - start_time) * 1000, 1)
+    current_app.logger.info(f"🔎 Index search '{q}' in '{location}': {total} matches in {took_ms}ms")
+    return jsonify({"success": True, "count": total, "jobs": jobs, "took_ms": took_ms})
+
+# -----------------------------------------------
+# 🧾 JOB DETAIL
+# -----------------------------------------------
+@jobs_bp.route("/<path:job_id>")
+def job_detail(job_id):
+    """Show detailed job info (caches → catalog → saved/applied snapshots → mock, then a provider race)."""
+    current_app.logger.info(f"🔎 Loading job details for ID: {job_id}")
+    user_id = current_user.id if current_user.is_authenticated else None
+    job, origin = job_resolver.resolve(job_id, user_id)
     if job:
-        job["source"] = "Mock"
+        current_app.logger.info(f"♻️ Job {job_id} resolved from {origin}")
         return render_template("jobs/detail.html", job=job)
 
     return render_template("404.html", message="Job not found or unavailable."), 404
@@ -235,11 +354,7 @@ def job_detail(job_id):
 def apply_job(job_id):
     """Handle job applications with resume upload."""
     if request.method == "GET":
-        job = (
-            fetch_job_by_id(job_id)
-            or get_job_by_id_from_cache(job_id)
-            or next((j for j in generate_mock_jobs() if j["id"] == job_id), None)
-        )
+        job = resolve_job(job_id)
         if not job:
             return render_template("404.html", message="Job not found."), 404
         return render_template("jobs/apply_form.html", job=job)
@@ -272,7 +387,7 @@ def apply_job(job_id):
             resume_filename = secure_filename(f"{current_user.id}_{uuid.uuid4().hex}{ext}")
             resume.save(os.path.join(upload_folder, resume_filename))
 
-        job = fetch_job_by_id(job_id) or get_job_by_id_from_cache(job_id) or {"title": "Untitled", "company": "Unknown"}
+        job = resolve_job(job_id) or {"title": "Untitled", "company": "Unknown"}
 
         application = Application(
             user_id=current_user.id,
@@ -317,12 +432,7 @@ def save_job(job_id):
             db.session.commit()
             return jsonify({"success": True, "message": "Job removed from saved list."})
 
-        job = (
-            fetch_job_by_id(job_id)
-            or get_job_by_id_from_cache(job_id)
-            or next((j for j in generate_mock_jobs() if j["id"] == job_id), None)
-            or {"title": "Untitled", "company": "Unknown", "location": "India"}
-        )
+        job = resolve_job(job_id) or {"title": "Untitled", "company": "Unknown", "location": "India"}
 
         new_saved = SavedJob(
             user_id=current_user.id,
@@ -359,7 +469,7 @@ def unsave_job(job_id):
 @jobs_bp.route("/saved")
 @login_required
 def saved_jobs():
-    saved = SavedJob.query.filter_by(user_id=current_user.id).all()
+    saved = SavedJob.query.filter_by(user_id=current_user.id).order_by(SavedJob.saved_at.desc()).all()
     return render_template("jobs/saved.html", saved_jobs=saved)
 
 # -----------------------------------------------
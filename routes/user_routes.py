@@ -13,8 +13,8 @@ user_bp = Blueprint('user_bp', __name__)
 def dashboard():
     """User dashboard showing saved jobs and applications"""
     try:
-        saved_jobs = SavedJob.query.filter_by(user_id=current_user.id).all()
-        applications = Application.query.filter_by(user_id=current_user.id).all()
+        saved_jobs = SavedJob.query.filter_by(user_id=current_user.id).order_by(SavedJob.saved_at.desc()).all()
+        applications = Application.query.filter_by(user_id=current_user.id).order_by(Application.applied_at.desc()).all()
         current_app.logger.info(f"📊 Dashboard loaded for {current_user.email}: {len(saved_jobs)} saved, {len(applications)} applied")
 
         return render_template('user/dashboard.html',
@@ -36,8 +36,8 @@ def dashboard():
 def profile():
     """User profile page"""
     try:
-        applications = Application.query.filter_by(user_id=current_user.id).all()
-        saved_jobs = SavedJob.query.filter_by(user_id=current_user.id).all()
+        applications = Application.query.filter_by(user_id=current_user.id).order_by(Application.applied_at.desc()).all()
+        saved_jobs = SavedJob.query.filter_by(user_id=current_user.id).order_by(SavedJob.saved_at.desc()).all()
         return render_template('user/profile.html',
                                user=current_user,
                                applications=applications,
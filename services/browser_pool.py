@@ -0,0 +1,263 @@
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------
+# ⚙️ Configuration
+# -----------------------------------------------
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_LEASE_TIMEOUT = float(os.getenv("BROWSER_LEASE_TIMEOUT", "15"))  # seconds to wait for a free driver
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "50"))            # recycle a driver after N pages
+BROWSER_WAIT_TIMEOUT = float(os.getenv("BROWSER_WAIT_TIMEOUT", "8"))     # explicit wait for job cards
+BROWSER_PAGE_TIMEOUT = float(os.getenv("BROWSER_PAGE_TIMEOUT", "15"))    # driver.get gives up after this
+BROWSER_IDLE_TIMEOUT = float(os.getenv("BROWSER_IDLE_TIMEOUT", "300"))   # quit drivers idle this long (0: never)
+# Drivers started at warm-up. Off by default: web workers serve no scraping route, so only
+# the process that runs ScraperService (scraper / ingestion worker) should set it.
+BROWSER_WARM = int(os.getenv("BROWSER_WARM", "0"))
+
+
+class PoolTimeout(TimeoutError):
+    """No driver became free within the lease timeout."""
+
+
+# -----------------------------------------------
+# 🏭 Default driver factory (headless Chrome)
+# -----------------------------------------------
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def chrome_driver_factory():
+    """Launch headless Chrome. The driver binary is resolved once per process, not per launch."""
+    global _driver_path
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+
+    with _driver_path_lock:
+        if _driver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            _driver_path = ChromeDriverManager().install()
+
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--log-level=3")
+    options.page_load_strategy = "eager"  # the explicit card wait decides when we are done
+    driver = webdriver.Chrome(service=Service(_driver_path), options=options)
+    driver.set_page_load_timeout(BROWSER_PAGE_TIMEOUT)  # a hung page raises instead of holding the lease
+    return driver
+
+
+def wait_for_selector(driver, css_selector, timeout=BROWSER_WAIT_TIMEOUT, poll=0.1):
+    """Explicit wait: return as soon as `css_selector` matches, or False after `timeout`."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if driver.find_elements("css selector", css_selector):
+                return True
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll)
+
+
+# -----------------------------------------------
+# 🚗 Browser pool
+# -----------------------------------------------
+class _Lease:
+    __slots__ = ("driver", "pages", "created_at", "idle_since")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = self.idle_since = time.monotonic()
+
+
+class BrowserPool:
+    """
+    A fixed number of warm browser drivers shared by scraper threads.
+    `lease()` hands out an idle driver (creating one while under `size`), waits up to
+    `lease_timeout` when all are busy, health-checks drivers on the way out and recycles
+    them after `max_pages` pages or any error. Drivers left idle for `idle_timeout` seconds
+    are quit by a reaper thread, so a quiet worker does not keep Chrome processes around.
+    """
+
+    def __init__(self, factory=chrome_driver_factory, size=BROWSER_POOL_SIZE,
+                 lease_timeout=BROWSER_LEASE_TIMEOUT, max_pages=BROWSER_MAX_PAGES,
+                 idle_timeout=BROWSER_IDLE_TIMEOUT):
+        self.factory = factory
+        self.size = size
+        self.lease_timeout = lease_timeout
+        self.max_pages = max_pages
+        self.idle_timeout = idle_timeout
+        self._idle = queue.LifoQueue()  # most recently used first: its caches are warm
+        self._lock = threading.Lock()
+        self._open = 0
+        self._closed = False
+        self._stopped = threading.Event()
+        self._reaper = None
+        self.stats = {"created": 0, "recycled": 0, "unhealthy": 0, "leases": 0, "timeouts": 0, "reaped": 0}
+
+    def warm(self, count=None):
+        """Start drivers ahead of the first lease (e.g. in a background thread at boot)."""
+        for _ in range(min(count or self.size, self.size)):
+            lease = self._create()
+            if lease is None:
+                break
+            self._idle.put(lease)
+
+    def _create(self):
+        with self._lock:
+            if self._closed or self._open >= self.size:
+                return None
+            self._open += 1
+        try:
+            lease = _Lease(self.factory())
+        except Exception:
+            with self._lock:
+                self._open -= 1
+            raise
+        with self._lock:
+            self.stats["created"] += 1
+            if self.idle_timeout > 0 and self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_loop, name="browser-reaper", daemon=True)
+                self._reaper.start()
+        return lease
+
+    def _reap_loop(self):
+        while not self._stopped.wait(max(0.05, self.idle_timeout / 2)):
+            self.reap_idle()
+
+    def reap_idle(self):
+        """Quit drivers idle for longer than idle_timeout; returns how many were quit."""
+        now = time.monotonic()
+        drained = []
+        while True:
+            try:
+                drained.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        reaped = 0
+        for lease in reversed(drained):  # oldest first, so the LIFO order is kept
+            if now - lease.idle_since >= self.idle_timeout:
+                self._discard(lease)
+                reaped += 1
+            else:
+                self._idle.put(lease)
+        if reaped:
+            with self._lock:
+                self.stats["reaped"] += reaped
+            logger.info(f"🧹 Quit {reaped} idle browser(s)")
+        return reaped
+
+    def _acquire(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                lease = self._idle.get_nowait()
+            except queue.Empty:
+                lease = self._create()
+                if lease is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        with self._lock:
+                            self.stats["timeouts"] += 1
+                        raise PoolTimeout(f"no browser free after {timeout:.1f}s")
+                    try:
+                        # Short waits so a slot freed by a recycled driver is noticed too
+                        lease = self._idle.get(timeout=min(remaining, 0.25))
+                    except queue.Empty:
+                        continue
+            if self._is_healthy(lease.driver):
+                return lease
+            with self._lock:
+                self.stats["unhealthy"] += 1
+            self._discard(lease)
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, lease):
+        try:
+            lease.driver.quit()
+        except Exception as e:
+            logger.warning(f"⚠️ Browser quit failed: {e}")
+        with self._lock:
+            self._open -= 1
+
+    def _release(self, lease, failed):
+        lease.pages += 1
+        if failed or self._closed or lease.pages >= self.max_pages:
+            with self._lock:
+                self.stats["recycled"] += 1
+            self._discard(lease)
+        else:
+            lease.idle_since = time.monotonic()
+            self._idle.put(lease)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """`with pool.lease() as driver:` — one page per lease."""
+        lease = self._acquire(self.lease_timeout if timeout is None else timeout)
+        with self._lock:
+            self.stats["leases"] += 1
+        failed = False
+        try:
+            yield lease.driver
+        except BaseException:
+            failed = True  # a driver that raised mid-page is not trusted again
+            raise
+        finally:
+            self._release(lease, failed)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._stopped.set()
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, open=self._open, idle=self._idle.qsize(), size=self.size)
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Process-wide pool of headless Chrome drivers, created on first use and closed at exit."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = BrowserPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+def warm_browsers(count=BROWSER_WARM):
+    """Start `count` drivers in the process-wide pool (worker warm-up); 0 when Selenium is absent."""
+    from importlib.util import find_spec
+    if count <= 0 or find_spec("selenium") is None:
+        return 0
+    pool = get_browser_pool()
+    pool.warm(count)
+    return pool.snapshot()["open"]
@@ -0,0 +1,167 @@
+import os
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from utils.salary import parse_salary
+from utils.locations import locate
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv("CATALOG_BATCH_SIZE", "200"))
+MAX_PENDING = 5000  # staged jobs kept in memory if nothing flushes them
+MAX_AGE = timedelta(seconds=int(os.getenv("CATALOG_MAX_AGE", str(6 * 3600))))
+
+# other_sources (cross-provider duplicates, utils/dedup.py) is not stored: it lives in search results only
+_CATALOG_FIELDS = ("title", "company", "location", "location_id", "location_state", "job_type", "salary", "salary_min", "salary_max",
+                   "salary_currency", "salary_period", "description", "url", "posted_date", "remote", "source")
+_SALARY_FIELDS = ("salary_min", "salary_max", "salary_currency", "salary_period")
+_MAX_LENGTHS = {"title": 200, "company": 200, "location": 200, "location_id": 64, "location_state": 64,
+                "job_type": 50, "salary": 100,
+                "url": 1000, "posted_date": 50, "source": 100}
+
+# Jobs normalized on any thread wait here until the flusher thread writes them in one batch
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def stage_job(job):
+    """Queue a normalized job for the next batch upsert. Safe to call from any thread."""
+    job_id = str(job.get("id") or "")
+    if not job_id or job_id == "#" or str(job.get("source", "")).lower() == "mock":
+        return
+    with _pending_lock:
+        if len(_pending) >= MAX_PENDING and job_id not in _pending:
+            return
+        _pending[job_id] = dict(job)
+
+
+def pending_count():
+    with _pending_lock:
+        return len(_pending)
+
+
+class CatalogService:
+    """Persistent catalog of normalized jobs, used as the first lookup for detail/save/apply."""
+
+    def __init__(self):
+        self._app = None
+        self._wake = threading.Event()
+        self._flusher = None
+        self._flusher_lock = threading.Lock()
+
+    def flush_later(self, app):
+        """
+        Wake the background flusher, which writes staged jobs and buffered search counts;
+        the request that produced them never waits for the upserts.
+        """
+        self._app = app
+        if self._flusher is None:
+            with self._flusher_lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name="catalog-flusher", daemon=True)
+                    self._flusher.start()
+        self._wake.set()
+
+    def _flush_loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                with self._app.app_context():
+                    from services.ingestion_service import flush_search_history
+                    self.flush_staged()
+                    flush_search_history()
+            except Exception as e:
+                logger.warning(f"⚠️ Background catalog flush failed: {e}")
+
+    def flush_staged(self):
+        """Upsert everything staged since the last flush. Needs an app context."""
+        with _pending_lock:
+            jobs = list(_pending.values())
+            _pending.clear()
+        if jobs:
+            self.upsert_jobs(jobs)
+        return len(jobs)
+
+    def upsert_jobs(self, jobs):
+        """Insert or refresh jobs in batches of BATCH_SIZE rows, on a connection of their own."""
+        from sqlalchemy.orm import Session
+        from extensions import db
+        from models.simple_models import JobCatalog
+
+        now = datetime.utcnow()
+        rows = {}
+        for job in jobs:
+            job_id = str(job.get("id") or "")
+            if job_id:
+                rows[job_id] = self._row(job, job_id, now)
+        rows = list(rows.values())
+
+        # Never through db.session: that would also commit whatever the current request has pending
+        dialect = db.engine.dialect.name
+        try:
+            if dialect in ("sqlite", "postgresql"):
+                if dialect == "sqlite":
+                    from sqlalchemy.dialects.sqlite import insert
+                else:
+                    from sqlalchemy.dialects.postgresql import insert
+                with db.engine.begin() as conn:
+                    for start in range(0, len(rows), BATCH_SIZE):
+                        stmt = insert(JobCatalog).values(rows[start:start + BATCH_SIZE])
+                        stmt = stmt.on_conflict_do_update(
+                            index_elements=[JobCatalog.id],
+                            set_={name: stmt.excluded[name] for name in _CATALOG_FIELDS + ("fetched_at",)},
+                        )
+                        conn.execute(stmt)
+            else:
+                with Session(db.engine) as session:
+                    for row in rows:
+                        session.merge(JobCatalog(**row))
+                    session.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ Catalog upsert failed: {e}")
+
+    def get_job(self, job_id):
+        """
+        Return (job_dict, is_stale) for a catalogued job, or (None, False) on a miss.
+        Jobs staged in this process but not yet flushed count as fresh hits.
+        """
+        job_id = str(job_id)
+        with _pending_lock:
+            staged = _pending.get(job_id)
+        if staged is not None:
+            return dict(staged), False
+
+        from extensions import db
+        from models.simple_models import JobCatalog
+        try:
+            entry = db.session.get(JobCatalog, job_id)
+        except Exception as e:
+            logger.warning(f"⚠️ Catalog lookup failed for {job_id}: {e}")
+            return None, False
+        if entry is None:
+            return None, False
+        is_stale = entry.fetched_at is None or datetime.utcnow() - entry.fetched_at > MAX_AGE
+        return entry.to_dict(), is_stale
+
+    @staticmethod
+    def _row(job, job_id, now):
+        row = {"id": job_id[:255], "fetched_at": now}
+        for name in _CATALOG_FIELDS:
+            value = job.get(name)
+            if name == "remote":
+                value = bool(value)
+            elif value is not None and name in _MAX_LENGTHS:
+                value = str(value)[:_MAX_LENGTHS[name]]
+            row[name] = value
+        row["title"] = row["title"] or "Untitled"
+        if "location_id" not in job:
+            row["location_id"], row["location_state"] = locate(job.get("location") or "")
+        if "salary_currency" not in job:
+            row.update({name: value for name, value in parse_salary(job.get("salary")).items()
+                        if name in _SALARY_FIELDS})
+        return row
+
+
+catalog_service = CatalogService()
@@ -0,0 +1,163 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from extensions import db
+from models.simple_models import User
+from utils.cache import shared_backend
+
+logger = logging.getLogger(__name__)
+
+_caches = weakref.WeakSet()  # every live IdentityCache, so commits invalidate all of them
+
+IDENTITY_TTL = float(os.getenv("USER_CACHE_TTL", "60"))  # seconds a cached identity is trusted
+MAX_USERS = int(os.getenv("USER_CACHE_SIZE", "2048"))
+SESSION_KEY = "_user_version"  # version stamp of the identity the session last saw
+
+
+def user_version(snapshot):
+    """Short digest of a user's columns; changes whenever the profile or password does."""
+    return hashlib.blake2b(repr(sorted(snapshot.items())).encode(), digest_size=8).hexdigest()
+
+
+class IdentityCache:
+    """
+    Per-process LRU of logged-in users for Flask-Login's user_loader.
+    An entry is used only while it is younger than IDENTITY_TTL and its version matches the
+    stamp in the caller's session, so a profile or password change committed by another
+    worker is picked up as soon as that user's session carries the new stamp. Entries hold
+    column values, not ORM instances; a hit is merged into the request's session without a
+    SELECT. Any committed update or delete of a User drops its entry here (events below)
+    and, with a shared `backend`, leaves a revocation marker that every worker checks
+    before serving a hit, so a deleted user or an old session after a password change is
+    not served from another worker's cache. Without a backend shared by every worker
+    (CACHE_BACKEND=memory, or several hosts) other workers keep serving it for up to `ttl`.
+    """
+
+    def __init__(self, ttl=IDENTITY_TTL, max_users=MAX_USERS, clock=time.monotonic, backend=None,
+                 namespace="identity"):
+        self.ttl = ttl
+        self.max_users = max_users
+        self.backend = backend
+        self.namespace = namespace
+        self._clock = clock
+        self._users = OrderedDict()   # user_id -> (expires_at, version, column values, loaded at wall time)
+        self._invalidated = {}        # user_id -> when its entry was last dropped
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "expired": 0, "revoked": 0, "invalidations": 0}
+        _caches.add(self)
+
+    def load(self, user_id, version=None):
+        """Return (user, version) for `user_id`, or (None, None) when there is no such user."""
+        now = self._clock()
+        hit = None
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                self._stats["misses"] += 1
+            elif entry[0] <= now:
+                self._stats["expired"] += 1
+            elif version is None or entry[1] != version:
+                self._stats["stale"] += 1
+            else:
+                hit = entry
+        if hit is not None:
+            # One shared read: did another worker commit a change to this user since?
+            revoked = self._revoked_since(user_id, hit[3])
+            with self._lock:
+                if not revoked:
+                    self._stats["hits"] += 1
+                    self._users.move_to_end(user_id)
+                    return self._attach(hit[2]), hit[1]
+                self._stats["revoked"] += 1
+                self._users.pop(user_id, None)
+
+        started, started_wall = self._clock(), time.time()
+        user = db.session.get(User, user_id)
+        if user is None:
+            with self._lock:
+                self._users.pop(user_id, None)
+            return None, None
+        snapshot = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        loaded_version = user_version(snapshot)
+        with self._lock:
+            # A change committed while we were reading wins over what we read
+            if self._invalidated.get(user_id, float("-inf")) < started:
+                self._users[user_id] = (now + self.ttl, loaded_version, snapshot, started_wall)
+                self._users.move_to_end(user_id)
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+        return user, loaded_version
+
+    @staticmethod
+    def _attach(snapshot):
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+    def _revoked_since(self, user_id, loaded_at):
+        """True when some worker committed a change to this user after the entry was read."""
+        if self.backend is None:
+            return False
+        marker = self.backend.get(self.namespace, user_id)
+        return marker is not None and marker[0]["at"] >= loaded_at
+
+    def invalidate(self, user_id, publish=True):
+        if publish and self.backend is not None:
+            self.backend.set(self.namespace, user_id, {"at": time.time()}, ttl=self.ttl)
+        now = self._clock()
+        with self._lock:
+            self._users.pop(user_id, None)
+            self._invalidated[user_id] = now
+            self._stats["invalidations"] += 1
+            if len(self._invalidated) > 4 * self.max_users:
+                self._invalidated = {u: t for u, t in self._invalidated.items() if now - t < self.ttl}
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+            self._invalidated.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = sum(self._stats[k] for k in ("hits", "misses", "stale", "expired"))
+            return dict(self._stats, size=len(self._users),
+                        hit_rate=round(self._stats["hits"] / lookups, 3) if lookups else None)
+
+
+identity_cache = IdentityCache(backend=shared_backend)
+
+
+# -----------------------------------------------
+# 🔔 Invalidation: committed profile / password changes and deletes
+# -----------------------------------------------
+def _touch_user(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("identity_users", set()).add(target.id)
+
+
+event.listen(User, "after_update", _touch_user)
+event.listen(User, "after_delete", _touch_user)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    for user_id in session.info.pop("identity_users", ()):
+        published = set()
+        for cache in list(_caches):
+            key = (id(cache.backend), cache.namespace)
+            cache.invalidate(user_id, publish=key not in published)
+            published.add(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop("identity_users", None)
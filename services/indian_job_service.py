@@ -1,4 +1,4 @@
-import requests
+import provider_transport
 import json
 from datetime import datetime
 from models.simple_models import Job
@@ -20,7 +20,7 @@ class IndianJobService:
                 'content-type': 'application/json'
             }
             
-            response = requests.get(self.config.ADZUNA_INDIA_API, params=params, timeout=10)
+            response = provider_transport.get(self.config.ADZUNA_INDIA_API, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -69,7 +69,7 @@ class IndianJobService:
             else:
                 params['location'] = 'India'
             
-            response = requests.get(self.config.GITHUB_JOBS_API, params=params, timeout=10)
+            response = provider_transport.get(self.config.GITHUB_JOBS_API, params=params, timeout=10)
             response.raise_for_status()
             
             jobs_data = response.json()
@@ -0,0 +1,288 @@
+import os
+import math
+import time
+import random
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------
+# ⚙️ Configuration
+# -----------------------------------------------
+TOP_TITLES = [t.strip() for t in os.getenv(
+    "INGEST_TITLES",
+    "Python Developer,Data Analyst,Data Scientist,Java Developer,Frontend Developer,"
+    "Backend Developer,DevOps Engineer,Full Stack Developer",
+).split(",") if t.strip()]
+
+INGEST_INTERVAL = float(os.getenv("INGEST_INTERVAL", "300"))   # seconds between ticks
+INGEST_JITTER = float(os.getenv("INGEST_JITTER", "0.2"))       # ±20% on every sleep
+INGEST_BATCH = int(os.getenv("INGEST_BATCH", "6"))             # queries refreshed per tick
+INGEST_LIMIT = int(os.getenv("INGEST_LIMIT", "25"))
+HISTORY_TOP_N = int(os.getenv("INGEST_HISTORY_TOP", "20"))
+# Provider calls allowed per hour, e.g. "Mantiks=60,JSearch=30"
+DEFAULT_QUOTAS = {"Mantiks": 60, "Jooble": 120, "Adzuna": 120, "JSearch": 30}
+
+
+def _parse_quotas(raw):
+    quotas = dict(DEFAULT_QUOTAS)
+    for item in raw.split(","):
+        name, _, value = item.strip().partition("=")
+        if name and value.isdigit():
+            quotas[name.strip()] = int(value)
+    return quotas
+
+
+# -----------------------------------------------
+# 📈 Search history (recorded by job_list, written by the catalog flusher thread)
+# -----------------------------------------------
+_history = Counter()
+_history_lock = threading.Lock()
+
+
+def record_search(query, location):
+    """Count a user search; written to SearchHistory with the next background catalog flush."""
+    query = " ".join((query or "").split())[:200]
+    if not query:
+        return
+    with _history_lock:
+        _history[(query.lower(), (location or "").strip()[:100])] += 1
+
+
+def pending_searches():
+    with _history_lock:
+        return len(_history)
+
+
+def flush_search_history():
+    """
+    Add buffered search counts to SearchHistory: one INSERT ... ON CONFLICT DO UPDATE
+    (hits = hits + excluded.hits) on a connection of its own. Needs an app context.
+    """
+    with _history_lock:
+        counts = dict(_history)
+        _history.clear()
+    if not counts:
+        return 0
+
+    from sqlalchemy.orm import Session
+    from extensions import db
+    from models.simple_models import SearchHistory
+
+    now = datetime.utcnow()
+    rows = [{"keyword": query, "location": location, "hits": hits, "last_searched_at": now}
+            for (query, location), hits in counts.items()]
+    dialect = db.engine.dialect.name
+    try:
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            stmt = insert(SearchHistory).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[SearchHistory.keyword, SearchHistory.location],
+                set_={"hits": SearchHistory.hits + stmt.excluded.hits,
+                      "last_searched_at": stmt.excluded.last_searched_at},
+            )
+            with db.engine.begin() as conn:
+                conn.execute(stmt)
+        else:
+            with Session(db.engine) as session:
+                for row in rows:
+                    existing = session.query(SearchHistory).filter_by(
+                        keyword=row["keyword"], location=row["location"]).first()
+                    if existing:
+                        existing.hits += row["hits"]
+                        existing.last_searched_at = now
+                    else:
+                        session.add(SearchHistory(**row))
+                session.commit()
+    except Exception as e:
+        logger.warning(f"⚠️ Search history flush failed: {e}")
+    return len(counts)
+
+
+# -----------------------------------------------
+# 🎫 Per-provider quotas
+# -----------------------------------------------
+class ProviderQuota:
+    """Token bucket per provider: `per_hour` calls, refilled continuously."""
+
+    def __init__(self, per_hour, clock=time.monotonic):
+        self.capacity = max(0, per_hour)  # 0 disables the provider for ingestion
+        self.rate = per_hour / 3600.0
+        self.tokens = float(self.capacity)
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()  # charged from the fan-out's provider threads
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self):
+        with self._lock:
+            self._refill()
+            return self.tokens >= 1
+
+    def try_acquire(self):
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+# -----------------------------------------------
+# 🔄 Ingestion scheduler
+# -----------------------------------------------
+class IngestionScheduler:
+    """
+    Pre-warms popular searches so most user searches are served from cache.
+    Every tick refreshes page 1 (the page job_list reads) of the next INGEST_BATCH queries
+    of the matrix (canonical cities x top titles, plus the most searched history entries)
+    and feeds the search cache, the detail cache and the job catalog; deeper pages are left
+    to the catalog. Warmed entries stay fresh for a whole pass over the matrix, and every
+    provider request (page or hedge) is charged to that provider's quota.
+    """
+
+    def __init__(self, app, quotas=None, fetcher=None, clock=time.monotonic):
+        self.app = app
+        self.quotas = {name: ProviderQuota(n, clock) for name, n in
+                       (quotas or _parse_quotas(os.getenv("INGEST_QUOTAS", ""))).items()}
+        self._fetcher = fetcher
+        self._cursor = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = Counter()
+
+    # ---- query matrix ----
+    def build_matrix(self):
+        from utils.locations import METRO_CITIES
+        matrix = [(title, city) for title in TOP_TITLES for city in METRO_CITIES]
+
+        try:
+            from models.simple_models import SearchHistory
+            since = datetime.utcnow() - timedelta(days=7)
+            popular = (SearchHistory.query
+                       .filter(SearchHistory.last_searched_at >= since)
+                       .order_by(SearchHistory.hits.desc())
+                       .limit(HISTORY_TOP_N).all())
+            history = [(row.keyword, row.location or "India") for row in popular]
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read search history: {e}")
+            history = []
+
+        # History first: those are searches users actually make
+        seen, ordered = set(), []
+        for title, location in history + matrix:
+            key = (title.lower(), location.lower())
+            if key not in seen:
+                seen.add(key)
+                ordered.append((title, location))
+        return ordered
+
+    # ---- one tick ----
+    def run_once(self):
+        """Refresh the next batch of queries. Returns the number of jobs ingested."""
+        with self.app.app_context():
+            matrix = self.build_matrix()
+            if not matrix:
+                return 0
+            ingested = 0
+            ttl = self.pass_period(len(matrix))
+            for _ in range(min(INGEST_BATCH, len(matrix))):
+                title, location = matrix[self._cursor % len(matrix)]
+                self._cursor += 1
+                ingested += self._ingest(title, location, ttl)
+            from services.catalog_service import catalog_service
+            catalog_service.flush_staged()
+            return ingested
+
+    @staticmethod
+    def pass_period(queries):
+        """Longest time between two refreshes of one query: ticks per pass x the longest tick gap."""
+        return math.ceil(queries / max(1, INGEST_BATCH)) * INGEST_INTERVAL * (1 + INGEST_JITTER)
+
+    def _charge(self, name):
+        quota = self.quotas.get(name)
+        if quota is not None and quota.try_acquire():
+            return True
+        self.stats["quota_exhausted"] += 1
+        return False
+
+    def _ingest(self, title, location, ttl=None):
+        from jobapi_client import fetch_jobs_fanout
+        from rapidapi_client import remember_jobs
+        from utils.cache import search_cache, search_key
+
+        allowed = [name for name, quota in self.quotas.items() if quota.available()]
+        if not allowed:
+            self.stats["quota_exhausted"] += 1
+            return 0
+
+        fetch = self._fetcher or fetch_jobs_fanout
+        jobs = fetch(title=title, location=location, limit=INGEST_LIMIT, page=1, provider_names=allowed,
+                     quota=self._charge)
+
+        if jobs:
+            key = search_key(title, location, None, 1, "fanout", INGEST_LIMIT)
+            search_cache.set(key, jobs, ttl=max(search_cache.ttl_for(key), ttl or 0))
+            remember_jobs(jobs)
+        self.stats["queries"] += 1
+        self.stats["jobs"] += len(jobs or [])
+        logger.info(f"🌡️ Pre-warmed '{title}' in {location}: {len(jobs or [])} jobs via {allowed}")
+        return len(jobs or [])
+
+    # ---- loop ----
+    def _sleep_interval(self):
+        return INGEST_INTERVAL * random.uniform(1 - INGEST_JITTER, 1 + INGEST_JITTER)
+
+    def run_forever(self):
+        # Random initial delay so several hosts do not hit providers in lockstep
+        self._stop.wait(random.uniform(0, INGEST_INTERVAL * INGEST_JITTER))
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"❌ Ingestion tick failed: {e}")
+            self._stop.wait(self._sleep_interval())
+
+    def start(self):
+        """Run in a daemon thread (in-process mode)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self.run_forever, name="ingestion-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+def start_in_process(app):
+    """
+    Start the scheduler inside a web worker when INGEST_SCHEDULER=inprocess.
+    Only one worker per host runs it: the first to take the lock file.
+    """
+    lock_path = os.getenv("INGEST_LOCK_FILE") or os.path.join(
+        os.path.dirname(app.config.get("DB_PATH") or app.root_path), "jobseeker_ingest.lock")
+    try:
+        import fcntl
+        handle = open(lock_path, "w")
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except ImportError:
+        handle = None  # no flock on Windows; local dev runs a single worker anyway
+    except OSError:
+        return None  # another worker owns the scheduler
+
+    scheduler = IngestionScheduler(app)
+    scheduler._lock_handle = handle  # keep the lock for the life of the process
+    scheduler.start()
+    logger.info("🌡️ In-process ingestion scheduler started")
+    return scheduler
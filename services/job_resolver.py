@@ -0,0 +1,145 @@
+import os
+import time
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import provider_health
+from services.catalog_service import catalog_service
+from utils.cache import detail_cache
+
+logger = logging.getLogger(__name__)
+
+RESOLVER_DEADLINE = float(os.getenv("RESOLVER_DEADLINE", "3"))  # seconds for the whole remote race
+
+RESOLVER_WORKERS = int(os.getenv("RESOLVER_WORKERS", "4"))      # per source
+
+# One pool per source, so a slow provider's lookups cannot queue the others past the deadline
+_race_pools = {}
+_race_pools_lock = threading.Lock()
+
+
+def _race_pool(name):
+    with _race_pools_lock:
+        if name not in _race_pools:
+            _race_pools[name] = ThreadPoolExecutor(max_workers=RESOLVER_WORKERS,
+                                                   thread_name_prefix=f"resolver-{name.lower()}")
+        return _race_pools[name]
+
+
+def snapshot_job(row):
+    """The job as it was when the user saved or applied (SavedJob / Application columns)."""
+    return {
+        "id": row.job_id,
+        "title": row.job_title,
+        "company": row.job_company,
+        "location": row.job_location,
+        "job_type": row.job_type,
+        "salary": row.job_salary,
+        "description": row.job_description,
+        "url": row.job_url,
+        "posted_date": row.job_posted_date,
+        "remote": bool(row.job_remote),
+        "source": row.job_source or "Saved",
+    }
+
+
+class JobResolver:
+    """
+    Find one job by id, cache-first:
+      1. local, no network: detail/list caches, a fresh catalog row, the user's SavedJob and
+         Application snapshots, mock jobs
+      2. remote, only on a local miss: every provider with a closed breaker is asked at once,
+         the first job back wins, and all share one RESOLVER_DEADLINE (each source is called
+         as `fn(job_id, deadline_at=...)` and must not outlive it)
+      3. a stale catalog copy when the race comes back empty
+    """
+
+    def __init__(self, remote_sources=None, normalize=None, mock_jobs=None, deadline=RESOLVER_DEADLINE):
+        self._remote_sources = remote_sources
+        self.normalize = normalize or (lambda job, source: job)
+        self.mock_jobs = mock_jobs
+        self.deadline = deadline
+        self.stats = Counter()
+
+    @property
+    def remote_sources(self):
+        # Provider clients (and requests) are imported on the first remote lookup, not at boot
+        if self._remote_sources is None:
+            from jobapi_client import fetch_job_by_id
+            from rapidapi_client import fetch_jsearch_job
+            self._remote_sources = {"Mantiks": fetch_job_by_id, "JSearch": fetch_jsearch_job}
+        return self._remote_sources
+
+    def resolve(self, job_id, user_id=None):
+        """Return (job, origin), origin naming where it came from, or (None, None)."""
+        job_id = str(job_id)
+        job, origin, stale_job = self._resolve_local(job_id, user_id)
+        if job is None:
+            job, origin = self._race_remote(job_id)
+        if job is None and stale_job is not None:
+            job, origin = stale_job, "catalog (stale)"
+        self.stats[origin or "miss"] += 1
+        return job, origin
+
+    # ---- local sources ----
+    def _resolve_local(self, job_id, user_id):
+        """(job, origin, stale catalog copy) without any network call."""
+        from rapidapi_client import get_job_by_id_from_cache
+        job = get_job_by_id_from_cache(job_id)
+        if job:
+            return job, "cache", None
+
+        stale_job = None
+        try:
+            catalog_job, is_stale = catalog_service.get_job(job_id)
+            if catalog_job and not is_stale:
+                return catalog_job, "catalog", None
+            stale_job = catalog_job
+        except Exception as e:
+            logger.warning(f"⚠️ Catalog lookup failed for {job_id}: {e}")
+
+        if user_id is not None:
+            from models.simple_models import SavedJob, Application
+            for model, origin in ((SavedJob, "saved"), (Application, "applied")):
+                row = model.query.filter_by(user_id=user_id, job_id=job_id).first()
+                if row is not None:
+                    return snapshot_job(row), origin, stale_job
+
+        if self.mock_jobs is not None and job_id.lower().startswith("mock"):
+            job = next((dict(j) for j in self.mock_jobs() if str(j["id"]) == job_id), None)
+            if job:
+                return job, "mock", stale_job
+        return None, None, stale_job
+
+    # ---- remote race ----
+    def _race_remote(self, job_id):
+        sources = {name: fn for name, fn in self.remote_sources.items() if provider_health.is_available(name)}
+        if not sources:
+            return None, None
+        deadline_at = time.monotonic() + self.deadline
+        pending = {_race_pool(name).submit(fn, job_id, deadline_at=deadline_at): name
+                   for name, fn in sources.items()}
+        try:
+            while pending:
+                done, _ = wait(list(pending), timeout=max(0.0, deadline_at - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+                if not done:
+                    logger.info(f"⏱️ Job {job_id}: no remote answer within {self.deadline}s from {sorted(pending.values())}")
+                    break
+                for fut in done:
+                    name = pending.pop(fut)
+                    try:
+                        raw = fut.result()
+                    except Exception as e:
+                        logger.warning(f"❌ {name} lookup for {job_id} failed: {e}")
+                        continue
+                    if raw:
+                        job = self.normalize(raw, name)
+                        detail_cache.set(job_id, job)  # the next view is a local hit
+                        return job, name
+        finally:
+            for fut in pending:
+                fut.cancel()
+        return None, None
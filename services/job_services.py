@@ -1,6 +1,7 @@
 from services.api_service import ApiService
 from services.saved_job_service import SavedJobService
 from services.application_service import ApplicationService
+from services.membership_service import membership_service
 from flask_login import current_user
 from models.job import Job  # Import from the correct location
 import datetime
@@ -21,15 +22,10 @@ class JobService:
             if not api_jobs:
                 api_jobs = self._get_mock_jobs()
             
-            # Check if each job is saved and applied by current user
-            for job in api_jobs:
-                if current_user.is_authenticated:
-                    job.is_saved = self.saved_job_service.is_job_saved(job.id)
-                    job.is_applied = self.application_service.is_job_applied(job.id)
-                else:
-                    job.is_saved = False
-                    job.is_applied = False
-            
+            # Saved / applied flags for the whole page in one query
+            user_id = current_user.id if current_user.is_authenticated else None
+            membership_service.mark(api_jobs, user_id)
+
             return api_jobs
             
         except Exception as e:
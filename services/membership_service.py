@@ -0,0 +1,163 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import event, literal, select, union_all
+from sqlalchemy.orm import Session, object_session
+
+from extensions import db
+from models.simple_models import SavedJob, Application
+from utils.cache import shared_backend
+
+logger = logging.getLogger(__name__)
+
+MEMBERSHIP_TTL = float(os.getenv("MEMBERSHIP_CACHE_TTL", "30"))  # seconds a user's answers are reused
+MAX_USERS = 1024
+MAX_IDS_PER_USER = 2000
+IN_CHUNK = 500  # ids per IN (...) list, below SQLite's bound-parameter limit
+
+
+class MembershipService:
+    """
+    Answers "which of these job ids has the user saved / applied to" for a page of results
+    in one query that reads only job_id through the (user_id, job_id) unique indexes.
+    Answers are cached per user for MEMBERSHIP_TTL seconds and dropped as soon as a
+    SavedJob or Application row of that user is inserted or deleted (see the events below).
+    With a shared `backend` the drop also leaves a marker that every worker checks before
+    using its cached answers, so a save or apply made on another worker shows up at once.
+    """
+
+    def __init__(self, ttl=MEMBERSHIP_TTL, clock=time.monotonic, backend=None, namespace="membership"):
+        self.ttl = ttl
+        self.backend = backend
+        self.namespace = namespace
+        self._clock = clock
+        self._users = OrderedDict()   # user_id -> (expires_at, {job_id: (saved, applied)}, loaded at wall time)
+        self._invalidated = {}        # user_id -> when its cache was last dropped
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "queries": 0, "invalidations": 0, "revoked": 0}
+
+    def lookup(self, user_id, job_ids):
+        """Return (saved_ids, applied_ids), both subsets of `job_ids`."""
+        ids = {str(i) for i in job_ids if i is not None and str(i)}
+        if user_id is None or not ids:
+            return set(), set()
+
+        now = self._clock()
+        with self._lock:
+            entry = self._users.get(user_id)
+        if entry and entry[0] > now and self._revoked_since(user_id, entry[2]):
+            # Another worker committed a save/unsave/apply after these answers were read
+            with self._lock:
+                if self._users.get(user_id) is entry:
+                    self._users.pop(user_id)
+                self.stats["revoked"] += 1
+            entry = None
+        with self._lock:
+            known = entry[1] if entry and entry[0] > now else {}
+            missing = ids - known.keys()
+            self.stats["hits"] += len(ids) - len(missing)
+            self.stats["misses"] += len(missing)
+
+        if missing:
+            started, started_wall = self._clock(), time.time()
+            answers = self._query(user_id, missing)
+            with self._lock:
+                # A save/unsave that committed while we were querying wins over our answers
+                if self._invalidated.get(user_id, float("-inf")) < started:
+                    entry = self._users.get(user_id)
+                    if not entry or entry[0] <= now or len(entry[1]) + len(answers) > MAX_IDS_PER_USER:
+                        entry = (now + self.ttl, {}, started_wall)
+                    # The entry keeps the load time of its oldest answers
+                    self._users[user_id] = (entry[0], dict(entry[1], **answers), entry[2])
+                    self._users.move_to_end(user_id)
+                    while len(self._users) > MAX_USERS:
+                        self._users.popitem(last=False)
+            known = dict(known, **answers)
+
+        return ({i for i in ids if known[i][0]}, {i for i in ids if known[i][1]})
+
+    def _query(self, user_id, job_ids):
+        answers = {job_id: (False, False) for job_id in job_ids}
+        job_ids = sorted(job_ids)
+        for start in range(0, len(job_ids), IN_CHUNK):
+            chunk = job_ids[start:start + IN_CHUNK]
+            statement = union_all(
+                select(SavedJob.job_id, literal("saved").label("kind"))
+                .where(SavedJob.user_id == user_id, SavedJob.job_id.in_(chunk)),
+                select(Application.job_id, literal("applied").label("kind"))
+                .where(Application.user_id == user_id, Application.job_id.in_(chunk)),
+            )
+            with self._lock:
+                self.stats["queries"] += 1
+            for job_id, kind in db.session.execute(statement):
+                saved, applied = answers[job_id]
+                answers[job_id] = (saved or kind == "saved", applied or kind == "applied")
+        return answers
+
+    def mark(self, jobs, user_id=None):
+        """Set is_saved / is_applied on job dicts or objects for `user_id` (None: anonymous)."""
+        def job_id(job):
+            return job.get("id") if isinstance(job, dict) else getattr(job, "id", None)
+
+        saved, applied = self.lookup(user_id, (job_id(j) for j in jobs))
+        for job in jobs:
+            key = str(job_id(job))
+            if isinstance(job, dict):
+                job["is_saved"], job["is_applied"] = key in saved, key in applied
+            else:
+                job.is_saved, job.is_applied = key in saved, key in applied
+        return jobs
+
+    def _revoked_since(self, user_id, loaded_at):
+        """True when some worker committed a membership change for this user after `loaded_at`."""
+        if self.backend is None:
+            return False
+        marker = self.backend.get(self.namespace, user_id)
+        return marker is not None and marker[0]["at"] >= loaded_at
+
+    def invalidate(self, user_id, publish=True):
+        if publish and self.backend is not None:
+            self.backend.set(self.namespace, user_id, {"at": time.time()}, ttl=self.ttl)
+        now = self._clock()
+        with self._lock:
+            self._users.pop(user_id, None)
+            self._invalidated[user_id] = now
+            self.stats["invalidations"] += 1
+            if len(self._invalidated) > 4 * MAX_USERS:
+                self._invalidated = {u: t for u, t in self._invalidated.items() if now - t < self.ttl}
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+            self._invalidated.clear()
+
+
+membership_service = MembershipService(backend=shared_backend)
+
+
+# -----------------------------------------------
+# 🔔 Invalidation: any committed save, unsave or apply
+# -----------------------------------------------
+def _touch_user(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("membership_users", set()).add(target.user_id)
+
+
+for _model in (SavedJob, Application):
+    event.listen(_model, "after_insert", _touch_user)
+    event.listen(_model, "after_delete", _touch_user)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    for user_id in session.info.pop("membership_users", ()):
+        membership_service.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop("membership_users", None)
@@ -0,0 +1,120 @@
+import os
+import time
+import logging
+
+from utils.salary import parse_salary, parse_salary_filter
+from utils.locations import locate, location_filter, resolve_location
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------
+# 🧭 Filter pushdown: which filters each provider applies server-side
+# -----------------------------------------------
+# Anything a provider cannot filter on is checked locally on its results ("residual").
+PUSHDOWN = {
+    "Mantiks": {"location", "job_type"},
+    "Jooble": {"location", "salary_min"},
+    "Adzuna": {"location", "job_type", "salary_min"},
+    "JSearch": {"location"},
+}
+FILTERS = ("location", "job_type", "salary_min")
+
+PLANNER_MAX_PAGES = int(os.getenv("PLANNER_MAX_PAGES", "3"))  # provider pages per search
+PLANNER_BUDGET = float(os.getenv("PLANNER_BUDGET", "3"))      # seconds of paging per provider
+
+# Adzuna contract flags for our job types
+ADZUNA_JOB_TYPES = {"full-time": "full_time", "part-time": "part_time", "contract": "contract",
+                    "permanent": "permanent"}
+
+
+class QueryPlan:
+    """
+    A search with its filters, split per provider into pushed-down request params and
+    residual checks run locally on that provider's results.
+    """
+
+    def __init__(self, title=None, location=None, job_type=None, salary_min=None, limit=25):
+        self.title = title
+        self.location = location
+        self.location_key = location_filter(location)  # ("location_id" | "location_state", id) or None
+        self.job_type = (job_type or "").strip() or None
+        self.salary_min = parse_salary_filter(salary_min)  # annual INR
+        self.limit = limit
+
+    def active_filters(self):
+        active = set()
+        # All of India is no filter; places outside the gazetteer still filter by substring
+        if self.location_key or (self.location and not resolve_location(self.location)):
+            active.add("location")
+        if self.job_type:
+            active.add("job_type")
+        if self.salary_min:
+            active.add("salary_min")
+        return active
+
+    def pushed(self, provider):
+        return self.active_filters() & PUSHDOWN.get(provider, set())
+
+    def residual(self, provider):
+        return self.active_filters() - PUSHDOWN.get(provider, set())
+
+    def signature(self):
+        """Cache-key part for the filters; "" when unfiltered so pre-warmed entries still match."""
+        parts = []
+        if self.job_type:
+            parts.append(self.job_type.lower())
+        if self.salary_min:
+            parts.append(f"salary>={self.salary_min}")
+        return ";".join(parts) or None
+
+    def matches(self, job, filters=None):
+        """Check a job against `filters` (default: every active filter)."""
+        for name in self.active_filters() if filters is None else filters:
+            if name == "location" and not self._meets_location(job):
+                return False
+            if name == "job_type" and self.job_type.lower() not in (job.get("job_type") or "").lower():
+                return False
+            if name == "salary_min" and not self._meets_salary(job):
+                return False
+        return True
+
+    def _meets_location(self, job):
+        if self.location_key is None:
+            # Place not in the gazetteer: fall back to a substring test
+            return self.location.lower() in (job.get("location") or "").lower()
+        column, location_id = self.location_key
+        if "location_id" in job:
+            ids = {"location_id": job["location_id"], "location_state": job.get("location_state")}
+        else:
+            ids = dict(zip(("location_id", "location_state"), locate(job.get("location") or "")))
+        return ids[column] == location_id
+
+    def _meets_salary(self, job):
+        # Normalized jobs carry the numbers parsed at ingest; raw ones are parsed here
+        fields = job if "salary_currency" in job else parse_salary(job.get("salary"))
+        return fields["salary_currency"] == "INR" and (fields["salary_min"] or 0) >= self.salary_min
+
+    def fetch(self, provider, fetch_page, page=1, deadline_at=None):
+        """
+        Call `fetch_page(page)` for one provider, keep the jobs passing its residual filters,
+        and move on to the next page until `limit` jobs are kept, the provider runs dry,
+        PLANNER_MAX_PAGES pages are read or the time budget is spent.
+        """
+        residual = self.residual(provider)
+        budget_at = time.monotonic() + PLANNER_BUDGET
+        if deadline_at is not None:
+            budget_at = min(budget_at, deadline_at)
+
+        kept, pages = [], 0
+        for current in range(page, page + PLANNER_MAX_PAGES):
+            batch = fetch_page(current) or []
+            pages += 1
+            kept.extend(j for j in batch if self.matches(j, residual))
+            if (not residual or len(kept) >= self.limit or len(batch) < self.limit
+                    or time.monotonic() >= budget_at):
+                break
+
+        if residual:
+            logger.info(f"🧭 {provider}: kept {len(kept)} jobs after residual {sorted(residual)} "
+                        f"over {pages} page(s)")
+        return kept[:self.limit]
@@ -1,140 +1,249 @@
-import requests
-from bs4 import BeautifulSoup
+import os
+import provider_transport
 from datetime import datetime
+from urllib.parse import urlsplit, quote_plus
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import time
 import random
 import logging
-import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+import threading
+from services.browser_pool import get_browser_pool, wait_for_selector
+from utils.dedup import NearDuplicateFilter
+from utils.html_extract import CardSpec, Field, get_engine
+from utils.job_ids import make_job_id
+
+# -----------------------------------------------
+# ⚙️ Pipeline settings
+# -----------------------------------------------
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "8"))
+SCRAPER_PAGES = int(os.getenv("SCRAPER_PAGES", "3"))                        # result pages per site
+SCRAPER_DOMAIN_CONCURRENCY = int(os.getenv("SCRAPER_DOMAIN_CONCURRENCY", "2"))  # parallel fetches per host
+SCRAPER_TIMEOUT = float(os.getenv("SCRAPER_TIMEOUT", "10"))
+SCRAPER_DEADLINE = float(os.getenv("SCRAPER_DEADLINE", "30"))  # seconds for a whole iter_jobs run
+
+SITE_URLS = {
+    "naukri": "https://www.naukri.com",
+    "indeed": "https://in.indeed.com",
+}
+
+_pool = ThreadPoolExecutor(max_workers=SCRAPER_WORKERS, thread_name_prefix="scraper")
+_domain_slots = {}
+_domain_lock = threading.Lock()
+
+
+def _domain_slot(url):
+    """Semaphore bounding concurrent fetches to one host."""
+    host = urlsplit(url).netloc.lower()
+    with _domain_lock:
+        if host not in _domain_slots:
+            _domain_slots[host] = threading.BoundedSemaphore(SCRAPER_DOMAIN_CONCURRENCY)
+        return _domain_slots[host]
+
+
+class _Blocked(Exception):
+    pass
+
+
+# -----------------------------------------------
+# 🧩 Card parsers (one per site)
+# -----------------------------------------------
+NAUKRI_CARDS = "div.srp-jobtuple-wrapper, div.jobTuple.bgWhite.br4.mb-8"
+INDEED_CARDS = "div.job_seen_beacon"
+
+# Selectors are compiled once; every engine (SCRAPER_ENGINE=lxml|stream|bs4) reads the same specs
+NAUKRI_SPEC = CardSpec(NAUKRI_CARDS, {
+    "title": Field("a.title"),
+    "href": Field("a.title", "href"),
+    "company": Field("a.comp-name, a.subTitle"),
+    "job_id": Field(None, "data-job-id"),
+}, container="div#listContainer")
+INDEED_SPEC = CardSpec(INDEED_CARDS, {
+    "title": Field("h2.jobTitle span"),
+    "company": Field("span[data-testid='company-name']"),
+    "jk": Field("a[data-jk]", "data-jk"),
+}, container="#mosaic-provider-jobcards")
+
+_engine = get_engine()
+
+
+def parse_naukri(html, location, engine=None):
+    jobs = []
+    for c in (engine or _engine).extract(html, NAUKRI_SPEC):
+        title, company = c["title"], c["company"]
+        if not title or not company:
+            continue
+        href = c["href"] or "#"
+        jobs.append({
+            "id": make_job_id("Naukri", c["job_id"], title, company, location, href),
+            "title": title,
+            "company": company,
+            "location": location,
+            "salary": "Not Disclosed",
+            "description": "Job listing from Naukri India",
+            "url": href,
+            "posted_date": datetime.now().strftime("%b %d, %Y"),
+            "remote": "remote" in title.lower(),
+            "source": "Naukri"
+        })
+    return jobs
+
+
+def parse_indeed(html, location, engine=None):
+    jobs = []
+    for c in (engine or _engine).extract(html, INDEED_SPEC):
+        title, company, jk = c["title"], c["company"], c["jk"]
+        if not title or not company:
+            continue
+        jobs.append({
+            "id": make_job_id("Indeed", jk, title, company, location),
+            "title": title,
+            "company": company,
+            "location": location,
+            "salary": "Not Disclosed",
+            "description": "Job listing from Indeed India",
+            "url": f"https://in.indeed.com/viewjob?jk={jk}" if jk else "https://in.indeed.com",
+            "posted_date": datetime.now().strftime("%b %d, %Y"),
+            "remote": "remote" in title.lower(),
+            "source": "Indeed"
+        })
+    return jobs
+
 
 class ScraperService:
-    """Smart Indian Job Scraper (2025) — smooth fallback"""
+    """Smart Indian Job Scraper (2025) — concurrent multi-page pipeline with smooth fallback"""
 
-    def __init__(self):
+    def __init__(self, site_urls=None, browser_fallback=True, browser_pool=None):
         self.logger = logging.getLogger(__name__)
         self.user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122 Safari/537.36",
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
         ]
+        self.site_urls = dict(SITE_URLS, **(site_urls or {}))
+        self.browser_fallback = browser_fallback
+        self._browser_pool = browser_pool
+        # site -> (page URL builder, parser, block markers, card selector for the browser wait)
+        self.sites = {
+            "naukri": (self._naukri_url, parse_naukri, ("captcha",), NAUKRI_CARDS),
+            "indeed": (self._indeed_url, parse_indeed, ("captcha",), INDEED_CARDS),
+        }
 
     def _headers(self):
         return {"User-Agent": random.choice(self.user_agents)}
 
-    def _driver(self):
-        options = Options()
-        options.add_argument("--headless=new")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--log-level=3")
-        return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    @property
+    def browser_pool(self):
+        return self._browser_pool or get_browser_pool()
+
+    # ---- result page URLs ----
+    def _naukri_url(self, keyword, location, page):
+        suffix = f"-{page}" if page > 1 else ""
+        return (f"{self.site_urls['naukri'].rstrip('/')}/"
+                f"{keyword.replace(' ', '-')}-jobs-in-{location.replace(' ', '-')}{suffix}")
+
+    def _indeed_url(self, keyword, location, page):
+        start = f"&start={(page - 1) * 10}" if page > 1 else ""
+        return f"{self.site_urls['indeed'].rstrip('/')}/jobs?q={quote_plus(keyword)}&l={quote_plus(location)}{start}"
+
+    # ---- one page ----
+    def _fetch_page(self, url, block_markers):
+        with _domain_slot(url):
+            r = provider_transport.get(url, headers=self._headers(), timeout=SCRAPER_TIMEOUT)
+        if r.status_code != 200 or any(marker in r.text.lower() for marker in block_markers):
+            raise _Blocked(f"{r.status_code} from {url}")
+        return r.text
+
+    def _render_page(self, url, card_selector):
+        """Load a page in a warm pooled browser and wait for the job cards, not a fixed sleep."""
+        with self.browser_pool.lease() as driver:
+            driver.get(url)
+            if not wait_for_selector(driver, card_selector):
+                self.logger.warning(f"⚠️ No job cards rendered at {url}")
+            return driver.page_source
+
+    def _scrape_page(self, site, keyword, location, page, use_browser=False):
+        """Fetch and parse one result page (runs on the scraper pool)."""
+        build_url, parse, block_markers, card_selector = self.sites[site]
+        url = build_url(keyword, location, page)
+        html = self._render_page(url, card_selector) if use_browser else self._fetch_page(url, block_markers)
+        return parse(html, location)
+
+    # ---- pipeline ----
+    def iter_jobs(self, keyword="python", location="Bengaluru", pages=None, sites=None, deadline=None):
+        """
+        Scrape several result pages of every site in parallel (at most
+        SCRAPER_DOMAIN_CONCURRENCY requests per host) and yield normalized, de-duplicated
+        jobs as each page is parsed. A site stops paging at its first empty page; a blocked
+        or empty first page gets one headless-browser retry when browser_fallback is on.
+        Pages still loading after `deadline` seconds (SCRAPER_DEADLINE) are given up on.
+        """
+        pages = pages or SCRAPER_PAGES
+        sites = sites or list(self.sites)
+        deadline_at = time.monotonic() + (SCRAPER_DEADLINE if deadline is None else deadline)
+        dedup = NearDuplicateFilter()
+        pending = {}   # future -> (site, page, via_browser)
+        for site in sites:
+            for page in range(1, pages + 1):
+                pending[_pool.submit(self._scrape_page, site, keyword, location, page)] = (site, page, False)
+
+        try:
+            while pending:
+                done, _ = wait(list(pending), timeout=max(0.0, deadline_at - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+                if not done:
+                    self.logger.warning(f"⏱️ Scrape deadline hit, giving up on {len(pending)} pages")
+                    break
+                for fut in done:
+                    site, page, via_browser = pending.pop(fut)
+                    try:
+                        jobs = fut.result()
+                    except Exception as e:
+                        self.logger.warning(f"❌ {site} page {page} failed: {e}")
+                        jobs = None
+
+                    if not jobs:
+                        # Later pages of an exhausted or blocked site are not worth fetching
+                        for other, (other_site, other_page, _) in list(pending.items()):
+                            if other_site == site and other_page > page and other.cancel():
+                                pending.pop(other)
+                        if page == 1 and not via_browser and self.browser_fallback:
+                            self.logger.warning(f"⚠️ {site} returned 0 jobs, retrying with a browser")
+                            retry = _pool.submit(self._scrape_page, site, keyword, location, 1, True)
+                            pending[retry] = (site, 1, True)
+                        continue
+
+                    for job in jobs:
+                        kept = dedup.add(job)
+                        if kept is not None:
+                            yield kept
+        finally:
+            for fut in pending:
+                fut.cancel()
 
     def scrape_naukri(self, keyword="python", location="Bengaluru", use_selenium=False):
-        jobs = []
-        url = f"https://www.naukri.com/{keyword.replace(' ', '-')}-jobs-in-{location.replace(' ', '-')}"
         try:
-            html = None
             if use_selenium:
-                driver = self._driver()
-                driver.get(url)
-                time.sleep(4)
-                html = driver.page_source
-                driver.quit()
-            else:
-                r = requests.get(url, headers=self._headers(), timeout=10)
-                if r.status_code != 200 or "captcha" in r.text.lower():
-                    raise Exception("Blocked - Naukri")
-                html = r.text
-
-            soup = BeautifulSoup(html, "html.parser")
-            cards = soup.select("div.srp-jobtuple-wrapper, div.jobTuple.bgWhite.br4.mb-8")
-            for c in cards:
-                title = c.select_one("a.title")
-                company = c.select_one("a.comp-name, a.subTitle")
-                if not title or not company:
-                    continue
-                jobs.append({
-                    "id": f"naukri_{random.randint(1000,9999)}",
-                    "title": title.text.strip(),
-                    "company": company.text.strip(),
-                    "location": location,
-                    "salary": "Not Disclosed",
-                    "description": "Job listing from Naukri India",
-                    "url": title.get("href", "#"),
-                    "posted_date": datetime.now().strftime("%b %d, %Y"),
-                    "remote": "remote" in title.text.lower(),
-                    "source": "Naukri"
-                })
-
-            if not jobs and not use_selenium:
-                self.logger.warning("⚠️ Naukri returned 0 jobs, retrying with Selenium")
-                return self.scrape_naukri(keyword, location, use_selenium=True)
+                return self._scrape_page("naukri", keyword, location, 1, use_browser=True)
+            return list(self.iter_jobs(keyword, location, pages=1, sites=["naukri"]))
         except Exception as e:
             self.logger.warning(f"❌ Naukri scrape failed: {e}")
-        return jobs
+            return []
 
     def scrape_indeed(self, keyword="python", location="Bengaluru", use_selenium=False):
-        jobs = []
-        url = f"https://in.indeed.com/jobs?q={keyword}&l={location}"
         try:
-            html = None
             if use_selenium:
-                driver = self._driver()
-                driver.get(url)
-                time.sleep(5)
-                html = driver.page_source
-                driver.quit()
-            else:
-                r = requests.get(url, headers=self._headers(), timeout=10)
-                if r.status_code != 200 or "captcha" in r.text.lower():
-                    raise Exception("Blocked - Indeed")
-                html = r.text
-
-            soup = BeautifulSoup(html, "html.parser")
-            cards = soup.select("div.job_seen_beacon")
-            for c in cards:
-                title = c.select_one("h2.jobTitle span")
-                company = c.select_one("span[data-testid='company-name']")
-                if not title or not company:
-                    continue
-                jobs.append({
-                    "id": f"indeed_{random.randint(1000,9999)}",
-                    "title": title.text.strip(),
-                    "company": company.text.strip(),
-                    "location": location,
-                    "salary": "Not Disclosed",
-                    "description": "Job listing from Indeed India",
-                    "url": "https://in.indeed.com",
-                    "posted_date": datetime.now().strftime("%b %d, %Y"),
-                    "remote": "remote" in title.text.lower(),
-                    "source": "Indeed"
-                })
-
-            if not jobs and not use_selenium:
-                self.logger.warning("⚠️ Indeed returned 0 jobs, retrying with Selenium")
-                return self.scrape_indeed(keyword, location, use_selenium=True)
+                return self._scrape_page("indeed", keyword, location, 1, use_browser=True)
+            return list(self.iter_jobs(keyword, location, pages=1, sites=["indeed"]))
         except Exception as e:
             self.logger.warning(f"❌ Indeed scrape failed: {e}")
-        return jobs
+            return []
 
     def get_jobs(self, keyword="python", location="Bengaluru"):
         try:
             self.logger.info(f"🔎 Scraping jobs for {keyword} in {location}")
-            naukri = self.scrape_naukri(keyword, location)
-            indeed = self.scrape_indeed(keyword, location)
-            all_jobs = naukri + indeed
-            if not all_jobs:
+            jobs = list(self.iter_jobs(keyword, location))
+            if not jobs:
                 self.logger.warning("⚠️ Both scrapers returned no jobs, fallback to empty list")
-            # Deduplicate
-            seen = set()
-            unique = []
-            for j in all_jobs:
-                key = (j["title"], j["company"])
-                if key not in seen:
-                    seen.add(key)
-                    unique.append(j)
-            return unique
+            return jobs
         except Exception as e:
             self.logger.error(f"Scraper error: {e}")
             return []
@@ -0,0 +1,153 @@
+import re
+import logging
+
+from sqlalchemy import text
+
+from utils.locations import location_filter, resolve_location
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------
+# 🔎 Full-text index over the job catalog (SQLite FTS5)
+# -----------------------------------------------
+# External-content FTS5 table: it stores only the index, rows live in job_catalog.
+# Triggers keep it in sync, so every catalog upsert updates the index incrementally.
+_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS job_fts USING fts5(
+        title, company, location, description,
+        content='job_catalog', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    """CREATE TRIGGER IF NOT EXISTS job_catalog_fts_ai AFTER INSERT ON job_catalog BEGIN
+        INSERT INTO job_fts(rowid, title, company, location, description)
+        VALUES (new.rowid, new.title, new.company, new.location, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS job_catalog_fts_ad AFTER DELETE ON job_catalog BEGIN
+        INSERT INTO job_fts(job_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS job_catalog_fts_au AFTER UPDATE ON job_catalog BEGIN
+        INSERT INTO job_fts(job_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+        INSERT INTO job_fts(rowid, title, company, location, description)
+        VALUES (new.rowid, new.title, new.company, new.location, new.description);
+    END""",
+]
+
+# bm25 column weights: title, company, location, description
+_BM25 = "bm25(job_fts, 10.0, 4.0, 2.0, 1.0)"
+_RESULT_COLUMNS = ("id", "title", "company", "location", "location_id", "location_state", "job_type", "salary", "salary_min", "salary_max",
+                   "salary_currency", "salary_period", "description", "url", "posted_date", "remote", "source")
+
+
+def _terms(raw):
+    return re.findall(r"\w+", (raw or "").lower())
+
+
+def _match_expression(query, location=None):
+    """Turn free text into a safe FTS5 query: every word is a quoted prefix term (AND-ed)."""
+    parts = [f'"{t}"*' for t in _terms(query)]
+    parts += [f'location : "{t}"*' for t in _terms(location) if t != "india"]
+    return " AND ".join(parts)
+
+
+class SearchIndex:
+    """Keyword search over catalogued jobs, answered locally without any provider call."""
+
+    def is_supported(self):
+        from extensions import db
+        return db.engine.dialect.name == "sqlite"
+
+    def ensure_index(self, conn=None):
+        """Create the FTS table and sync triggers; rebuild once if the catalog already has rows."""
+        from extensions import db
+        if conn is None:
+            if not self.is_supported():
+                return False
+            try:
+                with db.engine.begin() as conn:
+                    return self.ensure_index(conn)
+            except Exception as e:
+                logger.warning(f"⚠️ Full-text index unavailable: {e}")
+                return False
+        if conn.dialect.name != "sqlite":
+            return False
+        try:
+            existed = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='job_fts'")).first()
+            for ddl in _FTS_DDL:
+                conn.execute(text(ddl))
+            if not existed:
+                conn.execute(text("INSERT INTO job_fts(job_fts) VALUES ('rebuild')"))
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Full-text index unavailable: {e}")
+            return False
+
+    def search(self, query=None, location=None, limit=25, offset=0, salary_min=None, sort=None):
+        """
+        Return (jobs, total) ranked by BM25, best first. Gazetteer places filter on the
+        indexed location ids; `salary_min` (annual INR) and sort="salary" use the salary index.
+        """
+        from extensions import db
+        conditions, params = [], {"limit": limit, "offset": offset}
+        location_key = location_filter(location) if location else None
+        if location_key:
+            conditions.append(f"c.{location_key[0]} = :location_id")
+            params["location_id"] = location_key[1]
+            location = None
+        elif location and resolve_location(location):
+            location = None  # all of India
+        if salary_min:
+            conditions.append("c.salary_currency = 'INR' AND c.salary_min >= :salary_min")
+            params["salary_min"] = int(salary_min)
+        by_salary = "c.salary_min DESC" if sort == "salary" else None
+
+        match = _match_expression(query, location)
+        columns = ", ".join(f"c.{name}" for name in _RESULT_COLUMNS)
+
+        if not match:
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            rows = db.session.execute(text(
+                f"SELECT {columns} FROM job_catalog c {where} ORDER BY {by_salary or 'c.fetched_at DESC'} "
+                f"LIMIT :limit OFFSET :offset"), params).all()
+            total = db.session.execute(text(f"SELECT COUNT(*) FROM job_catalog c {where}"), params).scalar()
+            return [self._to_dict(r) for r in rows], total
+
+        if not self.is_supported():
+            return self._search_like(query, location, limit, offset, salary_min, sort, location_key)
+
+        params["match"] = match
+        where = " AND ".join(["job_fts MATCH :match"] + conditions)
+        rows = db.session.execute(text(
+            f"SELECT {columns} FROM job_fts JOIN job_catalog c ON c.rowid = job_fts.rowid "
+            f"WHERE {where} ORDER BY {by_salary or _BM25} LIMIT :limit OFFSET :offset"), params).all()
+        total = db.session.execute(text(
+            f"SELECT COUNT(*) FROM job_fts JOIN job_catalog c ON c.rowid = job_fts.rowid WHERE {where}"),
+            params).scalar()
+        return [self._to_dict(r) for r in rows], total
+
+    def _search_like(self, query, location, limit, offset, salary_min=None, sort=None, location_key=None):
+        """Fallback for non-SQLite databases: substring match on the catalog."""
+        from models.simple_models import JobCatalog
+        q = JobCatalog.query
+        for term in _terms(query):
+            q = q.filter(JobCatalog.title.ilike(f"%{term}%") | JobCatalog.description.ilike(f"%{term}%"))
+        for term in _terms(location):
+            if term != "india":
+                q = q.filter(JobCatalog.location.ilike(f"%{term}%"))
+        if location_key:
+            q = q.filter(getattr(JobCatalog, location_key[0]) == location_key[1])
+        if salary_min:
+            q = q.filter(JobCatalog.salary_currency == "INR", JobCatalog.salary_min >= int(salary_min))
+        order = JobCatalog.salary_min.desc() if sort == "salary" else JobCatalog.fetched_at.desc()
+        total = q.count()
+        return [j.to_dict() for j in q.order_by(order).offset(offset).limit(limit)], total
+
+    @staticmethod
+    def _to_dict(row):
+        job = dict(zip(_RESULT_COLUMNS, row))
+        job["remote"] = bool(job["remote"])
+        return job
+
+
+search_index = SearchIndex()
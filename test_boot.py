@@ -0,0 +1,42 @@
+import os
+import sys
+import subprocess
+
+from flask import Flask
+
+from utils.warmup import precompile_templates, use_template_bytecode_cache
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_boot_does_not_import_provider_clients(tmp_path):
+    env = dict(os.environ, BOOT_WARMUP="off", DATABASE_URL=f"sqlite:///{tmp_path / 'boot.db'}")
+    out = subprocess.run(
+        [sys.executable, "-c", "import sys, app; print(sorted(m for m in ('requests', 'jobapi_client', "
+                               "'rapidapi_client', 'bs4', 'selenium') if m in sys.modules))"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_templates_precompile_into_bytecode_cache(tmp_path):
+    app = Flask(__name__, template_folder=os.path.join(ROOT, "templates"))
+    use_template_bytecode_cache(app, str(tmp_path))
+    compiled = precompile_templates(app)
+    assert compiled >= 10
+    assert len(os.listdir(tmp_path)) == compiled
+
+
+def test_default_bytecode_cache_is_private_to_the_user():
+    app = Flask(__name__, template_folder=os.path.join(ROOT, "templates"))
+    use_template_bytecode_cache(app)
+    directory = app.jinja_env.bytecode_cache.directory
+    assert os.stat(directory).st_uid == os.getuid()
+    assert os.stat(directory).st_mode & 0o077 == 0  # no group or world access
+
+
+def test_web_workers_do_not_warm_browsers_by_default(tmp_path):
+    env = {k: v for k, v in os.environ.items() if k != "BROWSER_WARM"}
+    out = subprocess.run(
+        [sys.executable, "-c", "from services import browser_pool; print(browser_pool.BROWSER_WARM, browser_pool.warm_browsers())"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "0 0"
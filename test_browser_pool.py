@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+
+import pytest
+
+from services.browser_pool import BrowserPool, PoolTimeout
+from services.scraper_service import ScraperService
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "scraper")
+
+
+class StubDriver:
+    """Stands in for a Selenium driver: cards 'render' 50 ms after get()."""
+    launched = 0
+
+    def __init__(self, html=""):
+        StubDriver.launched += 1
+        self.html = html
+        self.loaded_at = None
+        self.alive = True
+        self.quit_called = False
+
+    def get(self, url):
+        self.loaded_at = time.monotonic()
+
+    def find_elements(self, by, selector):
+        return [object()] if self.loaded_at and time.monotonic() - self.loaded_at > 0.05 else []
+
+    @property
+    def page_source(self):
+        return self.html
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("browser crashed")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_pool_reuses_recycles_and_times_out():
+    drivers = []
+    pool = BrowserPool(factory=lambda: drivers.append(StubDriver()) or drivers[-1],
+                       size=1, lease_timeout=0.2, max_pages=3)
+
+    for _ in range(3):
+        with pool.lease() as driver:
+            assert driver is drivers[0]  # warm driver reused, no relaunch
+    assert drivers[0].quit_called and pool.snapshot()["recycled"] == 1  # recycled after 3 pages
+
+    with pool.lease() as driver:
+        driver.alive = False  # crashes while idle -> health check replaces it on next lease
+    with pool.lease() as driver:
+        assert driver is drivers[2]
+    assert pool.snapshot()["unhealthy"] == 1
+
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with pool.lease():
+            held.set()
+            release.wait(2)
+
+    threading.Thread(target=hold).start()
+    held.wait(1)
+    with pytest.raises(PoolTimeout):
+        with pool.lease():
+            pass
+    release.set()
+    pool.close()
+
+
+def test_idle_drivers_are_reaped():
+    drivers = []
+    pool = BrowserPool(factory=lambda: drivers.append(StubDriver()) or drivers[-1],
+                       size=2, idle_timeout=0.2)
+    pool.warm()
+    with pool.lease():
+        pass  # the lease used most recently stays warm a little longer
+    time.sleep(0.6)
+    assert all(d.quit_called for d in drivers)
+    assert pool.snapshot()["reaped"] == 2 and pool.snapshot()["open"] == 0
+
+    with pool.lease() as driver:  # a quiet pool still serves: it starts a fresh driver
+        assert driver is drivers[2]
+    pool.close()
+
+
+def test_scraper_browser_fallback_uses_pool_and_explicit_wait():
+    with open(os.path.join(FIXTURES, "naukri_1.html"), encoding="utf-8") as f:
+        html = f.read()
+    pool = BrowserPool(factory=lambda: StubDriver(html), size=1)
+    scraper = ScraperService(browser_pool=pool)
+
+    start = time.monotonic()
+    jobs = scraper.scrape_naukri("python", "Bengaluru", use_selenium=True)
+    again = scraper.scrape_naukri("python", "Bengaluru", use_selenium=True)
+    elapsed = time.monotonic() - start
+
+    assert len(jobs) == 20 and [j["id"] for j in jobs] == [j["id"] for j in again]
+    assert pool.snapshot()["created"] == 1  # second scrape reused the warm driver
+    assert elapsed < 1.5  # returned once cards matched, not after a fixed sleep
+    pool.close()
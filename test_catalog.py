@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+from flask import Flask
+from extensions import db
+from models.simple_models import JobCatalog
+from services.catalog_service import CatalogService, stage_job, pending_count
+
+
+def _app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'catalog.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def test_staged_jobs_are_upserted_in_one_batch_and_served_locally(tmp_path):
+    app = _app(tmp_path)
+    catalog = CatalogService()
+    with app.app_context():
+        for i in range(3):
+            stage_job({"id": f"adz_{i}", "title": "Data Analyst", "company": "TCS", "source": "Adzuna"})
+        stage_job({"id": "mock_1", "title": "Mock", "source": "MOCK"})  # mocks are never catalogued
+        assert pending_count() == 3
+        assert catalog.flush_staged() == 3
+
+        # Same id again updates the row instead of duplicating it
+        catalog.upsert_jobs([{"id": "adz_0", "title": "Senior Data Analyst", "source": "Adzuna"}])
+        assert JobCatalog.query.count() == 3
+
+        job, is_stale = catalog.get_job("adz_0")
+        assert job["title"] == "Senior Data Analyst" and not is_stale
+        assert catalog.get_job("missing") == (None, False)
+
+        JobCatalog.query.filter_by(id="adz_1").update({"fetched_at": datetime.utcnow() - timedelta(days=2)})
+        db.session.commit()
+        assert catalog.get_job("adz_1")[1] is True
+
+
+def test_flush_never_commits_the_request_session(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'isolated.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(JobCatalog(id="half-done", title="Uncommitted request change"))
+        catalog = CatalogService()
+        catalog.upsert_jobs([{"id": "api-1", "title": "Go Developer", "source": "Adzuna"}])
+        db.session.rollback()  # the request failed after adding its row
+
+        assert db.session.get(JobCatalog, "half-done") is None
+        assert db.session.get(JobCatalog, "api-1").title == "Go Developer"
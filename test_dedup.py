@@ -0,0 +1,66 @@
+from jobapi_client import fetch_jobs_fanout
+from services import catalog_service
+from services.catalog_service import stage_job
+from utils.dedup import dedupe_jobs
+from utils.locations import with_location_fields
+from utils.salary import with_salary_fields
+
+DESCRIPTION = ("We are looking for a Python developer to build REST APIs with Flask and Django, work with "
+               "PostgreSQL and Redis, write unit tests, deploy on AWS using Docker and Kubernetes, and "
+               "mentor junior engineers in the team.")
+
+
+def _job(job_id, title, company, location, source, **extra):
+    job = {"id": job_id, "title": title, "company": company, "location": location,
+           "source": source, "description": DESCRIPTION, **extra}
+    return with_salary_fields(with_location_fields(job))
+
+
+def test_near_duplicates_collapse_into_one_job_with_sources():
+    jobs = dedupe_jobs([
+        _job("m1", "Senior Python Developer", "Infosys Ltd", "Bangalore, Karnataka", "Mantiks", salary="N/A"),
+        _job("a1", "Senior Python Developer", "Infosys Limited", "Bengaluru", "Adzuna", salary="₹12 LPA"),
+        _job("j1", "Sr. Python Developer", "INFOSYS", "Bengaluru, India", "Jooble", description=""),
+        _job("x1", "Senior Java Developer", "Infosys Ltd", "Bangalore", "Mantiks"),
+        _job("x2", "Senior Python Developer", "Infosys Ltd", "Pune", "Mantiks"),
+    ])
+    assert [j["id"] for j in jobs] == ["m1", "x1", "x2"]
+    assert [s["source"] for s in jobs[0]["other_sources"]] == ["Adzuna", "Jooble"]
+    assert jobs[0]["salary"] == "₹12 LPA" and jobs[0]["salary_min"] == 1200000  # filled from the duplicate
+
+
+def test_fanout_merge_drops_cross_provider_duplicates():
+    providers = {
+        "A": lambda: [_job("a1", "Data Analyst", "TCS", "Pune", "A")],
+        "B": lambda: [_job("b1", "Data Analyst", "TCS Pvt Ltd", "Pune, Maharashtra", "B"),
+                      _job("b2", "Data Analyst", "Wipro", "Pune", "B")],
+    }
+    jobs = fetch_jobs_fanout(limit=10, deadline=2, providers=providers)
+    assert sorted(j["company"] for j in jobs) in (["TCS", "Wipro"], ["TCS Pvt Ltd", "Wipro"])
+    kept = next(j for j in jobs if j["company"] != "Wipro")
+    assert len(kept["other_sources"]) == 1
+
+
+def test_fanout_restages_the_merged_job_and_keeps_other_staged_rows():
+    duplicate = _job("b9", "Data Engineer", "HCL Ltd", "Noida", "B", salary="₹9 LPA")
+    stage_job(duplicate)  # staged by another request, where it was not a duplicate
+    providers = {
+        "A": lambda: [_job("a9", "Data Engineer", "HCL", "Noida", "A", salary="N/A")],
+        "B": lambda: [duplicate],
+    }
+    jobs = fetch_jobs_fanout(limit=10, deadline=2, providers=providers)
+    assert len(jobs) == 1
+    kept_id = jobs[0]["id"]
+    with catalog_service._pending_lock:
+        staged = dict(catalog_service._pending)
+    assert "b9" in staged
+    assert staged[kept_id]["salary"] == "₹9 LPA"
+
+
+def test_merging_never_changes_the_callers_jobs():
+    kept = _job("m7", "Senior Python Developer", "Infosys Ltd", "Bangalore", "Mantiks", salary="N/A")
+    duplicate = _job("a7", "Senior Python Developer", "Infosys Limited", "Bengaluru", "Adzuna", salary="₹12 LPA")
+    cached = (dict(kept), dict(duplicate))
+    jobs = dedupe_jobs([kept, duplicate])
+    assert jobs[0]["salary"] == "₹12 LPA" and jobs[0]["other_sources"]
+    assert (kept, duplicate) == cached  # e.g. entries still sitting in the search cache
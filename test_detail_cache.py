@@ -0,0 +1,67 @@
+import random
+from utils.cache import DetailCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _job(i, description_len=400):
+    return {
+        "id": f"job_{i}",
+        "title": "Python Developer",
+        "company": "Infosys",
+        "location": "Bengaluru",
+        "description": "x" * description_len,
+        "source": "RapidAPI (JSearch)",
+    }
+
+
+def test_ttl_expiry_and_counters():
+    clock = FakeClock()
+    cache = DetailCache(max_bytes=100_000, ttl=10, clock=clock)
+    cache.set("a", _job(1))
+    assert cache.get("a")["id"] == "job_1"
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.get("missing") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 2, 1)
+
+
+def test_large_cold_entries_are_evicted_before_small_hot_ones():
+    cache = DetailCache(max_bytes=8_000)
+    cache.set("small", _job(1, 50))
+    cache.set("big", _job(2, 3000))
+    cache.get("small")
+    cache.set("big2", _job(3, 3000))
+    assert cache.get("small") is not None
+    assert cache.get("big") is None
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_memory_stays_flat_over_24h_synthetic_load():
+    clock = FakeClock()
+    budget = 256 * 1024
+    cache = DetailCache(max_bytes=budget, ttl=3600, clock=clock)
+    rng = random.Random(7)
+    samples = []
+
+    # One simulated day: a listing of 20 jobs every 10 seconds, with repeat detail views
+    for step in range(8_640):
+        clock.now = step * 10
+        for i in range(20):
+            cache.set(f"job_{rng.randint(0, 200_000)}", _job(step * 20 + i, rng.randint(100, 1200)))
+        cache.get(f"job_{rng.randint(0, 200_000)}")
+        if step % 360 == 0:
+            samples.append(cache.stats()["bytes"])
+
+    stats = cache.stats()
+    print(f"📊 Detail cache after 24h: {stats}")
+    assert stats["bytes"] <= budget
+    assert max(samples) <= budget
+    assert len(cache._heap) <= 4 * len(cache) + 64 + 1
@@ -0,0 +1,99 @@
+import time
+import jobapi_client
+from jobapi_client import fetch_jobs_fanout
+
+
+def _job(job_id, source):
+    return {"id": job_id, "title": "Python Developer", "source": source}
+
+
+def test_fanout_merges_and_skips_slow_provider():
+    def fast():
+        return [_job("a1", "Fast"), _job("a2", "Fast")]
+
+    def slow():
+        time.sleep(2)
+        return [_job("b1", "Slow")]
+
+    start = time.monotonic()
+    jobs = fetch_jobs_fanout(limit=2, deadline=5, providers={"Fast": fast, "SlowTest": slow})
+    elapsed = time.monotonic() - start
+
+    print(f"⚡ Fan-out returned {len(jobs)} jobs in {elapsed:.2f}s")
+    assert [j["id"] for j in jobs] == ["a1", "a2"]
+    assert elapsed < 1
+
+
+def test_fanout_deadline_returns_partial_results():
+    def fast():
+        return [_job("a1", "Fast")]
+
+    def slow():
+        time.sleep(2)
+        return [_job("b1", "Slow")]
+
+    start = time.monotonic()
+    jobs = fetch_jobs_fanout(limit=10, deadline=0.3, providers={"Fast": fast, "SlowDeadline": slow})
+    assert [j["id"] for j in jobs] == ["a1"]
+    assert time.monotonic() - start < 1
+
+
+def test_fanout_hedges_provider_slower_than_p95():
+    stats = jobapi_client._stats_for("Hedged")
+    for _ in range(20):
+        stats.record(0.01)
+
+    calls = []
+
+    def flaky():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            time.sleep(2)  # first attempt is stuck
+        return [_job(f"h{len(calls)}", "Hedged")]
+
+    start = time.monotonic()
+    jobs = fetch_jobs_fanout(limit=1, deadline=5, providers={"Hedged": flaky})
+    assert len(calls) == 2
+    assert jobs[0]["id"] == "h2"
+    assert time.monotonic() - start < 1
+
+
+def test_fanout_calls_are_bounded_by_the_deadline():
+    timeout, retries = jobapi_client._call_budget(time.monotonic() + 1.5)
+    assert 1.3 < timeout <= 1.5 and retries == 0
+    assert jobapi_client._call_budget() == (jobapi_client.DEFAULT_TIMEOUT, None)
+
+
+def test_hung_provider_does_not_starve_healthy_ones():
+    def hung():
+        time.sleep(1)
+        return []
+
+    def healthy():
+        return [_job("h1", "Healthy")]
+
+    for _ in range(8):  # more stuck calls than HungTest (or a shared 8-thread pool) has workers
+        fetch_jobs_fanout(limit=5, deadline=0.05, providers={"HungTest": hung})
+
+    start = time.monotonic()
+    jobs = fetch_jobs_fanout(limit=1, deadline=0.5, providers={"HungTest": hung, "HealthyTest": healthy})
+    assert [j["id"] for j in jobs] == ["h1"]
+    assert time.monotonic() - start < 0.3
+
+
+def test_background_refresh_does_not_reuse_the_fanout_deadline(monkeypatch):
+    import rapidapi_client
+    from utils.cache import search_key
+    deadlines = []
+    monkeypatch.setattr(rapidapi_client, "_fetch_from_jsearch",
+                        lambda title, location, limit, deadline_at=None: deadlines.append(deadline_at) or [{"id": "r1"}])
+    key = search_key("refresh test", "India", None, 1, "JSearch", 5)
+    rapidapi_client._cache.set(key, [{"id": "old"}], ttl=0)  # already stale
+
+    assert rapidapi_client.fetch_jobs_from_rapidapi("refresh test", None, 5, deadline_at=time.monotonic() - 1) \
+        == [{"id": "old"}]
+    for _ in range(50):
+        if deadlines:
+            break
+        time.sleep(0.01)
+    assert deadlines == [None]  # the refresh gets the normal timeout, not a deadline in the past
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from utils.html_extract import ENGINES, CardSpec, Field, StreamEngine, get_engine
+from services.scraper_service import parse_naukri, parse_indeed
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "scraper")
+ENGINE_NAMES = [name for name, engine in ENGINES.items() if engine.available()]
+
+
+def _read(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("name", ENGINE_NAMES)
+def test_engines_agree_on_fixture_pages(name):
+    engine, reference = ENGINES[name](), ENGINES["bs4"]()
+    for page, parse, count in [("naukri_1.html", parse_naukri, 20), ("indeed_2.html", parse_indeed, 15)]:
+        html = _read(page)
+        jobs = parse(html, "Bengaluru", engine)
+        expected = parse(html, "Bengaluru", reference)
+        assert len(jobs) == count
+        assert [(j["id"], j["title"], j["company"], j["url"]) for j in jobs] == \
+               [(j["id"], j["title"], j["company"], j["url"]) for j in expected]
+
+
+def test_stream_engine_stops_at_container_and_tolerates_unclosed_tags():
+    spec = CardSpec("li.job", {"title": Field("b"), "ref": Field(None, "data-ref")}, container="#results")
+    html = ("<header><li class='job'><b>Ad</b></li></header>"
+            "<ul id='results'><li class='job' data-ref='1'><b>Python Dev</b><p>unclosed</li>"
+            "<li class='job' data-ref='2'><br><b>Data &amp; ML</b></li></ul>"
+            "<footer><li class='job'><b>Footer</b></li></footer>")
+
+    assert StreamEngine().extract(html, spec) == [
+        {"title": "Python Dev", "ref": "1"},
+        {"title": "Data & ML", "ref": "2"},
+    ]
+
+
+def test_get_engine_falls_back_when_unavailable(monkeypatch):
+    monkeypatch.setenv("SCRAPER_ENGINE", "stream")
+    assert get_engine().name == "stream"
+    assert get_engine("nope").name in ENGINE_NAMES
@@ -0,0 +1,93 @@
+from flask import Flask
+from sqlalchemy import event
+
+from extensions import db
+from models.simple_models import User
+from services.identity_service import IdentityCache
+
+
+def _app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'identity.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_hits_skip_the_database_until_the_profile_changes(tmp_path):
+    app = _app(tmp_path)
+    cache = IdentityCache(ttl=60)
+    with app.app_context():
+        db.session.add(User(username="cached", email="cached@example.com", first_name="Asha", password_hash="x"))
+        db.session.commit()
+        user_id = db.session.execute(db.select(User.id)).scalar_one()
+        db.session.remove()
+        statements = _count_statements(db.engine)
+
+        user, version = cache.load(user_id)  # no stamp in the session yet
+        assert user.first_name == "Asha" and len(statements) == 1
+        db.session.remove()
+
+        user, same_version = cache.load(user_id, version)
+        assert same_version == version and len(statements) == 1
+        assert user in db.session and user.email == "cached@example.com"
+        assert user.saved_jobs == []  # lazy relationships still load through the request's session
+
+        user.first_name = "Asha R."
+        db.session.commit()
+        db.session.remove()
+        statements.clear()
+        user, new_version = cache.load(user_id, version)
+        assert new_version != version and user.first_name == "Asha R." and len(statements) == 1
+
+        assert cache.load(user_id, "another worker's stamp")[1] == new_version  # stale stamp: reloaded
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["stale"], stats["invalidations"]) == (1, 2, 1, 1)
+        assert stats["hit_rate"] == 0.25
+        assert cache.load(user_id + 1) == (None, None)
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    app = _app(tmp_path)
+    now = [0.0]
+    cache = IdentityCache(ttl=30, clock=lambda: now[0])
+    with app.app_context():
+        db.session.add(User(username="ttl", email="ttl@example.com", password_hash="x"))
+        db.session.commit()
+        user_id = db.session.execute(db.select(User.id)).scalar_one()
+        _, version = cache.load(user_id)
+        assert cache.load(user_id, version)[0] is not None
+        now[0] = 31
+        cache.load(user_id, version)
+        assert cache.stats()["expired"] == 1
+
+
+def test_changes_committed_on_another_worker_revoke_cached_identities(tmp_path):
+    from services import identity_service
+    from utils.cache_backends import MemoryBackend
+    app = _app(tmp_path)
+    shared = MemoryBackend()  # stands in for the host-wide store
+    committing = IdentityCache(ttl=60, backend=shared)
+    other_worker = IdentityCache(ttl=60, backend=shared)
+    identity_service._caches.discard(other_worker)  # another process: commit events never reach it
+    with app.app_context():
+        db.session.add(User(username="revoked", email="revoked@example.com", password_hash="old"))
+        db.session.commit()
+        user_id = db.session.execute(db.select(User.id)).scalar_one()
+        _, version = other_worker.load(user_id)
+        db.session.remove()
+        assert other_worker.load(user_id, version)[1] == version  # cached hit
+        db.session.remove()
+
+        db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+        db.session.remove()
+        assert other_worker.load(user_id, version) == (None, None)  # not served from its cache
+        assert other_worker.stats()["revoked"] == 1
@@ -0,0 +1,90 @@
+from flask import Flask
+
+from extensions import db
+from models.simple_models import SearchHistory
+from services.ingestion_service import (IngestionScheduler, ProviderQuota, INGEST_LIMIT, record_search,
+                                        flush_search_history)
+
+
+def _app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'ingestion.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_quota_refills_over_time():
+    clock = FakeClock()
+    quota = ProviderQuota(per_hour=2, clock=clock)
+    assert quota.try_acquire() and quota.try_acquire()
+    assert not quota.try_acquire()
+    clock.now = 1800  # half an hour refills one call
+    assert quota.try_acquire()
+
+
+def test_scheduler_refreshes_page_one_for_a_whole_pass(tmp_path):
+    app = _app(tmp_path)
+    from utils.cache import search_cache, search_key
+
+    calls = []
+
+    def fetcher(title, location, limit, page, provider_names, quota):
+        calls.append((title, location, page, tuple(provider_names)))
+        return [{"id": f"warm_{title}_{location}_{len(calls)}", "title": title, "location": location,
+                 "source": "Adzuna"}]
+
+    scheduler = IngestionScheduler(app, quotas={"Adzuna": 100, "Mantiks": 0}, fetcher=fetcher)
+    matrix = [("Python Developer", "Pune")] + [(f"Role {i}", "Pune") for i in range(99)]
+    scheduler.build_matrix = lambda: matrix
+    scheduler.run_once()
+    scheduler._cursor = 0  # next pass
+    scheduler.run_once()
+
+    assert {c[2] for c in calls} == {1}  # always the page users read
+    assert all(c[3] == ("Adzuna",) for c in calls)
+    key = search_key("python developer", "pune", None, 1, "fanout", INGEST_LIMIT)
+    value, state = search_cache.get(key)
+    assert state == "fresh" and value[0]["id"].startswith("warm_Python Developer_Pune")
+    # Fresh until the next pass comes round, not just the fan-out TTL
+    assert search_cache._entries[key][3] == scheduler.pass_period(len(matrix)) > search_cache.ttl_for(key)
+
+
+def test_quota_is_charged_per_provider_request(tmp_path, monkeypatch):
+    import jobapi_client
+    app = _app(tmp_path)
+    requests_made = []
+
+    def fake_search(name):
+        def search(**kwargs):
+            requests_made.append(name)
+            return []
+        return search
+
+    scheduler = IngestionScheduler(app, quotas={"Adzuna": 2, "Jooble": 0, "Mantiks": 0, "JSearch": 0})
+    scheduler.build_matrix = lambda: [("Quota Test Role", "Pune")]
+    monkeypatch.setattr(jobapi_client, "_adzuna_search", fake_search("Adzuna"))
+    for _ in range(3):
+        scheduler.run_once()
+    assert len(requests_made) <= 2  # paging and hedges are charged too
+    assert scheduler.quotas["Adzuna"].tokens < 1
+
+
+def test_search_history_is_upserted_in_one_batch(tmp_path):
+    app = _app(tmp_path)
+    with app.app_context():
+        for _ in range(2):
+            record_search("Python  Developer", "Pune")
+            record_search("Go developer", "")
+            assert flush_search_history() == 2
+        rows = {(r.keyword, r.location): r.hits for r in SearchHistory.query.all()}
+    assert rows == {("python developer", "Pune"): 2, ("go developer", ""): 2}
@@ -0,0 +1,55 @@
+import jobapi_client
+from utils import job_ids
+from utils.job_ids import canonical_url, make_job_id, provider_native_id
+
+
+def test_ids_are_stable_and_prefer_native_ids():
+    first = make_job_id("Naukri", None, "Python Developer", "Infosys", "Bengaluru",
+                        "https://www.naukri.com/job-listings-python-123?src=jobsearchDesk&utm_source=x")
+    again = make_job_id("Naukri", "", " python  developer", "INFOSYS", "bengaluru",
+                        "https://www.naukri.com/job-listings-python-123/")
+    assert first == again and first.startswith("naukri_")
+    assert make_job_id("Mantiks", "mk-42", "Python Developer") == "mantiks:mk-42"
+    assert canonical_url("#") == ""
+
+
+def test_native_ids_are_namespaced_by_provider():
+    adzuna = jobapi_client._norm({"id": 4412, "title": "Data Analyst", "company": "TCS"}, "Adzuna")
+    jooble = jobapi_client._norm({"id": 4412, "title": "Java Developer", "company": "Wipro"}, "Jooble")
+    assert (adzuna["id"], jooble["id"]) == ("adzuna:4412", "jooble:4412")
+    assert make_job_id("Adzuna", adzuna["id"]) == adzuna["id"]  # re-normalizing keeps the id
+
+    # Remote lookups get the provider's own id back, and skip other providers' ids
+    assert provider_native_id("mantiks:mk-42", "Mantiks") == "mk-42"
+    assert provider_native_id("adzuna:4412", "Mantiks") is None
+    assert provider_native_id("mk-42", "Mantiks") == "mk-42"  # saved before ids were namespaced
+
+
+def test_ids_no_api_knows_are_never_sent_upstream():
+    hashed = make_job_id("Naukri", None, "Python Developer", "Infosys", "Pune")
+    for job_id in (hashed, "mock_3", "naukri_12345", "indeed_9ab1c", ""):
+        assert provider_native_id(job_id, "Mantiks") is None
+        assert provider_native_id(job_id, "RapidAPI (JSearch)") is None
+
+
+def test_overlong_native_ids_still_fit_saved_jobs():
+    long_id = make_job_id("RapidAPI (JSearch)", "x" * 300)
+    assert len(long_id) <= job_ids.MAX_ID_LENGTH
+    assert long_id == make_job_id("RapidAPI (JSearch)", "x" * 300)  # still stable
+    assert provider_native_id(long_id, "RapidAPI (JSearch)") is None
+
+
+def test_norm_no_longer_uses_urls_or_empty_ids():
+    job = jobapi_client._norm({"title": "Data Analyst", "company": "TCS", "location": "Pune",
+                               "redirect_url": "https://adzuna.in/land/ad/1?se=abc"}, "Adzuna")
+    assert job["id"].startswith("adzuna_") and "/" not in job["id"]
+    assert jobapi_client._norm({"title": "Data Analyst", "company": "TCS", "location": "Pune",
+                                "redirect_url": "https://adzuna.in/land/ad/1?se=abc"}, "Adzuna")["id"] == job["id"]
+
+
+def test_collisions_are_counted(monkeypatch):
+    monkeypatch.setattr(job_ids, "HASH_CHARS", 1)  # 16 buckets: collisions are certain
+    before = job_ids.id_stats().get("collision", 0)
+    for i in range(40):
+        make_job_id("Test", None, f"Role {i}", "Acme", "Pune")
+    assert job_ids.id_stats()["collision"] > before
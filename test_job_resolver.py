@@ -0,0 +1,92 @@
+import time
+import uuid
+
+from flask import Flask
+
+from extensions import db
+from models.simple_models import User, SavedJob
+from services.job_resolver import JobResolver
+from utils.cache import detail_cache
+
+
+def _app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'resolver.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _no_network(job_id, deadline_at=None):
+    raise AssertionError("remote source called for a locally known job")
+
+
+def test_local_sources_answer_without_network(tmp_path):
+    app = _app(tmp_path)
+    resolver = JobResolver(remote_sources={"Mantiks": _no_network, "JSearch": _no_network},
+                           mock_jobs=lambda: [{"id": "mock_3", "title": "Mock Dev"}])
+    cached_id, saved_id = f"adz_{uuid.uuid4().hex}", f"jooble_{uuid.uuid4().hex}"
+    detail_cache.set(cached_id, {"id": cached_id, "title": "Listed a moment ago"})
+
+    with app.app_context():
+        user = User(username="resolver", email="resolver@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+        db.session.add(SavedJob(user_id=user.id, job_id=saved_id, job_title="Go Developer",
+                                job_company="Zerodha", job_location="Bengaluru", job_source="Jooble"))
+        db.session.commit()
+
+        assert resolver.resolve(cached_id)[1] == "cache"
+        job, origin = resolver.resolve(saved_id, user.id)
+        assert origin == "saved" and job["title"] == "Go Developer"
+        assert resolver.resolve("mock_3") == ({"id": "mock_3", "title": "Mock Dev"}, "mock")
+
+
+def test_remote_sources_race_under_one_deadline(tmp_path):
+    app = _app(tmp_path)
+    job_id = f"race_{uuid.uuid4().hex}"
+
+    def slow(jid, deadline_at=None):
+        time.sleep(1)
+        return {"id": jid, "title": "Slow copy"}
+
+    def fast(jid, deadline_at=None):
+        time.sleep(0.05)
+        return {"id": jid, "title": "Fast copy"}
+
+    resolver = JobResolver(remote_sources={"SlowSource": slow, "FastSource": fast}, deadline=2)
+    with app.app_context():
+        start = time.monotonic()
+        job, origin = resolver.resolve(job_id)
+        assert (job["title"], origin) == ("Fast copy", "FastSource")
+        assert time.monotonic() - start < 0.5
+        assert resolver.resolve(job_id)[1] == "cache"  # the winner was remembered
+
+        stuck = JobResolver(remote_sources={"SlowSource": slow}, deadline=0.2)
+        start = time.monotonic()
+        assert stuck.resolve(f"race_{uuid.uuid4().hex}") == (None, None)
+        assert time.monotonic() - start < 0.5
+
+
+def test_hung_source_does_not_starve_the_other(tmp_path):
+    app = _app(tmp_path)
+    deadlines = []
+
+    def hung(jid, deadline_at=None):
+        deadlines.append(deadline_at)
+        time.sleep(1.5)
+
+    def fast(jid, deadline_at=None):
+        return {"id": jid, "title": "Found"}
+
+    stuck = JobResolver(remote_sources={"HungSource": hung}, deadline=0.1)
+    resolver = JobResolver(remote_sources={"HungSource": hung, "QuickSource": fast}, deadline=1)
+    with app.app_context():
+        for _ in range(8):  # more stuck lookups than one pool has workers
+            stuck.resolve(f"hung_{uuid.uuid4().hex}")
+        start = time.monotonic()
+        job, origin = resolver.resolve(f"race_{uuid.uuid4().hex}")
+        assert (job["title"], origin) == ("Found", "QuickSource")
+        assert time.monotonic() - start < 0.5
+    assert deadlines and all(d is not None for d in deadlines)  # lookups know when to give up
@@ -0,0 +1,52 @@
+import routes.job_routes as job_routes
+from app import create_app
+
+
+def test_api_pages_by_cursor_projects_fields_and_honours_etags(monkeypatch):
+    calls = []
+
+    def fake_fetch_jobs(title, location, limit, **kwargs):
+        calls.append(title)
+        return [{"id": f"api-{i}", "title": f"Python Developer {i}", "company": "Zoho",
+                 "location": "Chennai", "description": "x" * 450, "source": "Adzuna"}
+                for i in range(5)]
+
+    monkeypatch.setattr(job_routes, "fetch_jobs", fake_fetch_jobs)
+    monkeypatch.setattr(job_routes, "remember_jobs", lambda jobs: None)
+    client = create_app().test_client()
+
+    first = client.get("/jobs/api/jobs?q=python cursor test&page_size=2")
+    data = first.get_json()
+    assert first.status_code == 200 and first.headers["ETag"]
+    assert data["count"] == 5
+    assert [j["id"] for j in data["jobs"]] == ["adzuna:api-0", "adzuna:api-1"]
+    assert "description" not in data["jobs"][0]  # list views skip descriptions by default
+
+    # Later pages are slices of the stored snapshot, not a new search
+    second = client.get(f"/jobs/api/jobs?cursor={data['next_cursor']}&page_size=2&fields=title,description")
+    page = second.get_json()
+    assert [j["id"] for j in page["jobs"]] == ["adzuna:api-2", "adzuna:api-3"]
+    assert set(page["jobs"][0]) == {"id", "title", "description"}
+    assert len(calls) == 1
+
+    # Polling the same page with its ETag costs a 304 and no body
+    again = client.get(f"/jobs/api/jobs?cursor={data['next_cursor']}&page_size=2&fields=title,description",
+                       headers={"If-None-Match": second.headers["ETag"]})
+    assert again.status_code == 304 and again.data == b""
+
+    assert client.get("/jobs/api/jobs?cursor=not-a-cursor").status_code == 400
+
+
+def test_api_cursor_is_signed_and_its_params_are_clamped():
+    app = create_app()
+    client = app.test_client()
+    with app.test_request_context():
+        forged = job_routes.encode_cursor("x", 0, {"q": "python", "location": "", "type": "",
+                                                   "salary_min": "", "limit": 100000})
+        missing = job_routes.encode_cursor("x", 0, {})
+        assert job_routes.decode_cursor(forged)[2]["limit"] == 200
+
+    body, signature = forged.split(".")
+    assert client.get(f"/jobs/api/jobs?cursor={body}.{signature[::-1]}").status_code == 400
+    assert client.get(f"/jobs/api/jobs?cursor={body}").status_code == 400
+    assert client.get(f"/jobs/api/jobs?cursor={missing}").status_code == 400
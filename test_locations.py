@@ -0,0 +1,33 @@
+from services.query_planner import QueryPlan
+from utils.locations import canonical_name, locate, resolve_location, with_location_fields
+
+
+def test_resolves_aliases_and_typos():
+    assert canonical_name("banglore") == "Bengaluru"
+    assert canonical_name("Gurgaon") == "Gurugram"
+    assert canonical_name("Hyderbad") == "Hyderabad"   # one typo
+    assert canonical_name("tamilnadu") == "Tamil Nadu"
+    assert canonical_name("") == "India"
+    assert canonical_name("atlantis") == "Atlantis"    # unknown places pass through
+    assert resolve_location("UP")["id"] == "state:uttar-pradesh"
+
+
+def test_locates_free_text_job_locations():
+    assert locate("Bangalore, Karnataka, India") == ("city:bengaluru", "state:karnataka")
+    assert locate("Whitefield, Bengaluru") == ("city:bengaluru", "state:karnataka")
+    assert locate("Noida, UP") == ("city:noida", "state:uttar-pradesh")
+    assert locate("Karnataka") == ("state:karnataka", "state:karnataka")
+    assert locate("Not specified") == (None, None)
+
+
+def test_location_filter_matches_ids_not_substrings():
+    jobs = [with_location_fields({"id": str(i), "location": loc}) for i, loc in enumerate(
+        ["Bangalore, Karnataka", "Bengaluru Urban", "Mysore, Karnataka", "Pune, Maharashtra"])]
+
+    city = QueryPlan("python", canonical_name("banglore"))
+    assert [j["id"] for j in jobs if city.matches(j)] == ["0", "1"]
+
+    state = QueryPlan("python", canonical_name("karnataka"))
+    assert [j["id"] for j in jobs if state.matches(j)] == ["0", "1", "2"]
+
+    assert QueryPlan("python", "India").active_filters() == set()
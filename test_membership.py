@@ -0,0 +1,84 @@
+from flask import Flask
+from sqlalchemy import event
+
+from extensions import db
+from models.simple_models import User, SavedJob, Application
+from services.membership_service import MembershipService, membership_service
+
+
+def _app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'membership.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _snapshot(model, user_id, job_id):
+    return model(user_id=user_id, job_id=job_id, job_title="Python Developer",
+                 job_company="Infosys", job_location="Pune", job_description="x" * 5000)
+
+
+def test_page_membership_is_one_query_cached_and_invalidated(tmp_path):
+    app = _app(tmp_path)
+    membership_service.clear()
+    with app.app_context():
+        user = User(username="member", email="member@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        db.session.add_all([_snapshot(SavedJob, user_id, "j1"), _snapshot(Application, user_id, "j2"),
+                            _snapshot(SavedJob, user_id, "j2")])
+        db.session.commit()
+
+        statements = []
+        event.listen(db.engine, "before_cursor_execute",
+                     lambda conn, cursor, sql, *args: statements.append(sql))
+
+        page = [{"id": f"j{i}"} for i in range(1, 26)]
+        membership_service.mark(page, user_id)
+        assert [(j["id"], j["is_saved"], j["is_applied"]) for j in page[:3]] == [
+            ("j1", True, False), ("j2", True, True), ("j3", False, False)]
+        assert len(statements) == 1
+        assert "job_description" not in statements[0] and "UNION ALL" in statements[0]
+
+        membership_service.mark([{"id": "j1"}, {"id": "j3"}], user_id)
+        assert len(statements) == 1  # served from the per-user cache
+
+        saved = SavedJob.query.filter_by(user_id=user_id, job_id="j1").first()
+        db.session.delete(saved)  # unsave
+        db.session.add(_snapshot(Application, user_id, "j3"))  # apply
+        db.session.commit()
+        statements.clear()
+
+        assert membership_service.lookup(user_id, ["j1", "j2", "j3"]) == ({"j2"}, {"j2", "j3"})
+        assert len(statements) == 1
+
+
+def test_anonymous_users_never_query():
+    service = MembershipService()
+    jobs = service.mark([{"id": "a"}, {"id": "b"}])
+    assert all(not j["is_saved"] and not j["is_applied"] for j in jobs)
+    assert service.stats["queries"] == 0
+
+
+def test_changes_committed_on_another_worker_reach_cached_answers(tmp_path):
+    app = _app(tmp_path)
+    membership_service.clear()
+    other_worker = MembershipService(ttl=60, backend=membership_service.backend)  # commit events never reach it
+    with app.app_context():
+        user = User(username="worker", email="worker@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+        assert other_worker.lookup(user_id, ["j1"]) == (set(), set())
+        assert other_worker.lookup(user_id, ["j1"]) == (set(), set())
+        assert other_worker.stats["queries"] == 1  # cached
+
+        db.session.add(_snapshot(SavedJob, user_id, "j1"))
+        db.session.commit()
+
+        assert other_worker.lookup(user_id, ["j1"]) == ({"j1"}, set())
+        assert other_worker.stats["revoked"] == 1
@@ -0,0 +1,79 @@
+from flask import Flask
+from sqlalchemy import inspect, text
+
+import migrations
+from extensions import db
+
+
+def _app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'migrations.db'}"
+    db.init_app(app)
+    return app
+
+
+def _index_names(engine, table):
+    return {ix["name"] for ix in inspect(engine).get_indexes(table)}
+
+
+def test_fresh_database_is_stamped_with_hot_path_indexes(tmp_path):
+    app = _app(tmp_path)
+    with app.app_context():
+        assert migrations.current_version(db.engine) == 0
+        assert migrations.check(db.engine) == migrations.LATEST
+
+        assert "ix_saved_job_user_saved_at" in _index_names(db.engine, "saved_job")
+        assert "ix_application_user_applied_at" in _index_names(db.engine, "application")
+        with db.engine.connect() as conn:
+            plan = " ".join(str(row[-1]) for row in conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT * FROM saved_job WHERE user_id = 1 ORDER BY saved_at DESC")))
+        assert "ix_saved_job_user_saved_at" in plan and "TEMP B-TREE" not in plan
+
+        # Booting again only reads the stamp
+        assert migrations.upgrade(db.engine) == []
+        assert migrations.check(db.engine) == migrations.LATEST
+
+
+def test_old_unstamped_database_is_upgraded(tmp_path):
+    app = _app(tmp_path)
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(text('CREATE TABLE "user" (id INTEGER PRIMARY KEY, username VARCHAR(80) NOT NULL, '
+                              'email VARCHAR(120) NOT NULL, first_name VARCHAR(100), last_name VARCHAR(100), '
+                              'password_hash VARCHAR(256) NOT NULL, created_at DATETIME)'))
+            conn.execute(text("CREATE TABLE job_catalog (id VARCHAR(255) PRIMARY KEY, title VARCHAR(200) NOT NULL, "
+                              "company VARCHAR(200), location VARCHAR(200), salary VARCHAR(100))"))
+            conn.execute(text("INSERT INTO job_catalog (id, title) VALUES ('old_1', 'Python Developer')"))
+
+        assert migrations.check(db.engine, auto_upgrade=False) == 0
+        assert migrations.upgrade(db.engine) == [m.version for m in migrations.MIGRATIONS]
+
+        columns = {c["name"] for c in inspect(db.engine).get_columns("job_catalog")}
+        assert {"salary_min", "location_id", "fetched_at"} <= columns
+        assert {"ix_user_email", "ix_user_username"} <= _index_names(db.engine, "user")
+        assert {"saved_job", "application", "search_history"} <= set(inspect(db.engine).get_table_names())
+        with db.engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM job_fts WHERE job_fts MATCH 'python'")).scalar() == 1
+
+
+def test_migrated_schema_covers_every_model(tmp_path):
+    """Frozen DDL: a model change needs a new migration, caught here."""
+    app = _app(tmp_path)
+    with app.app_context():
+        migrations.upgrade(db.engine)
+        import models.simple_models  # noqa: F401
+        inspector = inspect(db.engine)
+        for table in db.metadata.sorted_tables:
+            columns = {c["name"] for c in inspector.get_columns(table.name)}
+            assert {c.name for c in table.columns} <= columns, table.name
+            assert {ix.name for ix in table.indexes} <= _index_names(db.engine, table.name), table.name
+
+
+def test_failed_full_text_index_is_not_stamped(tmp_path, monkeypatch):
+    from services.search_index import search_index
+    app = _app(tmp_path)
+    with app.app_context():
+        monkeypatch.setattr(search_index, "ensure_index", lambda conn=None: False)
+        assert migrations.check(db.engine) == 4  # boot goes on; version 5 is retried next time
+        monkeypatch.undo()
+        assert migrations.check(db.engine) == migrations.LATEST
@@ -0,0 +1,74 @@
+import requests
+
+import jobapi_client
+from utils.cache import NegativeCache, NOT_FOUND, EMPTY, ERROR
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _response(status, payload=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.url = "https://api.example.test"
+    resp._content = requests.compat.json.dumps(payload or {}).encode()
+    return resp
+
+
+def test_outcomes_expire_after_their_own_ttl():
+    clock = FakeClock()
+    cache = NegativeCache(ttls={NOT_FOUND: 300, EMPTY: 60, ERROR: 15}, clock=clock)
+    cache.record("Mantiks", ("search", "Python ", "Pune"), [])
+    cache.record_error("Mantiks", ("detail", "mock1"), requests.exceptions.HTTPError(response=_response(404)))
+    cache.record_error("JSearch", ("search", "python in pune"), requests.exceptions.Timeout())
+
+    assert cache.hit("mantiks", ("search", "python", "pune")) == EMPTY  # keys are normalized
+    assert cache.hit("Mantiks", ("detail", "mock1")) == NOT_FOUND
+    assert cache.hit("JSearch", ("search", "python in pune")) == ERROR
+
+    clock.now = 20
+    assert cache.hit("JSearch", ("search", "python in pune")) is None
+    assert cache.hit("Mantiks", ("search", "python", "pune")) == EMPTY
+
+    cache.record("Mantiks", ("search", "python", "pune"), [{"id": "1"}])  # a real result clears the miss
+    assert cache.hit("Mantiks", ("search", "python", "pune")) is None
+
+
+def test_unknown_job_id_hits_mantiks_once(monkeypatch):
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return _response(404)
+
+    monkeypatch.setattr(jobapi_client, "negative_cache", NegativeCache())  # no shared store between runs
+    monkeypatch.setenv("MANTIKS_API_KEY", "key")
+    monkeypatch.setattr(jobapi_client.provider_transport, "get", fake_get)
+
+    assert jobapi_client.fetch_job_by_id("mantiks:expired-negative-1") is None
+    assert jobapi_client.fetch_job_by_id("mantiks:expired-negative-1") is None
+    assert len(calls) == 1
+    assert jobapi_client.provider_health.breaker("Mantiks").state == "closed"  # a 404 is not an outage
+
+
+def test_empty_search_is_not_repeated(monkeypatch):
+    calls = []
+
+    def fake_post(url, **kwargs):
+        calls.append(kwargs["json"])
+        return _response(200, {"jobs": []})
+
+    negative = NegativeCache()
+    monkeypatch.setattr(jobapi_client, "negative_cache", negative)
+    monkeypatch.setattr(jobapi_client, "JOOBLE_API_KEY", "key")
+    monkeypatch.setattr(jobapi_client.provider_transport, "post", fake_post)
+
+    for _ in range(3):
+        assert jobapi_client._jooble_search("cobol mainframe", "Leh") == []
+    assert len(calls) == 1
+    assert negative.stats()["hits"] == 2
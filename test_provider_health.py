@@ -0,0 +1,90 @@
+import time
+
+import pytest
+import requests
+
+import jobapi_client
+import provider_health
+from provider_health import CircuitBreaker, CircuitOpen, OPEN, HALF_OPEN, CLOSED
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fail():
+    raise requests.exceptions.ConnectionError("down")
+
+
+def test_breaker_opens_probes_and_closes():
+    clock = FakeClock()
+    b = CircuitBreaker("Test", window=10, min_calls=4, failure_rate=0.5, cooldown=10, clock=clock)
+
+    for _ in range(4):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            b.call(_fail)
+    assert b.state == OPEN and not b.available()
+
+    with pytest.raises(CircuitOpen):
+        b.call(lambda: "never runs")
+    assert b.stats["rejected"] == 1
+
+    clock.now = 10  # cool-down over: one probe, which fails -> open again for twice as long
+    with pytest.raises(requests.exceptions.ConnectionError):
+        b.call(_fail)
+    assert b.state == OPEN and b.cooldown == 20
+
+    clock.now = 30
+    assert b.call(lambda: "ok") == "ok"
+    assert b.state == CLOSED and b.snapshot()["health"] > 0.9
+
+
+def test_client_errors_and_slow_calls():
+    clock = FakeClock()
+    b = CircuitBreaker("Slow", window=4, min_calls=4, failure_rate=0.5, slow_call=1, clock=clock)
+
+    not_found = requests.Response()
+    not_found.status_code = 404
+    for _ in range(4):
+        with pytest.raises(requests.exceptions.HTTPError):
+            with b.guard():
+                raise requests.exceptions.HTTPError(response=not_found)
+    assert b.state == CLOSED  # a 404 is the caller's problem, not the provider's
+
+    def slow():
+        clock.now += 2
+    for _ in range(2):
+        b.call(slow)
+    assert b.state == OPEN
+
+
+def test_open_provider_is_skipped_by_fanout_and_probed_back(monkeypatch):
+    b = provider_health.breaker("Dead")
+    monkeypatch.setattr(b, "base_cooldown", 0.2)
+    calls = []
+
+    def dead():
+        calls.append(1)
+        with b.guard():
+            _fail()
+
+    for _ in range(b.min_calls):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            dead()
+    assert provider_health.provider_health()["Dead"]["state"] == OPEN
+
+    start = time.monotonic()
+    jobs = jobapi_client.fetch_jobs_fanout(limit=1, deadline=2, providers={
+        "Dead": dead, "Alive": lambda: [{"id": "x1", "title": "Python Developer", "source": "Alive"}]})
+    assert [j["id"] for j in jobs] == ["x1"] and len(calls) == b.min_calls
+    assert time.monotonic() - start < 0.5
+
+    b.probe = lambda: b.call(lambda: None)  # provider recovered
+    time.sleep(0.25)
+    provider_health.run_due_probes()
+    assert b.state == CLOSED and b.stats["probes"] == 1
+    assert provider_health.is_available("Dead") and b.state != HALF_OPEN
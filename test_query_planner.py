@@ -0,0 +1,54 @@
+import jobapi_client
+from services.query_planner import QueryPlan
+from utils.cache import NegativeCache
+
+
+def test_plan_splits_pushed_and_residual_filters():
+    plan = QueryPlan("python", "Pune", "Contract", "500000", limit=10)
+    assert plan.pushed("Adzuna") == {"location", "job_type", "salary_min"}
+    assert plan.residual("Adzuna") == set()
+    assert plan.residual("JSearch") == {"job_type", "salary_min"}
+    assert plan.signature() == "contract;salary>=500000"
+    assert QueryPlan("python", "India").active_filters() == set()  # "India" is no filter at all
+
+
+def test_residual_filters_keep_paging_until_limit():
+    plan = QueryPlan("python", "India", "Contract", limit=3)
+    requested = []
+
+    def fetch_page(page):
+        requested.append(page)
+        # Every other job on a page is a contract role
+        return [{"id": f"{page}-{i}", "job_type": "Contract" if i % 2 else "Full-time"} for i in range(3)]
+
+    jobs = plan.fetch("JSearch", fetch_page)
+    assert len(jobs) == 3 and all(j["job_type"] == "Contract" for j in jobs)
+    assert requested == [1, 2, 3]
+
+    # Nothing residual: one page is enough
+    requested.clear()
+    plan.fetch("Adzuna", fetch_page)
+    assert requested == [1]
+
+
+def test_adzuna_request_carries_pushed_filters(monkeypatch):
+    sent = {}
+
+    class FakeResponse:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"results": []}
+
+    def fake_get(url, params=None, **kwargs):
+        sent.update(params)
+        return FakeResponse()
+
+    monkeypatch.setattr(jobapi_client, "negative_cache", NegativeCache())  # earlier empty results must not skip the call
+    monkeypatch.setattr(jobapi_client, "ADZUNA_APP_ID", "id")
+    monkeypatch.setattr(jobapi_client, "ADZUNA_APP_KEY", "key")
+    monkeypatch.setattr(jobapi_client.provider_transport, "get", fake_get)
+    jobapi_client._adzuna_search("python", "Pune", limit=10, job_type="Full-time", salary_min=600000)
+    assert sent["what"] == "python" and sent["where"] == "Pune"
+    assert sent["salary_min"] == 600000 and sent["full_time"] == 1
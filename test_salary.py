@@ -0,0 +1,55 @@
+from flask import Flask
+from sqlalchemy import text
+from extensions import db
+import models.simple_models  # noqa: F401  (registers the catalog table)
+from services.catalog_service import CatalogService
+from services.search_index import SearchIndex
+from utils.salary import parse_salary, parse_salary_filter
+
+
+def test_parses_indian_salary_formats():
+    cases = {
+        "₹8,00,000-₹12,00,000": (800000, 1200000, "year"),
+        "₹12 LPA": (1200000, 1200000, "year"),
+        "8-12 LPA": (800000, 1200000, "year"),
+        "₹10L - ₹15L": (1000000, 1500000, "year"),
+        "₹1.2 crore": (12000000, 12000000, "year"),
+        "₹50000+": (50000, None, "year"),
+        "₹60,000 per month": (720000, 720000, "month"),
+        "₹600,000 - ₹900,000 per year": (600000, 900000, "year"),  # IndianJobService._format_salary
+    }
+    for raw, (low, high, period) in cases.items():
+        parsed = parse_salary(raw)
+        assert (parsed["salary_min"], parsed["salary_max"], parsed["salary_period"]) == (low, high, period), raw
+        assert parsed["salary_currency"] == "INR"
+
+    assert parse_salary("₹ Not Specified")["salary_min"] is None
+    assert parse_salary("$100k - $120k")["salary_currency"] == "USD"
+    assert parse_salary_filter("8") == 800000  # the search form sends lakhs
+
+
+def test_salary_filter_and_sort_use_catalog_columns(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'salary.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        CatalogService().upsert_jobs([
+            {"id": "1", "title": "Python Developer", "salary": "₹6 LPA"},
+            {"id": "2", "title": "Python Lead", "salary": "₹18,00,000 - ₹24,00,000 per year"},
+            {"id": "3", "title": "Data Engineer", "salary": "₹12 LPA"},
+            {"id": "4", "title": "Intern", "salary": "₹ Not Specified"},
+        ])
+        index = SearchIndex()
+        assert index.ensure_index()
+
+        jobs, total = index.search(salary_min=parse_salary_filter("10"), sort="salary")
+        assert [j["id"] for j in jobs] == ["2", "3"] and total == 2
+
+        jobs, _ = index.search("python", salary_min=parse_salary_filter("10"))
+        assert [j["id"] for j in jobs] == ["2"]
+
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM job_catalog WHERE salary_currency = 'INR' AND salary_min >= 1"
+        )).all()
+        assert "ix_job_catalog_salary_min" in str(plan)
@@ -0,0 +1,90 @@
+import os
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import provider_transport
+from services import scraper_service
+from services.scraper_service import ScraperService
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "scraper")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    paths = []
+
+    def do_GET(self):
+        with _Handler.lock:
+            _Handler.in_flight += 1
+            _Handler.peak = max(_Handler.peak, _Handler.in_flight)
+            _Handler.paths.append(self.path)
+        time.sleep(0.1)  # slow enough for requests to overlap
+
+        pages = {
+            "/python-jobs-in-Bengaluru": "naukri_1.html",
+            "/python-jobs-in-Bengaluru-2": "naukri_2.html",
+            "/jobs?q=python&l=Bengaluru": "indeed_1.html",
+            "/jobs?q=python&l=Bengaluru&start=10": "indeed_2.html",
+        }
+        name = pages.get(self.path)
+        if name:
+            with open(os.path.join(FIXTURES, name), "rb") as f:
+                self._reply(200, f.read())
+        elif self.path.startswith("/jobs"):
+            self._reply(200, b"<html><body>Please solve this captcha</body></html>")
+        else:
+            self._reply(200, b"<html><body><main>No more jobs</main></body></html>")
+        with _Handler.lock:
+            _Handler.in_flight -= 1
+
+    def _reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_pipeline_streams_pages_concurrently_from_fixtures(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(scraper_service, "SCRAPER_DOMAIN_CONCURRENCY", 3)
+    monkeypatch.setattr(scraper_service, "_domain_slots", {})
+    monkeypatch.setattr(provider_transport, "_stats", {})  # keep other tests' host counters clean
+
+    scraper = ScraperService(site_urls={"naukri": base, "indeed": base}, browser_fallback=False)
+    stream = scraper.iter_jobs("python", "Bengaluru", pages=3)
+    first = next(stream)  # jobs arrive before every page is done
+    jobs = [first] + list(stream)
+    server.shutdown()
+
+    print(f"🕸️ {len(jobs)} jobs from {len(_Handler.paths)} pages, peak {_Handler.peak} in flight")
+    assert {j["source"] for j in jobs} == {"Naukri", "Indeed"}
+    assert len({j["id"] for j in jobs}) == len(jobs) > 30
+    assert 1 < _Handler.peak <= 3  # parallel, but bounded per host
+    assert "/python-jobs-in-Bengaluru-2" in _Handler.paths
+
+
+def test_pipeline_gives_up_on_hung_pages_at_the_deadline():
+    release = threading.Event()
+
+    class _Hung(ScraperService):
+        def _scrape_page(self, site, keyword, location, page, use_browser=False):
+            release.wait(5)  # a driver.get that never returns
+            return []
+
+    scraper = _Hung(browser_fallback=False)
+    start = time.monotonic()
+    try:
+        assert list(scraper.iter_jobs("python", "Bengaluru", pages=1, deadline=0.2)) == []
+        assert time.monotonic() - start < 1
+    finally:
+        release.set()
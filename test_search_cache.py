@@ -0,0 +1,69 @@
+import time
+from utils.cache import SearchCache, search_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_search_key_is_canonical():
+    assert search_key("  Python Developer", "BENGALURU ", None, 1, "JSearch") == \
+        search_key("python   developer", "bengaluru", "", "1", "jsearch")
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = SearchCache(max_entries=2, max_bytes=10_000)
+    a, b, c = (search_key(t, "pune", None, 1, "x") for t in "abc")
+    cache.set(a, [1])
+    cache.set(b, [2])
+    cache.get(a)          # a is now most recently used
+    cache.set(c, [3])     # evicts b
+    assert cache.get(b) == (None, None)
+    assert cache.get(a)[0] == [1]
+    assert cache.stats()["evictions"] == 1
+
+    small = SearchCache(max_entries=100, max_bytes=40)
+    small.set(a, "x" * 20)
+    small.set(b, "y" * 20)  # 44 bytes total, evicts a
+    assert small.get(a) == (None, None)
+    assert small.stats()["bytes"] <= 40
+
+
+def test_per_provider_ttl_and_stale_while_revalidate():
+    clock = FakeClock()
+    cache = SearchCache(ttls={"jsearch": 10}, default_ttl=100, stale_ttl=50, clock=clock)
+    js = search_key("python", "pune", None, 1, "JSearch")
+    other = search_key("python", "pune", None, 1, "Mantiks")
+    cache.set(js, ["old"])
+    cache.set(other, ["old"])
+
+    clock.now = 20
+    assert cache.get(other) == (["old"], "fresh")
+    assert cache.get(js) == (["old"], "stale")
+
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return ["new"]
+
+    # Stale hits are served immediately and trigger exactly one refresh
+    assert cache.get_or_load(js, loader) == ["old"]
+    assert cache.get_or_load(js, loader) == ["old"]
+    time.sleep(0.3)
+    assert calls == [1]
+    assert cache.get(js) == (["new"], "fresh")
+
+    # Past ttl + stale_ttl the entry is dropped and loaded inline
+    clock.now = 200
+    assert cache.get_or_load(other, lambda: ["fresh"]) == ["fresh"]
+
+
+def test_search_key_separates_page_sizes():
+    assert search_key("python", "pune", None, 1, "fanout", 5) != search_key("python", "pune", None, 1, "fanout", 50)
+    assert search_key("python", "pune", None, 1, "JSearch", 50)[-1] == "jsearch"  # per-provider TTL lookup
@@ -0,0 +1,47 @@
+from flask import Flask
+from extensions import db
+import models.simple_models  # noqa: F401  (registers the catalog table)
+from services.catalog_service import CatalogService
+from services.search_index import SearchIndex
+
+
+def _app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'fts.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def test_index_ranks_title_matches_and_updates_incrementally(tmp_path):
+    app = _app(tmp_path)
+    catalog, index = CatalogService(), SearchIndex()
+    with app.app_context():
+        # Rows that exist before the index is created are picked up by the initial rebuild
+        catalog.upsert_jobs([
+            {"id": "1", "title": "Data Analyst", "company": "TCS", "location": "Pune",
+             "description": "Build dashboards. Some python scripting."},
+        ])
+        assert index.ensure_index()
+        catalog.upsert_jobs([
+            {"id": "2", "title": "Python Developer", "company": "Infosys", "location": "Bengaluru",
+             "description": "Flask APIs."},
+            {"id": "3", "title": "Java Developer", "company": "Wipro", "location": "Pune",
+             "description": "Spring Boot."},
+        ])
+
+        jobs, total = index.search("python")
+        assert total == 2
+        assert [j["id"] for j in jobs] == ["2", "1"]  # title hit outranks description hit
+
+        jobs, total = index.search("dev", location="Pune")  # prefix match + location column filter
+        assert [j["id"] for j in jobs] == ["3"]
+
+        # Upserting a job re-indexes it via the triggers
+        catalog.upsert_jobs([{"id": "3", "title": "Python Engineer", "company": "Wipro", "location": "Pune"}])
+        assert {j["id"] for j in index.search("python")[0]} == {"1", "2", "3"}
+        assert index.search("spring")[1] == 0
+
+        # Punctuation cannot break the FTS query syntax
+        assert index.search('c++ "dev" OR (')[1] >= 0
@@ -0,0 +1,38 @@
+import multiprocessing
+from utils.cache import DetailCache, SearchCache, search_key
+from utils.cache_backends import SQLiteBackend
+
+
+def _worker_fill(path):
+    """Runs in a separate process, like a second gunicorn worker."""
+    cache = SearchCache(backend=SQLiteBackend(path))
+    cache.set(search_key("python", "pune", None, 1, "JSearch"), [{"id": "js_1", "title": "Python Developer"}])
+    DetailCache(backend=SQLiteBackend(path)).set("js_1", {"id": "js_1", "title": "Python Developer"})
+
+
+def test_entries_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    proc = multiprocessing.get_context("spawn").Process(target=_worker_fill, args=(path,))
+    proc.start()
+    proc.join(30)
+    assert proc.exitcode == 0
+
+    # This "worker" never saw the search, yet both caches hit through the shared file
+    search = SearchCache(backend=SQLiteBackend(path))
+    value, state = search.get(search_key("Python", "Pune", None, 1, "jsearch"))
+    assert state == "fresh" and value[0]["id"] == "js_1"
+
+    detail = DetailCache(backend=SQLiteBackend(path))
+    assert detail.get("js_1")["title"] == "Python Developer"
+    assert detail.get("unknown") is None
+
+
+def test_local_l1_serves_after_first_shared_read(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.db"))
+    DetailCache(backend=backend).set_many([("a", {"id": "a"}), ("b", {"id": "b"})])
+
+    detail = DetailCache(backend=backend)
+    assert detail.get("a") == {"id": "a"}
+    backend.clear()
+    assert detail.get("a") == {"id": "a"}   # now served from the in-process L1
+    assert detail.get("b") is None
@@ -0,0 +1,121 @@
+import time
+import threading
+
+import pytest
+
+from utils.cache import SearchCache, search_key
+from utils.cache_backends import MemoryBackend
+from utils.single_flight import SingleFlight
+
+
+def _run_together(count, target):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = target(i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_misses_share_one_provider_call():
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.2)
+        return [{"id": "j1", "title": "Python Developer"}]
+
+    cache = SearchCache(flight=SingleFlight())
+    key = search_key("python", "Bengaluru", None, 1, "Mantiks")
+    results = _run_together(10, lambda i: cache.get_or_load(key, load))
+
+    assert len(calls) == 1
+    assert all(r == [{"id": "j1", "title": "Python Developer"}] for r in results)
+    assert cache.flight.stats()["coalesced"] == 9
+
+
+def test_leader_error_reaches_every_waiter():
+    flight = SingleFlight()
+
+    def boom():
+        time.sleep(0.1)
+        raise TimeoutError("provider timed out")
+
+    def call(i):
+        with pytest.raises(TimeoutError):
+            flight.do(("detail", "x"), boom)
+        return True
+
+    assert all(_run_together(5, call))
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_workers_coalesce_through_lock_file_and_shared_store(tmp_path):
+    backend = MemoryBackend()  # stands in for the host-wide SQLite store
+    workers = [SingleFlight(backend=backend, lock_dir=str(tmp_path)) for _ in range(2)]
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.3)
+        return {"id": "m1"}
+
+    def call(i):
+        time.sleep(0.1 * i)  # worker 0 leads, worker 1 arrives while it is still fetching
+        return workers[i].do(("mantiks-detail", "m1"), fetch)
+
+    assert _run_together(2, call) == [{"id": "m1"}, {"id": "m1"}]
+    assert len(calls) == 1
+    assert workers[1].stats()["cross_worker_hits"] == 1
+
+
+def test_followers_wait_no_longer_than_their_deadline():
+    flight = SingleFlight(wait_timeout=30)
+    started = threading.Event()
+
+    def stuck():
+        started.set()
+        time.sleep(1)
+        return "leader"
+
+    leader = threading.Thread(target=flight.do, args=(("k",), stuck))
+    leader.start()
+    started.wait(1)
+    start = time.monotonic()
+    assert flight.do(("k",), lambda: "own", deadline_at=time.monotonic() + 0.1) == "own"
+    assert time.monotonic() - start < 0.5
+    leader.join()
+
+
+def test_lock_held_by_a_stuck_worker_fails_open(tmp_path):
+    import fcntl
+    flight = SingleFlight(lock_dir=str(tmp_path), wait_timeout=0.2)
+    key = ("mantiks-detail", "stuck")
+    from utils import single_flight
+    stripe = int(single_flight.hashlib.sha1(repr(key).encode()).hexdigest(), 16) % single_flight.LOCK_STRIPES
+    other_worker = open(tmp_path / f"{stripe:03d}.lock", "a+")
+    fcntl.flock(other_worker, fcntl.LOCK_EX)  # flock is per open file: acts as another process
+    try:
+        start = time.monotonic()
+        assert flight.do(key, lambda: "loaded") == "loaded"
+        assert time.monotonic() - start < 1
+        assert flight.stats()["lock_timeouts"] == 1
+    finally:
+        other_worker.close()
+
+
+def test_nested_flights_on_one_stripe_do_not_deadlock(tmp_path, monkeypatch):
+    from utils import single_flight
+    monkeypatch.setattr(single_flight, "LOCK_STRIPES", 1)  # every key shares the stripe
+    flight = SingleFlight(lock_dir=str(tmp_path), wait_timeout=5)
+    start = time.monotonic()
+    assert flight.do(("fanout",), lambda: flight.do(("jsearch",), lambda: "inner")) == "inner"
+    assert time.monotonic() - start < 1
+    assert flight.stats()["lock_timeouts"] == 0
@@ -0,0 +1,93 @@
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import provider_transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    client_ports = []
+    flaky_calls = 0
+
+    def _reply(self, status, body=b"{}"):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        _Handler.client_ports.append(self.client_address[1])
+        if self.path.startswith("/limited"):
+            self.send_response(429)
+            self.send_header("Retry-After", self.path.rsplit("/", 1)[-1])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/slow"):
+            time.sleep(0.3)
+        if self.path.startswith("/flaky"):
+            _Handler.flaky_calls += 1
+            return self._reply(503 if _Handler.flaky_calls < 2 else 200)
+        self._reply(200, b'{"jobs": []}')
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._reply(503)
+
+    def log_message(self, *args):
+        pass
+
+
+def _server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_transport_reuses_connections_and_retries_idempotent_calls():
+    provider_transport.close()
+    provider_transport.BACKOFF_FACTOR = 0
+    server, base = _server()
+    try:
+        for _ in range(3):
+            assert provider_transport.get(f"{base}/search", timeout=5).status_code == 200
+        # Keep-alive: every call went over the same TCP connection
+        assert len(set(_Handler.client_ports)) == 1
+
+        # GET is retried on 503, POST is not unless marked idempotent
+        assert provider_transport.get(f"{base}/flaky", timeout=5).status_code == 200
+        assert provider_transport.post(f"{base}/search", json={}, timeout=5).status_code == 503
+
+        stats = provider_transport.transport_stats()["127.0.0.1"]
+        print(f"📊 Transport stats: {stats}")
+        assert stats["retries"] == 1
+        assert stats["requests"] == 6
+        assert stats["in_flight"] == 0
+    finally:
+        server.shutdown()
+        provider_transport.close()
+
+
+def test_transport_does_not_retry_read_timeouts_or_long_429s():
+    provider_transport.close()
+    provider_transport.BACKOFF_FACTOR = 0
+    server, base = _server()
+    before = provider_transport.transport_stats().get("127.0.0.1", {"requests": 0, "retries": 0})
+    try:
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            provider_transport.get(f"{base}/slow", timeout=0.1)
+        assert provider_transport.get(f"{base}/limited/60", timeout=5).status_code == 429  # quota: give up
+        assert provider_transport.get(f"{base}/limited/0", timeout=5).status_code == 429   # honoured, retried
+
+        stats = provider_transport.transport_stats()["127.0.0.1"]
+        assert stats["requests"] - before["requests"] == 1 + 1 + 3
+        assert stats["retries"] - before["retries"] == 2
+    finally:
+        server.shutdown()
+        provider_transport.close()
@@ -0,0 +1,508 @@
+import os
+import sys
+import json
+import time
+import heapq
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.cache_backends import create_backend
+from utils.single_flight import SingleFlight, flight_lock_dir
+
+logger = logging.getLogger(__name__)
+
+# Background refreshes for stale entries run here, never in the request thread
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+
+
+def _parse_ttls(raw):
+    """Parse "Mantiks=300,JSearch=120" into {"mantiks": 300, "jsearch": 120}."""
+    ttls = {}
+    for item in raw.split(","):
+        name, _, seconds = item.strip().partition("=")
+        if name and seconds:
+            try:
+                ttls[name.strip().lower()] = float(seconds)
+            except ValueError:
+                pass
+    return ttls
+
+
+def _normalize_part(value):
+    if value is None:
+        return ""
+    return " ".join(str(value).lower().split())
+
+
+def search_key(title=None, location=None, job_type=None, page=1, provider="", limit=None):
+    """
+    Canonical cache key for a search: case and whitespace differences map to the same entry.
+    `limit` is part of the key, so a short page cached for one caller never truncates a larger one.
+    """
+    return (
+        _normalize_part(title),
+        _normalize_part(location),
+        _normalize_part(job_type),
+        int(page or 1),
+        int(limit or 0),
+        _normalize_part(provider),  # last: per-provider TTLs read key[-1]
+    )
+
+
+def estimate_size(value):
+    """Approximate in-memory cost of a cached value (JSON-encoded length in bytes)."""
+    try:
+        return len(json.dumps(value, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+def estimate_memory(value):
+    """Approximate resident size of a job record: containers plus their keys and values."""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_memory(k) + estimate_memory(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_memory(v) for v in value)
+    return sys.getsizeof(value)
+
+
+# -----------------------------------------------
+# 🔍 Search result cache (TTL + LRU + stale-while-revalidate)
+# -----------------------------------------------
+class SearchCache:
+    """
+    Bounded search-result cache keyed by search_key() tuples.
+    Entries expire after a per-provider TTL (or the TTL given to `set`); expired entries are
+    still served for up to `stale_ttl` seconds while a single background refresh replaces them.
+    With a `backend` (see utils.cache_backends) the in-process LRU acts as an L1 in front of
+    a store shared by every worker on the host.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=8 * 1024 * 1024, ttls=None,
+                 default_ttl=60, stale_ttl=600, clock=time.monotonic, backend=None, namespace="search",
+                 flight=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = {k.lower(): v for k, v in (ttls or {}).items()}
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.backend = backend
+        self.namespace = namespace
+        self.flight = flight
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (value, size, stored_at, ttl)
+        self._bytes = 0
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = self.stale_hits = self.misses = self.evictions = 0
+
+    def ttl_for(self, key):
+        return self.ttls.get(key[-1], self.default_ttl)
+
+    def get(self, key):
+        """Return (value, "fresh" | "stale") or (None, None) on a miss."""
+        value, state = self._get_local(key)
+        if state != "fresh" and self.backend is not None:
+            shared_value, shared_state = self._get_shared(key)
+            if shared_state is not None:
+                value, state = shared_value, shared_state
+        with self._lock:
+            if state == "fresh":
+                self.hits += 1
+            elif state == "stale":
+                self.stale_hits += 1
+            else:
+                self.misses += 1
+        return value, state
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, None
+            value, size, stored_at, ttl = entry
+            age = self._clock() - stored_at
+            if age > ttl + self.stale_ttl:
+                self._remove(key)
+                return None, None
+            self._entries.move_to_end(key)
+            return value, ("stale" if age > ttl else "fresh")
+
+    def _get_shared(self, key):
+        """Look the key up in the shared backend and copy a hit into the local LRU."""
+        item = self.backend.get_entry(self.namespace, key)
+        if item is None:
+            return None, None
+        value, stored_at, expires_at = item
+        age = max(0.0, time.time() - stored_at)
+        ttl = max(0.0, expires_at - stored_at - self.stale_ttl)  # the TTL the writer chose
+        if age > ttl + self.stale_ttl:
+            return None, None
+        self._set_local(key, value, self._clock() - age, ttl)
+        return value, ("stale" if age > ttl else "fresh")
+
+    def set(self, key, value, ttl=None):
+        """Store `value`; `ttl` overrides the per-provider TTL (e.g. pre-warmed entries)."""
+        ttl = self.ttl_for(key) if ttl is None else ttl
+        if self._set_local(key, value, self._clock(), ttl) and self.backend is not None:
+            self.backend.set(self.namespace, key, value, ttl=ttl + self.stale_ttl)
+
+    def _set_local(self, key, value, stored_at, ttl):
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, stored_at, ttl)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def get_or_load(self, key, loader, deadline_at=None, refresh_loader=None):
+        """
+        Serve from cache when possible. Misses call `loader()` inline; stale hits return the
+        old value immediately and refresh in the background (one refresh per key) with
+        `refresh_loader` when given: a loader bound to the caller's deadline must not be
+        reused after that deadline has passed.
+        With a `flight` (utils.single_flight) concurrent misses for one key share a single load;
+        waiting for it is bounded by `deadline_at`.
+        Empty results are not cached so a provider outage is retried next time.
+        """
+        value, state = self.get(key)
+        if state == "fresh":
+            return value
+        if state == "stale":
+            self._schedule_refresh(key, refresh_loader or loader)
+            return value
+
+        if self.flight is None:
+            return self._load(key, loader)
+        return self.flight.do((self.namespace,) + tuple(key), lambda: self._load(key, loader), deadline_at)
+
+    def _load(self, key, loader):
+        value = loader()
+        if value:
+            self.set(key, value)
+        return value
+
+    def _schedule_refresh(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = loader()
+                if value:
+                    self.set(key, value)
+            except Exception as e:
+                logger.warning(f"⚠️ Background refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        _refresh_pool.submit(refresh)
+
+    def values(self):
+        """Snapshot of locally cached values, most recently used last."""
+        with self._lock:
+            return [entry[0] for entry in self._entries.values()]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.backend is not None:
+            self.backend.clear(self.namespace)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key):
+        size = self._entries.pop(key)[1]
+        self._bytes -= size
+
+
+# -----------------------------------------------
+# 🧾 Job detail cache (hard byte budget, size-aware eviction)
+# -----------------------------------------------
+class DetailCache:
+    """
+    Per-job cache with a hard memory budget and TTL expiry, optionally backed by a shared
+    store so a detail link works on whichever worker serves it.
+    Eviction uses GreedyDual-Size: every entry has priority L + 1/size, refreshed on each hit,
+    and the lowest priority goes first. Large, rarely used records leave before small hot ones,
+    and `L` rises with each eviction so old entries age out.
+    """
+
+    def __init__(self, max_bytes=4 * 1024 * 1024, ttl=3600, clock=time.monotonic, backend=None, namespace="detail"):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.backend = backend
+        self.namespace = namespace
+        self._clock = clock
+        self._entries = {}   # key -> [value, size, expires_at, priority]
+        self._heap = []      # (priority, seq, key); stale items are skipped lazily
+        self._seq = 0
+        self._inflation = 0.0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= self._clock():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self.hits += 1
+                self._touch(key, entry)
+                return entry[0]
+
+        item = self.backend.get(self.namespace, key) if self.backend is not None else None
+        if item is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        value, stored_at = item
+        remaining = self.ttl - max(0.0, time.time() - stored_at)
+        if remaining <= 0:
+            with self._lock:
+                self.misses += 1
+            return None
+        self._set_local(key, value, remaining)
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def set(self, key, value, ttl=None):
+        ttl = ttl or self.ttl
+        self._set_local(key, value, ttl)
+        if self.backend is not None:
+            self.backend.set(self.namespace, key, value, ttl=ttl)
+
+    def set_many(self, items, ttl=None):
+        """Store several (key, value) pairs; the shared backend gets them in one write."""
+        ttl = ttl or self.ttl
+        items = list(items)
+        for key, value in items:
+            self._set_local(key, value, ttl)
+        if self.backend is not None:
+            self.backend.set_many(self.namespace, items, ttl=ttl)
+
+    def _set_local(self, key, value, ttl):
+        size = estimate_memory(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            entry = [value, size, self._clock() + ttl, 0.0]
+            self._entries[key] = entry
+            self._bytes += size
+            self._touch(key, entry)
+            while self._bytes > self.max_bytes:
+                self._evict_one()
+            if len(self._heap) > 4 * len(self._entries) + 64:
+                self._compact()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._heap.clear()
+            self._bytes = 0
+            self._inflation = 0.0
+        if self.backend is not None:
+            self.backend.clear(self.namespace)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _touch(self, key, entry):
+        entry[3] = self._inflation + 1.0 / entry[1]
+        self._seq += 1
+        heapq.heappush(self._heap, (entry[3], self._seq, key))
+
+    def _evict_one(self):
+        now = self._clock()
+        while self._heap:
+            priority, _, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry[3] != priority:
+                continue  # superseded heap item
+            if entry[2] <= now:
+                self.expirations += 1
+            else:
+                self._inflation = priority
+                self.evictions += 1
+            self._remove(key)
+            return
+
+    def _compact(self):
+        now = self._clock()
+        for key in [k for k, e in self._entries.items() if e[2] <= now]:
+            self._remove(key)
+            self.expirations += 1
+        self._heap = [(e[3], i, k) for i, (k, e) in enumerate(self._entries.items())]
+        heapq.heapify(self._heap)
+        self._seq = len(self._heap)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[1]
+
+
+# -----------------------------------------------
+# 🚫 Negative cache (recent misses per provider)
+# -----------------------------------------------
+NOT_FOUND, EMPTY, ERROR = "not_found", "empty", "error"
+
+
+class NegativeCache:
+    """
+    Remembers recent misses per (provider, query or id) for a short, outcome-specific TTL:
+    "not_found" (the provider said 404), "empty" (no results) or "error" (timeout, 5xx, bad
+    payload). A repeated miss is then a dictionary lookup instead of another network call.
+    """
+
+    def __init__(self, ttls=None, max_entries=4096, clock=time.monotonic, backend=None, namespace="negative"):
+        self.ttls = {NOT_FOUND: 300, EMPTY: 60, ERROR: 15, **(ttls or {})}
+        self.max_entries = max_entries
+        self.backend = backend
+        self.namespace = namespace
+        self._clock = clock
+        self._entries = OrderedDict()  # (provider, key) -> (outcome, expires_at)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, NOT_FOUND: 0, EMPTY: 0, ERROR: 0}
+
+    @staticmethod
+    def _key(provider, key):
+        return (_normalize_part(provider),) + tuple(_normalize_part(part) for part in key)
+
+    def hit(self, provider, key):
+        """The remembered outcome for this call, or None when it should go to the provider."""
+        full_key = self._key(provider, key)
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[1] <= self._clock():
+                del self._entries[full_key]
+                entry = None
+        if entry is None and self.backend is not None:
+            item = self.backend.get(self.namespace, full_key)
+            if item is not None:
+                outcome, stored_at = item
+                remaining = self.ttls.get(outcome, 0) - max(0.0, time.time() - stored_at)
+                if remaining > 0:
+                    entry = (outcome, self._clock() + remaining)
+                    self._store(full_key, entry)
+        with self._lock:
+            self._stats["hits" if entry else "misses"] += 1
+        return entry[0] if entry else None
+
+    def record(self, provider, key, result):
+        """Remember an empty result; a non-empty one clears any earlier miss."""
+        if result:
+            self.forget(provider, key)
+        else:
+            self.remember(provider, key, EMPTY)
+
+    def record_error(self, provider, key, exc):
+        """404/410 responses are "not_found", anything else is a short-lived "error"."""
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+        self.remember(provider, key, NOT_FOUND if status in (404, 410) else ERROR)
+
+    def remember(self, provider, key, outcome):
+        full_key = self._key(provider, key)
+        ttl = self.ttls[outcome]
+        self._store(full_key, (outcome, self._clock() + ttl))
+        with self._lock:
+            self._stats[outcome] += 1
+        if self.backend is not None:
+            self.backend.set(self.namespace, full_key, outcome, ttl=ttl)
+
+    def _store(self, full_key, entry):
+        with self._lock:
+            self._entries[full_key] = entry
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def forget(self, provider, key):
+        full_key = self._key(provider, key)
+        with self._lock:
+            found = self._entries.pop(full_key, None)
+        if found is not None and self.backend is not None:
+            self.backend.delete(self.namespace, full_key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.clear(self.namespace)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+
+# -----------------------------------------------
+# ⚙️ Shared caches (L1 in process, L2 host-wide via CACHE_BACKEND)
+# -----------------------------------------------
+shared_backend = create_backend()
+
+# Concurrent identical provider calls share one upstream request (SINGLE_FLIGHT=host: across workers too)
+provider_flight = SingleFlight(backend=shared_backend, lock_dir=flight_lock_dir())
+
+search_cache = SearchCache(
+    backend=shared_backend,
+    flight=provider_flight,
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "256")),
+    max_bytes=int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(8 * 1024 * 1024))),
+    ttls={"fanout": 120, "mantiks": 300, "jsearch": 120, **_parse_ttls(os.getenv("SEARCH_CACHE_TTLS", ""))},
+    default_ttl=float(os.getenv("SEARCH_CACHE_TTL", "60")),
+    stale_ttl=float(os.getenv("SEARCH_CACHE_STALE_TTL", "600")),
+)
+
+detail_cache = DetailCache(
+    backend=shared_backend,
+    max_bytes=int(os.getenv("DETAIL_CACHE_MAX_BYTES", str(4 * 1024 * 1024))),
+    ttl=float(os.getenv("DETAIL_CACHE_TTL", "3600")),
+)
+
+negative_cache = NegativeCache(
+    backend=shared_backend,
+    ttls={k: v for k, v in _parse_ttls(os.getenv("NEGATIVE_CACHE_TTLS", "")).items() if k in (NOT_FOUND, EMPTY, ERROR)},
+)
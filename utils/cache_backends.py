@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_key(key):
+    return json.dumps(key, default=str, separators=(",", ":"))
+
+
+# -----------------------------------------------
+# 🧠 In-process backend (no sharing between workers)
+# -----------------------------------------------
+class MemoryBackend:
+    """Process-local backend; used when CACHE_BACKEND=memory or in tests."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace, key):
+        """Return (value, stored_at) or None. stored_at is wall-clock time.time()."""
+        item = self.get_entry(namespace, key)
+        return None if item is None else item[:2]
+
+    def get_entry(self, namespace, key):
+        """Return (value, stored_at, expires_at) or None."""
+        with self._lock:
+            item = self._data.get((namespace, _encode_key(key)))
+            if item is None:
+                return None
+            value, stored_at, expires_at = item
+            if expires_at <= time.time():
+                del self._data[(namespace, _encode_key(key))]
+                return None
+            return json.loads(value), stored_at, expires_at
+
+    def set(self, namespace, key, value, ttl, stored_at=None):
+        stored_at = stored_at or time.time()
+        with self._lock:
+            self._data[(namespace, _encode_key(key))] = (json.dumps(value, default=str), stored_at, stored_at + ttl)
+
+    def set_many(self, namespace, items, ttl):
+        for key, value in items:
+            self.set(namespace, key, value, ttl)
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._data.pop((namespace, _encode_key(key)), None)
+
+    def clear(self, namespace=None):
+        with self._lock:
+            if namespace is None:
+                self._data.clear()
+            else:
+                for k in [k for k in self._data if k[0] == namespace]:
+                    del self._data[k]
+
+
+# -----------------------------------------------
+# 💽 SQLite backend (shared by every worker on the host)
+# -----------------------------------------------
+class SQLiteBackend:
+    """
+    Key/value store in a local WAL-mode SQLite file. WAL lets readers in every gunicorn
+    worker proceed while one writer commits, so the file works as a host-wide cache.
+    Connections are opened lazily per thread and per process (safe across fork).
+    """
+
+    PRUNE_EVERY = 500  # writes between sweeps of expired rows
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL, expires_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_expires ON cache_entries (expires_at)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, namespace, key):
+        """Return (value, stored_at) or None. stored_at is wall-clock time.time()."""
+        item = self.get_entry(namespace, key)
+        return None if item is None else item[:2]
+
+    def get_entry(self, namespace, key):
+        """Return (value, stored_at, expires_at) or None."""
+        try:
+            row = self._conn().execute(
+                "SELECT value, stored_at, expires_at FROM cache_entries"
+                " WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, _encode_key(key), time.time()),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Shared cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1], row[2]
+
+    def set(self, namespace, key, value, ttl, stored_at=None):
+        stored_at = stored_at or time.time()
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, stored_at, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (namespace, _encode_key(key), json.dumps(value, default=str), stored_at, stored_at + ttl),
+            )
+            with self._lock:
+                self._writes += 1
+                prune = self._writes % self.PRUNE_EVERY == 0
+            if prune:
+                conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Shared cache write failed: {e}")
+
+    def set_many(self, namespace, items, ttl):
+        """Write several entries in one transaction (one fsync instead of one per job)."""
+        now = time.time()
+        rows = [(namespace, _encode_key(k), json.dumps(v, default=str), now, now + ttl) for k, v in items]
+        if not rows:
+            return
+        conn = None
+        try:
+            conn = self._conn()
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, stored_at, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Shared cache write failed: {e}")
+            if conn is not None and conn.in_transaction:
+                conn.execute("ROLLBACK")
+
+    def delete(self, namespace, key):
+        try:
+            self._conn().execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, _encode_key(key))
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Shared cache delete failed: {e}")
+
+    def clear(self, namespace=None):
+        try:
+            if namespace is None:
+                self._conn().execute("DELETE FROM cache_entries")
+            else:
+                self._conn().execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Shared cache clear failed: {e}")
+
+
+# -----------------------------------------------
+# ⚙️ Backend selection
+# -----------------------------------------------
+def _default_cache_path():
+    from config import Config
+    return os.path.join(os.path.dirname(Config.DB_PATH), "jobseeker_cache.db")
+
+
+def create_backend(kind=None, path=None):
+    """
+    Build the shared (L2) cache backend from CACHE_BACKEND / CACHE_DB_PATH.
+    "sqlite" (default) shares entries across workers; "memory" keeps them per process;
+    "none" disables the L2 layer entirely.
+    """
+    kind = (kind or os.getenv("CACHE_BACKEND", "sqlite")).lower()
+    if kind == "none":
+        return None
+    if kind == "memory":
+        return MemoryBackend()
+    return SQLiteBackend(path or os.getenv("CACHE_DB_PATH") or _default_cache_path())
@@ -0,0 +1,183 @@
+import re
+import random
+import hashlib
+import logging
+
+from utils.salary import with_salary_fields
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------
+# 🧬 Near-duplicate detection (MinHash + LSH)
+# -----------------------------------------------
+# The same posting comes back from Mantiks, Jooble, Adzuna, JSearch and the scrapers with
+# small differences (case, "Pvt Ltd", "Bangalore" vs "Bengaluru", truncated descriptions).
+# Each job gets a MinHash signature over character 3-grams of its title and company; LSH bands
+# find candidates in O(1), then the estimated Jaccard, the canonical location and (when both
+# have one) the description confirm them.
+NUM_PERM = 64
+BANDS = 16                  # 16 bands x 4 rows: candidates from ~50% similarity upwards
+IDENTITY_THRESHOLD = 0.75   # title + company + location similarity to call it the same job
+DESCRIPTION_THRESHOLD = 0.2 # when both descriptions are substantive they must overlap this much
+DESCRIPTION_WORDS = 40
+MIN_DESCRIPTION_WORDS = 15
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)  # fixed seed: signatures are comparable across processes
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_ROWS = NUM_PERM // BANDS
+
+_COMPANY_NOISE = re.compile(
+    r"\b(pvt|private|ltd|limited|llp|inc|incorporated|corp|corporation|co|company|india|the)\b")
+# Fields a duplicate may fill in when the kept copy lacks them
+_FILL_FIELDS = ("salary", "description", "url", "posted_date")
+_EMPTY = {"", "#", "n/a", "not disclosed", "no description available.", "no description available"}
+
+
+def _words(text):
+    return re.sub(r"[^a-z0-9 ]+", " ", str(text or "").lower()).split()
+
+
+def _company_key(company):
+    return " ".join(_COMPANY_NOISE.sub(" ", " ".join(_words(company))).split())
+
+
+def _hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+
+def _minhash(tokens):
+    hashes = [_hash(t) for t in tokens] or [0]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def _similarity(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def _char_grams(text, n=3):
+    text = f" {text} "
+    return {text[i:i + n] for i in range(max(1, len(text) - n + 1))}
+
+
+def identity_tokens(job):
+    """Shingles over normalized title and company."""
+    title = " ".join(_words(job.get("title")))
+    company = _company_key(job.get("company"))
+    return {f"t:{g}" for g in _char_grams(title)} | {f"c:{g}" for g in _char_grams(company)}
+
+
+def location_key(job):
+    """Canonical location id, or the normalized text for places outside the gazetteer."""
+    return job.get("location_id") or " ".join(_words(job.get("location"))) or None
+
+
+def description_tokens(job):
+    words = [w for w in _words(job.get("description")) if len(w) > 2][:DESCRIPTION_WORDS]
+    if len(words) < MIN_DESCRIPTION_WORDS:
+        return None
+    return {" ".join(words[i:i + 2]) for i in range(len(words) - 1)}
+
+
+def _is_empty(value):
+    return value is None or str(value).strip().lower() in _EMPTY
+
+
+def _own_copy(job):
+    """A kept job the filter may merge into without touching the caller's (cached) dict."""
+    job = dict(job)
+    if "other_sources" in job:
+        job["other_sources"] = list(job["other_sources"])
+    return job
+
+
+class NearDuplicateFilter:
+    """
+    Streaming dedup for one merge: `add(job)` returns a copy of the job if it is new, or None
+    when it duplicates one already kept. The kept copy lists the others in `other_sources` and
+    takes over fields it was missing (salary, description, ...); `merged_into` is the kept copy
+    the last duplicate was folded into. Callers' dicts (often shared cache entries) are never
+    changed. `other_sources` lives in search results only; the catalog does not store it.
+    """
+
+    def __init__(self, identity_threshold=IDENTITY_THRESHOLD, description_threshold=DESCRIPTION_THRESHOLD):
+        self.identity_threshold = identity_threshold
+        self.description_threshold = description_threshold
+        self._ids = {}
+        self._buckets = {}   # (band, band hash) -> [entry]
+        self.kept = 0
+        self.dropped = 0
+        self.merged_into = None
+
+    def add(self, job):
+        job_id = str(job.get("id") or "")
+        if job_id and job_id in self._ids:
+            return self._merge(self._ids[job_id], job)
+        job = _own_copy(job)
+
+        if _company_key(job.get("company")) in ("", "unknown") or not job.get("title"):
+            # Too little to compare on: only exact ids are deduplicated
+            if job_id:
+                self._ids[job_id] = {"job": job}
+            self.kept += 1
+            return job
+
+        signature = _minhash(identity_tokens(job))
+        desc = description_tokens(job)
+        desc_signature = _minhash(desc) if desc else None
+        location = location_key(job)
+        bands = [(b, signature[b * _ROWS:(b + 1) * _ROWS]) for b in range(BANDS)]
+
+        checked = set()
+        for band in bands:
+            for entry in self._buckets.get(band, ()):
+                if id(entry) in checked:
+                    continue
+                checked.add(id(entry))
+                if self._is_duplicate(entry, signature, desc_signature, location):
+                    if job_id:
+                        self._ids[job_id] = entry
+                    return self._merge(entry, job)
+
+        entry = {"job": job, "signature": signature, "desc": desc_signature, "location": location}
+        for band in bands:
+            self._buckets.setdefault(band, []).append(entry)
+        if job_id:
+            self._ids[job_id] = entry
+        self.kept += 1
+        return job
+
+    def _is_duplicate(self, entry, signature, desc_signature, location):
+        if entry["location"] and location and entry["location"] != location:
+            return False  # same role in another city is another opening
+        if _similarity(entry["signature"], signature) < self.identity_threshold:
+            return False
+        if entry["desc"] is None or desc_signature is None:
+            return True  # nothing to contradict the match
+        return _similarity(entry["desc"], desc_signature) >= self.description_threshold
+
+    def _merge(self, entry, duplicate):
+        kept = entry["job"]
+        if duplicate is not kept:
+            others = kept.setdefault("other_sources", [])
+            source = {"source": duplicate.get("source"), "id": duplicate.get("id"), "url": duplicate.get("url")}
+            if source["source"] != kept.get("source") or source["id"] != kept.get("id"):
+                if source not in others:
+                    others.append(source)
+            for name in _FILL_FIELDS:
+                if _is_empty(kept.get(name)) and not _is_empty(duplicate.get(name)):
+                    kept[name] = duplicate[name]
+                    if name == "salary" and "salary_currency" in kept:
+                        with_salary_fields(kept)
+        self.merged_into = kept
+        self.dropped += 1
+        return None
+
+
+def dedupe_jobs(jobs):
+    """Drop near-duplicates from a list, keeping the first copy of each posting."""
+    dedup = NearDuplicateFilter()
+    unique = [kept for kept in map(dedup.add, jobs) if kept is not None]
+    if dedup.dropped:
+        logger.info(f"🧬 Dropped {dedup.dropped} near-duplicate jobs, kept {len(unique)}")
+    return unique
@@ -0,0 +1,303 @@
+import os
+import re
+import logging
+from html.parser import HTMLParser
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------
+# 🧱 Precompiled selectors
+# -----------------------------------------------
+# The scrapers only need simple CSS: tag, .class, #id, [attr] / [attr='value'],
+# descendant combinators and selector lists. Compiling them once lets every engine
+# (BeautifulSoup, lxml XPath, streaming tokenizer) share the same card specs.
+_COMPOUND = re.compile(r"([a-zA-Z][a-zA-Z0-9-]*)?((?:[.#][\w-]+|\[[^\]]+\])*)")
+_PART = re.compile(r"\.([\w-]+)|#([\w-]+)|\[([\w-]+)(?:=['\"]?([^'\"\]]*)['\"]?)?\]")
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param",
+             "source", "track", "wbr"}
+
+
+class _Compound:
+    __slots__ = ("tag", "classes", "attrs")
+
+    def __init__(self, text):
+        match = _COMPOUND.fullmatch(text.strip())
+        if not match:
+            raise ValueError(f"unsupported selector: {text!r}")
+        self.tag = (match.group(1) or "").lower() or None
+        self.classes, self.attrs = set(), {}
+        for cls, id_, attr, value in _PART.findall(match.group(2) or ""):
+            if cls:
+                self.classes.add(cls)
+            elif id_:
+                self.attrs["id"] = id_
+            else:
+                self.attrs[attr] = value or None
+
+    def matches(self, tag, attrs):
+        if self.tag and self.tag != tag:
+            return False
+        if self.classes and not self.classes <= set((attrs.get("class") or "").split()):
+            return False
+        for name, value in self.attrs.items():
+            if name not in attrs or (value is not None and attrs[name] != value):
+                return False
+        return True
+
+    def xpath(self):
+        parts = [f"contains(concat(' ', normalize-space(@class), ' '), ' {c} ')" for c in sorted(self.classes)]
+        parts += [f"@{n}" if v is None else f"@{n}='{v}'" for n, v in self.attrs.items()]
+        return (self.tag or "*") + "".join(f"[{p}]" for p in parts)
+
+
+class Selector:
+    """A compiled selector list: "div.card, li.job", "h2.jobTitle span", "a[data-jk]"."""
+
+    def __init__(self, css):
+        self.css = css
+        self.chains = [[_Compound(p) for p in alt.split()] for alt in css.split(",") if alt.strip()]
+
+    def matches(self, stack):
+        """`stack` is the list of open (tag, attrs) inside the card, innermost last."""
+        tag, attrs = stack[-1]
+        for chain in self.chains:
+            if not chain[-1].matches(tag, attrs):
+                continue
+            i = len(chain) - 2
+            for anc_tag, anc_attrs in reversed(stack[:-1]):
+                if i < 0:
+                    break
+                if chain[i].matches(anc_tag, anc_attrs):
+                    i -= 1
+            if i < 0:
+                return True
+        return False
+
+    def xpath(self, relative=True):
+        prefix = ".//" if relative else "//"
+        return " | ".join(prefix + "//".join(c.xpath() for c in chain) for chain in self.chains)
+
+
+class Field:
+    """One value per card: the text (attr=None) or an attribute of the first match; selector=None is the card."""
+
+    def __init__(self, selector=None, attr=None):
+        self.selector = Selector(selector) if selector else None
+        self.attr = attr
+
+
+class CardSpec:
+    """Cards to extract, optionally inside a `container` (e.g. "#listContainer") the stream engine stops after."""
+
+    def __init__(self, card, fields, container=None):
+        self.card = Selector(card)
+        self.fields = fields
+        self.container = Selector(container) if container else None
+
+    def start_offset(self, html):
+        """Offset of the container's start tag when it has an id, so a tokenizer can skip the page header."""
+        if not self.container:
+            return 0
+        for chain in self.container.chains:
+            id_ = chain[0].attrs.get("id")
+            for quoted in (f'id="{id_}"', f"id='{id_}'") if id_ else ():
+                at = html.find(quoted)
+                if at != -1:
+                    return max(html.rfind("<", 0, at), 0)
+        return 0
+
+
+# -----------------------------------------------
+# 🥣 Engines: extract(html, spec) -> [{field: value}]
+# -----------------------------------------------
+class Bs4Engine:
+    name = "bs4"
+
+    def __init__(self, parser="html.parser"):
+        self.parser = parser
+
+    @staticmethod
+    def available():
+        return True
+
+    def extract(self, html, spec):
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, self.parser)
+        cards = []
+        for card in soup.select(spec.card.css):
+            row = {}
+            for name, field in spec.fields.items():
+                node = card if field.selector is None else card.select_one(field.selector.css)
+                if node is None:
+                    row[name] = None
+                elif field.attr:
+                    row[name] = node.get(field.attr)
+                else:
+                    row[name] = node.get_text().strip()
+            cards.append(row)
+        return cards
+
+
+class LxmlEngine:
+    """C-backed libxml2 parser with XPath compiled once per spec."""
+    name = "lxml"
+
+    def __init__(self):
+        self._compiled = {}
+
+    @staticmethod
+    def available():
+        try:
+            import lxml.html  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def _compile(self, spec):
+        from lxml import etree
+        if id(spec) not in self._compiled:
+            self._compiled[id(spec)] = (
+                etree.XPath(spec.card.xpath(relative=False)),
+                {name: (etree.XPath(f.selector.xpath()) if f.selector else None, f.attr)
+                 for name, f in spec.fields.items()},
+            )
+        return self._compiled[id(spec)]
+
+    def extract(self, html, spec):
+        import lxml.html
+        card_xpath, fields = self._compile(spec)
+        root = lxml.html.fromstring(html)
+        cards = []
+        for card in card_xpath(root):
+            row = {}
+            for name, (xpath, attr) in fields.items():
+                found = [card] if xpath is None else xpath(card)
+                node = found[0] if found else None
+                if node is None:
+                    row[name] = None
+                elif attr:
+                    row[name] = node.get(attr)
+                else:
+                    row[name] = node.text_content().strip()
+            cards.append(row)
+        return cards
+
+
+class _StopParsing(Exception):
+    pass
+
+
+class _CardTokenizer(HTMLParser):
+    """Streams tags, keeps only the card subtrees and stops when the cards' container closes."""
+
+    def __init__(self, spec):
+        super().__init__(convert_charrefs=True)
+        self.spec = spec
+        self.cards = []
+        self.open = []               # tag names of every open element
+        self.card_depth = None       # len(open) once the current card was opened
+        self.container_depth = None  # len(open) before the container was opened
+        self.stack = []              # open (tag, attrs) inside the current card
+        self.row = None
+        self.capturing = {}          # field -> [card stack depth, text parts]
+
+    def handle_starttag(self, tag, attr_list):
+        attrs = dict(attr_list)
+        void = tag in VOID_TAGS
+        if self.card_depth is None:
+            if self.container_depth is None and self.spec.container:
+                if self.spec.container.matches([(tag, attrs)]):
+                    self.container_depth = len(self.open)
+            elif self.spec.card.matches([(tag, attrs)]):
+                self.card_depth = len(self.open) + 1
+                self.stack = [(tag, attrs)]
+                self.row = {name: None for name in self.spec.fields}
+                self._match_fields(attrs, card=True)
+        else:
+            self.stack.append((tag, attrs))
+            self._match_fields(attrs)
+            if void:
+                self.stack.pop()
+        if not void:
+            self.open.append(tag)
+
+    def handle_startendtag(self, tag, attr_list):
+        self.handle_starttag(tag, attr_list)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def _match_fields(self, attrs, card=False):
+        for name, field in self.spec.fields.items():
+            if self.row[name] is not None or name in self.capturing:
+                continue
+            if (field.selector is None) != card:
+                continue
+            if field.selector is not None and not field.selector.matches(self.stack):
+                continue
+            if field.attr:
+                self.row[name] = attrs.get(field.attr)
+            else:
+                self.capturing[name] = [len(self.stack), []]
+
+    def handle_endtag(self, tag):
+        if tag not in self.open:
+            return  # stray end tag
+        # Like a browser, an end tag also closes any unclosed elements opened after it
+        while self.open:
+            closed = self.open.pop()
+            self._close_one()
+            if closed == tag:
+                break
+        if self.card_depth is None and self.container_depth is not None and len(self.open) <= self.container_depth:
+            raise _StopParsing()  # the card container is closed: nothing left to read
+
+    def _close_one(self):
+        if self.card_depth is None:
+            return
+        for name, (level, parts) in list(self.capturing.items()):
+            if len(self.stack) == level:
+                self.row[name] = "".join(parts).strip()
+                del self.capturing[name]
+        if self.stack:
+            self.stack.pop()
+        if len(self.open) < self.card_depth:
+            self.cards.append(self.row)
+            self.card_depth, self.row, self.stack, self.capturing = None, None, [], {}
+
+    def handle_data(self, data):
+        for _, parts in self.capturing.values():
+            parts.append(data)
+
+
+class StreamEngine:
+    """Pure-stdlib streaming tokenizer: builds no tree, skips to the card container and stops after it."""
+    name = "stream"
+
+    @staticmethod
+    def available():
+        return True
+
+    def extract(self, html, spec):
+        parser = _CardTokenizer(spec)
+        try:
+            parser.feed(html[spec.start_offset(html):])
+            parser.close()
+        except _StopParsing:
+            pass
+        hints = {cls for chain in spec.card.chains for cls in chain[-1].classes}
+        if not parser.cards and any(cls in html for cls in hints):
+            return Bs4Engine().extract(html, spec)  # markup too broken to stream: use the tree builder
+        return parser.cards
+
+
+ENGINES = {"bs4": Bs4Engine, "lxml": LxmlEngine, "stream": StreamEngine}
+
+
+def get_engine(name=None):
+    """The SCRAPER_ENGINE engine if available; default lxml, else the streaming tokenizer."""
+    name = (name or os.getenv("SCRAPER_ENGINE") or "").lower()
+    if name in ENGINES and ENGINES[name].available():
+        return ENGINES[name]()
+    if name:
+        logger.warning(f"⚠️ Extraction engine '{name}' unavailable, using default")
+    return LxmlEngine() if LxmlEngine.available() else StreamEngine()
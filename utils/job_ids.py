@@ -0,0 +1,122 @@
+import re
+import hashlib
+import logging
+import threading
+from collections import Counter, OrderedDict
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------
+# 🆔 Stable job ids
+# -----------------------------------------------
+# One scheme for every normalizer: "<source>:<native id>" when the provider has its own id,
+# otherwise "<source>_<hash>" over canonical title, company, location and URL. The same posting
+# gets the same id on every fetch or scrape, so caches, the catalog and saved jobs line up,
+# and two providers' numeric ids never share a key.
+HASH_CHARS = 16             # 64 bits of sha1
+NATIVE_SEP = ":"            # "adzuna:4412", never produced by the hashed ids
+MAX_ID_LENGTH = 100         # SavedJob.job_id / Application.job_id are String(100)
+# Un-namespaced ids from before native ids were namespaced that no detail API knows
+_LOCAL_PREFIXES = ("mock", "naukri", "indeed", "adzuna", "jooble")
+REGISTRY_SIZE = 50_000      # recent hash ids kept for collision accounting
+
+# Query parameters that change between fetches without changing the posting
+_VOLATILE_PARAMS = re.compile(r"^(utm_.*|src|source|ref|refid|from|sid|searchid|session.*|tracking.*|trk.*|"
+                              r"clickid|gclid|fbclid|xp|vjk|tk|jsa|_.*)$")
+
+_registry = OrderedDict()   # hash id -> canonical fingerprint
+_registry_lock = threading.Lock()
+stats = Counter()
+
+
+def _clean(text):
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", str(text or "").lower()).split())
+
+
+def canonical_url(url):
+    """Scheme-less, lowercase host, tracking parameters and fragment dropped; "" for placeholders."""
+    url = str(url or "").strip()
+    if not url or url == "#":
+        return ""
+    parts = urlsplit(url if "//" in url else f"//{url}")
+    query = sorted((k, v) for k, v in parse_qsl(parts.query) if not _VOLATILE_PARAMS.match(k.lower()))
+    path = parts.path.rstrip("/")
+    return f"{parts.netloc.lower()}{path}" + (f"?{urlencode(query)}" if query else "")
+
+
+def _source_prefix(source):
+    return _clean(source).split(" ")[0] or "job"
+
+
+def fingerprint(title=None, company=None, location=None, url=None):
+    return "|".join([_clean(title), _clean(company), _clean(location), canonical_url(url)])
+
+
+def make_job_id(source, native_id=None, title=None, company=None, location=None, url=None):
+    """
+    Stable id for a job. `native_id` (the provider's own id) wins when present and is
+    namespaced by source ("adzuna:4412"); otherwise the id is a hash of the canonical fields,
+    prefixed with the source ("naukri_3f9c...").
+    """
+    native = str(native_id or "").strip()
+    if native and native != "#":
+        with _registry_lock:
+            stats["native"] += 1
+        prefix = _source_prefix(source)
+        job_id = native if native.startswith(f"{prefix}{NATIVE_SEP}") else f"{prefix}{NATIVE_SEP}{native}"
+        if len(job_id) > MAX_ID_LENGTH:
+            # Too long to save: a hash id instead (local lookups only, never sent upstream)
+            with _registry_lock:
+                stats["native_too_long"] += 1
+            return f"{prefix}_{hashlib.sha1(job_id.encode()).hexdigest()[:HASH_CHARS]}"
+        return job_id  # already namespaced when re-normalizing a normalized job
+
+    canonical = fingerprint(title, company, location, url)
+    job_id = f"{_source_prefix(source)}_{hashlib.sha1(canonical.encode()).hexdigest()[:HASH_CHARS]}"
+    _account(job_id, canonical)
+    return job_id
+
+
+def provider_native_id(job_id, source):
+    """
+    The id to send to `source`'s own API: the namespace stripped from "<source>:<id>". None
+    when no provider API can know it: another provider's id, a hash id ("naukri_3f9c...") or
+    a mock / scraped id. Other older un-namespaced ids are passed on unchanged.
+    """
+    job_id = str(job_id or "")
+    prefix, sep, native = job_id.partition(NATIVE_SEP)
+    if sep:
+        return native if prefix == _source_prefix(source) else None
+    if not job_id or is_hash_id(job_id) or job_id.lower().startswith(_LOCAL_PREFIXES):
+        return None
+    return job_id
+
+
+def is_hash_id(job_id):
+    """True for "<source>_<hash>" ids made from a posting's fields."""
+    return re.fullmatch(rf"[a-z0-9]+_[0-9a-f]{{{HASH_CHARS}}}", str(job_id or "")) is not None
+
+
+def _account(job_id, canonical):
+    with _registry_lock:
+        seen = _registry.get(job_id)
+        if seen is None:
+            stats["hashed"] += 1
+            _registry[job_id] = canonical
+            if len(_registry) > REGISTRY_SIZE:
+                _registry.popitem(last=False)
+            return
+        _registry.move_to_end(job_id)
+        if seen == canonical:
+            stats["repeat"] += 1  # same posting seen again: the point of stable ids
+        else:
+            stats["collision"] += 1
+    if seen != canonical:
+        logger.warning(f"⚠️ Job id collision on {job_id}: {seen!r} vs {canonical!r}")
+
+
+def id_stats():
+    """Counters for /health: native ids, new hash ids, repeats of known ids and collisions."""
+    with _registry_lock:
+        return dict(stats, tracked=len(_registry))
@@ -0,0 +1,332 @@
+import re
+from functools import lru_cache
+
+# -----------------------------------------------
+# 🗺️ Indian location gazetteer
+# -----------------------------------------------
+# States / union territories: "Name|code|aliases"
+_STATES = """
+Andhra Pradesh|ap|andhra
+Arunachal Pradesh|ar|
+Assam|as|
+Bihar|br|
+Chhattisgarh|cg|chattisgarh,chhatisgarh
+Goa|ga|
+Gujarat|gj|gujrat
+Haryana|hr|
+Himachal Pradesh|hp|himachal
+Jharkhand|jh|
+Karnataka|ka|karnatak
+Kerala|kl|keralam
+Madhya Pradesh|mp|
+Maharashtra|mh|maharastra
+Manipur|mn|
+Meghalaya|ml|
+Mizoram|mz|
+Nagaland|nl|
+Odisha|od|orissa
+Punjab|pb|
+Rajasthan|rj|
+Sikkim|sk|
+Tamil Nadu|tn|tamilnadu
+Telangana|ts|telengana
+Tripura|tr|
+Uttar Pradesh|up|
+Uttarakhand|uk|uttaranchal
+West Bengal|wb|bengal
+Andaman and Nicobar Islands|an|andaman
+Chandigarh|ch|
+Dadra and Nagar Haveli and Daman and Diu|dd|daman,diu,dadra and nagar haveli
+Delhi|dl|nct of delhi,nct delhi
+Jammu and Kashmir|jk|j&k,jammu & kashmir,kashmir
+Ladakh|la|
+Lakshadweep|ld|
+Puducherry|py|pondicherry
+"""
+
+# Cities: "Name|state code|aliases"
+_CITIES = """
+Mumbai|mh|bombay,greater mumbai,mumbai suburban,andheri,powai,bkc
+Navi Mumbai|mh|new bombay,vashi,airoli
+Thane|mh|
+Pune|mh|poona,hinjewadi,kharadi,pimpri chinchwad,pimpri-chinchwad
+Nagpur|mh|
+Nashik|mh|nasik
+Aurangabad|mh|chhatrapati sambhajinagar
+Kolhapur|mh|
+Solapur|mh|sholapur
+Bengaluru|ka|bangalore,banglore,bengaluru urban,bangalore urban,blr,whitefield,electronic city,koramangala
+Mysuru|ka|mysore
+Mangaluru|ka|mangalore
+Hubballi|ka|hubli,hubli-dharwad
+Belagavi|ka|belgaum
+Chennai|tn|madras,chennai metropolitan,guindy,sholinganallur
+Coimbatore|tn|kovai
+Madurai|tn|
+Tiruchirappalli|tn|trichy,tiruchi
+Salem|tn|
+Tirunelveli|tn|
+Vellore|tn|
+Hosur|tn|
+Hyderabad|ts|secunderabad,cyberabad,hitec city,hitech city,gachibowli,hyd
+Warangal|ts|
+Visakhapatnam|ap|vizag,vishakhapatnam
+Vijayawada|ap|bezawada
+Guntur|ap|
+Tirupati|ap|
+Nellore|ap|
+Kolkata|wb|calcutta,salt lake,new town
+Howrah|wb|
+Durgapur|wb|
+Siliguri|wb|
+Asansol|wb|
+New Delhi|dl|delhi,new delhi,ncr,delhi ncr,dilli
+Gurugram|hr|gurgaon
+Faridabad|hr|
+Panipat|hr|
+Ambala|hr|
+Karnal|hr|
+Noida|up|gautam buddha nagar
+Greater Noida|up|
+Ghaziabad|up|
+Lucknow|up|
+Kanpur|up|cawnpore
+Agra|up|
+Varanasi|up|banaras,benares,kashi
+Prayagraj|up|allahabad
+Meerut|up|
+Ahmedabad|gj|amdavad,ahmadabad
+Gandhinagar|gj|gift city
+Surat|gj|
+Vadodara|gj|baroda
+Rajkot|gj|
+Jaipur|rj|pink city
+Jodhpur|rj|
+Udaipur|rj|
+Kota|rj|
+Ajmer|rj|
+Kochi|kl|cochin,ernakulam,kakkanad,infopark
+Thiruvananthapuram|kl|trivandrum,technopark
+Kozhikode|kl|calicut
+Thrissur|kl|trichur
+Indore|mp|
+Bhopal|mp|
+Gwalior|mp|
+Jabalpur|mp|
+Chandigarh|ch|tricity
+Mohali|pb|sas nagar,sahibzada ajit singh nagar
+Ludhiana|pb|
+Amritsar|pb|
+Jalandhar|pb|jullundur
+Patna|br|
+Gaya|br|
+Ranchi|jh|
+Jamshedpur|jh|tatanagar
+Dhanbad|jh|
+Bhubaneswar|od|bhubaneshwar
+Cuttack|od|
+Rourkela|od|
+Raipur|cg|
+Bhilai|cg|
+Guwahati|as|gauhati
+Dehradun|uk|dehra dun
+Haridwar|uk|
+Shimla|hp|simla
+Srinagar|jk|
+Jammu|jk|
+Panaji|ga|panjim
+Margao|ga|madgaon
+Puducherry|py|pondicherry,pondy
+"""
+
+# Cities the ingestion scheduler pre-warms (the metros users search most)
+METRO_CITIES = ["Ahmedabad", "Bengaluru", "Chennai", "Gurugram", "Hyderabad", "Indore", "Jaipur", "Kochi",
+                "Kolkata", "Lucknow", "Mumbai", "New Delhi", "Noida", "Pune"]
+
+COUNTRY_ID = "country:india"
+REMOTE_ID = "remote"
+_KIND_RANK = {"city": 0, "remote": 1, "state": 2, "country": 3}  # more specific wins
+
+
+def _clean(text):
+    return " ".join(re.sub(r"[^a-z0-9& ]+", " ", (text or "").lower()).split())
+
+
+def _slug(name):
+    return _clean(name).replace(" ", "-")
+
+
+class _Trie:
+    """Character trie over normalized names; each terminal holds the location ids using that name."""
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, word, location_id):
+        node = self.root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        ids = node.setdefault("$", [])
+        if location_id not in ids:
+            ids.append(location_id)
+
+    def longest_prefix(self, text, start):
+        """Longest name starting at `start` that ends on a word boundary: (end, ids) or (start, None)."""
+        node, best = self.root, (start, None)
+        for i in range(start, len(text)):
+            node = node.get(text[i])
+            if node is None:
+                break
+            if "$" in node and (i + 1 == len(text) or text[i + 1] == " "):
+                best = (i + 1, node["$"])
+        return best
+
+    def fuzzy(self, word, max_distance):
+        """Names within `max_distance` edits of `word` (Levenshtein over the trie): [(distance, ids)]."""
+        results = []
+        first_row = list(range(len(word) + 1))
+
+        def walk(node, ch, prev_row):
+            row = [prev_row[0] + 1]
+            for col in range(1, len(word) + 1):
+                cost = 0 if word[col - 1] == ch else 1
+                row.append(min(row[col - 1] + 1, prev_row[col] + 1, prev_row[col - 1] + cost))
+            if "$" in node and row[-1] <= max_distance:
+                results.append((row[-1], node["$"]))
+            if min(row) <= max_distance:
+                for next_ch, child in node.items():
+                    if next_ch != "$":
+                        walk(child, next_ch, row)
+
+        for ch, child in self.root.items():
+            if ch != "$":
+                walk(child, ch, first_row)
+        return results
+
+
+# -----------------------------------------------
+# 🏗️ Compile the gazetteer once at import
+# -----------------------------------------------
+LOCATIONS = {}  # id -> {"id", "name", "kind", "state"}
+_trie = _Trie()
+
+
+def _register(location_id, name, kind, state, aliases):
+    LOCATIONS.setdefault(location_id, {"id": location_id, "name": name, "kind": kind, "state": state})
+    for alias in [name] + aliases:
+        if _clean(alias):
+            _trie.add(_clean(alias), location_id)
+
+
+def _compile():
+    codes = {}
+    for line in _STATES.strip().splitlines():
+        name, code, aliases = line.split("|")
+        state_id = f"state:{_slug(name)}"
+        codes[code] = state_id
+        # Two-letter codes are only matched as whole words ("Noida, UP")
+        _register(state_id, name, "state", state_id, [code] + [a for a in aliases.split(",") if a])
+    for line in _CITIES.strip().splitlines():
+        name, code, aliases = line.split("|")
+        _register(f"city:{_slug(name)}", name, "city", codes[code], [a for a in aliases.split(",") if a])
+    _register(COUNTRY_ID, "India", "country", None, ["bharat", "ind", "pan india", "anywhere in india"])
+    _register(REMOTE_ID, "Remote", "remote", None, ["work from home", "wfh", "remote india", "anywhere",
+                                                    "hybrid remote", "home based"])
+
+
+_compile()
+
+
+def _best(ids):
+    return min((LOCATIONS[i] for i in ids), key=lambda loc: _KIND_RANK[loc["kind"]])
+
+
+def _max_typos(word):
+    return 0 if len(word) < 5 else 1 if len(word) < 9 else 2
+
+
+def _fuzzy_lookup(word):
+    matches = _trie.fuzzy(word, _max_typos(word))
+    if not matches:
+        return None
+    distance, ids = min(matches, key=lambda m: (m[0], _KIND_RANK[_best(m[1])["kind"]]))
+    return _best(ids)
+
+
+# -----------------------------------------------
+# 🔍 Lookups (memoized)
+# -----------------------------------------------
+@lru_cache(maxsize=4096)
+def resolve_location(text):
+    """
+    Canonical location for a user-typed place ("banglore", "Gurgaon", "tamilnadu"):
+    exact name/alias first, then typo-tolerant. Returns the gazetteer entry or None.
+    """
+    word = _clean(text)
+    if not word:
+        return None
+    end, ids = _trie.longest_prefix(word, 0)
+    if ids and end == len(word):
+        return _best(ids)
+    return _fuzzy_lookup(word)
+
+
+@lru_cache(maxsize=16384)
+def locate(text):
+    """
+    (location_id, state_id) for a job's free-text location ("Bangalore, Karnataka, India",
+    "Remote - Hyderabad"). The most specific place mentioned wins; (None, None) if none is known.
+    """
+    found = []
+    for segment in re.split(r"[,/|;()\-–]+", (text or "").lower()):
+        words = _clean(segment)
+        if not words:
+            continue
+        start, hits = 0, []
+        while start < len(words):
+            end, ids = _trie.longest_prefix(words, start)
+            if ids:
+                hits.append(_best(ids))
+                start = end + 1
+            else:
+                next_space = words.find(" ", start)
+                start = len(words) if next_space < 0 else next_space + 1
+        if not hits:
+            fuzzy = _fuzzy_lookup(words)
+            hits = [fuzzy] if fuzzy else []
+        found.extend(hits)
+
+    if not found:
+        return None, None
+    best = min(found, key=lambda loc: _KIND_RANK[loc["kind"]])
+    state = best["state"] or next((loc["state"] for loc in found if loc["state"]), None)
+    return best["id"], state
+
+
+def canonical_name(text):
+    """Display name for a search location; unknown places are title-cased as typed."""
+    if not text:
+        return "India"
+    location = resolve_location(text)
+    return location["name"] if location else text.strip().title()
+
+
+def with_location_fields(job):
+    """Add location_id / location_state to a normalized job dict (in place) and return it."""
+    job["location_id"], job["location_state"] = locate(job.get("location") or "")
+    if job.get("remote") and not job["location_id"]:
+        job["location_id"] = REMOTE_ID
+    return job
+
+
+def location_filter(text):
+    """
+    (column, id) to filter jobs on for a search location, e.g. ("location_id", "city:pune")
+    or ("location_state", "state:karnataka"); None when it is all of India or unknown.
+    """
+    location = resolve_location(text)
+    if not location or location["kind"] == "country":
+        return None
+    if location["kind"] == "state":
+        return "location_state", location["id"]
+    return "location_id", location["id"]
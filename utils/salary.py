@@ -0,0 +1,118 @@
+import re
+from functools import lru_cache
+
+# -----------------------------------------------
+# 💰 Salary normalizer
+# -----------------------------------------------
+# Turns provider salary text into numbers once, at ingest:
+#   "₹8,00,000-₹12,00,000"            -> 800000 .. 1200000 INR / year
+#   "₹12 LPA", "8-12 LPA", "₹10L - ₹15L" -> lakh amounts
+#   "₹1.2 crore", "₹50000+", "$40/hour", "₹60,000 per month"
+#   "₹8,00,000 - ₹12,00,000 per year"  (IndianJobService._format_salary)
+# Amounts are stored annualized so one indexed column answers every salary filter;
+# salary_period keeps the period the posting quoted.
+
+_UNITS = {
+    "k": 1_000, "l": 100_000, "lakh": 100_000, "lakhs": 100_000, "lac": 100_000, "lacs": 100_000,
+    "lpa": 100_000, "cr": 10_000_000, "crore": 10_000_000, "crores": 10_000_000,
+    "m": 1_000_000, "mn": 1_000_000, "million": 1_000_000,
+}
+_AMOUNT = re.compile(
+    r"(\d+(?:,\d+)*(?:\.\d+)?)\s*(lakhs|lakh|lacs|lac|lpa|crores|crore|cr|million|mn|k|l|m)?(?![a-z])")
+
+_CURRENCIES = (("₹", "INR"), ("inr", "INR"), ("rs", "INR"), ("$", "USD"), ("usd", "USD"),
+               ("£", "GBP"), ("gbp", "GBP"), ("€", "EUR"), ("eur", "EUR"))
+_PERIODS = (
+    ("hour", re.compile(r"hour|/\s*hr\b|\bhourly\b|/h\b")),
+    ("day", re.compile(r"\bday\b|/\s*day|\bdaily\b")),
+    ("week", re.compile(r"week")),
+    ("month", re.compile(r"month|/\s*mo\b|\bp\.?m\.?$|\bpm\b")),
+)
+_ANNUAL = {"year": 1, "month": 12, "week": 52, "day": 260, "hour": 2080}
+_NOT_SPECIFIED = {"salary_min": None, "salary_max": None, "salary_currency": None, "salary_period": None}
+
+
+@lru_cache(maxsize=8192)
+def _parse(text):
+    lowered = text.lower()
+    amounts = []
+    for number, unit in _AMOUNT.findall(lowered):
+        try:
+            value = float(number.replace(",", ""))
+        except ValueError:
+            continue
+        amounts.append([value, unit])
+    if not amounts:
+        return None
+
+    # "8-12 LPA": a unit written once applies to the whole range
+    if len(amounts) > 1 and not amounts[0][1] and amounts[1][1]:
+        amounts[0][1] = amounts[1][1]
+    values = [value * _UNITS.get(unit, 1) for value, unit in amounts[:2]]
+    if not any(values):
+        return None
+
+    currency = next((code for marker, code in _CURRENCIES
+                     if (marker in lowered if not marker.isalpha() else re.search(rf"\b{marker}\b", lowered))),
+                    "INR")
+    period = "year"
+    if "lpa" not in lowered and "annum" not in lowered and "year" not in lowered:
+        period = next((name for name, pattern in _PERIODS if pattern.search(lowered)), "year")
+
+    if len(values) == 1:
+        if re.search(r"\bup\s*to\b|\bupto\b|\bmax", lowered):
+            low, high = None, values[0]
+        elif "+" in lowered or re.search(r"\bfrom\b|\bmin", lowered):
+            low, high = values[0], None
+        else:
+            low = high = values[0]
+    else:
+        low, high = sorted(values)
+
+    factor = _ANNUAL[period]
+    return (
+        int(round(low * factor)) if low is not None else None,
+        int(round(high * factor)) if high is not None else None,
+        currency,
+        period,
+    )
+
+
+def parse_salary(value):
+    """
+    Parse a salary (text or number) into
+    {"salary_min", "salary_max", "salary_currency", "salary_period"} with annualized amounts.
+    Unparseable values ("₹ Not Specified", "N/A") give all None.
+    """
+    if value is None or isinstance(value, bool):
+        return dict(_NOT_SPECIFIED)
+    if isinstance(value, (int, float)):
+        amount = int(value) if value > 0 else None
+        return {"salary_min": amount, "salary_max": amount,
+                "salary_currency": "INR" if amount else None, "salary_period": "year" if amount else None}
+    parsed = _parse(" ".join(str(value).split())[:200])
+    if not parsed:
+        return dict(_NOT_SPECIFIED)
+    return dict(zip(("salary_min", "salary_max", "salary_currency", "salary_period"), parsed))
+
+
+def with_salary_fields(job):
+    """Add the numeric salary fields to a normalized job dict (in place) and return it."""
+    job.update(parse_salary(job.get("salary")))
+    return job
+
+
+def parse_salary_filter(value):
+    """
+    Annual INR amount for a salary_min filter. The search form sends lakhs ("8" = ₹8L+),
+    so small numbers are read as lakhs; anything else goes through parse_salary.
+    """
+    if value in (None, ""):
+        return None
+    try:
+        number = float(str(value).replace(",", ""))
+    except ValueError:
+        return parse_salary(value)["salary_min"]
+    if number <= 0:
+        return None
+    return int(number * 100_000) if number < 1000 else int(number)
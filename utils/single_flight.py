@@ -0,0 +1,159 @@
+import os
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import Counter
+
+try:
+    import fcntl  # POSIX only; cross-worker coalescing is skipped without it
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LOCK_STRIPES = 256  # lock files per directory; unrelated keys rarely share one
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+# -----------------------------------------------
+# 🛬 Single-flight: one upstream call per key at a time
+# -----------------------------------------------
+class SingleFlight:
+    """
+    Concurrent `do(key, fn)` calls for the same key share one `fn()` call: the first caller
+    runs it, the rest wait and get its result (or its exception).
+    With `lock_dir` the leader also takes a striped file lock, so workers on the same host
+    queue behind each other; a worker that had to wait reads the winner's result from the
+    shared `backend` (kept `share_ttl` seconds) instead of calling upstream again.
+    Waiting (for the in-process leader or another worker's lock) is bounded by `wait_timeout`
+    and the caller's `deadline_at`; past that the caller runs `fn()` itself.
+    """
+
+    def __init__(self, backend=None, lock_dir=None, namespace="flight", share_ttl=10, wait_timeout=30):
+        self.backend = backend
+        self.lock_dir = lock_dir if fcntl is not None else None
+        self.namespace = namespace
+        self.share_ttl = share_ttl
+        self.wait_timeout = wait_timeout
+        self._calls = {}
+        # Stripes this flight holds: flock is per open file, so a second flock on a held stripe
+        # (a nested flight hashing to it, or another thread's key) would wait on ourselves
+        self._held = Counter()
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0, "cross_worker_hits": 0, "timeouts": 0, "lock_timeouts": 0}
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    def _wait_for(self, deadline_at):
+        if deadline_at is None:
+            return self.wait_timeout
+        return max(0.0, min(self.wait_timeout, deadline_at - time.monotonic()))
+
+    def do(self, key, fn, deadline_at=None):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["leaders"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            if not call.done.wait(self._wait_for(deadline_at)):
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                logger.warning(f"⚠️ Single-flight leader for {key} is stuck, calling upstream")
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = self._run(key, fn, deadline_at)
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _run(self, key, fn, deadline_at=None):
+        if not self.lock_dir:
+            return fn()
+        stripe = int(hashlib.sha1(repr(key).encode("utf-8")).hexdigest(), 16) % LOCK_STRIPES
+        path = os.path.join(self.lock_dir, f"{stripe:03d}.lock")
+        with self._lock:
+            owner = self._held[path] == 0
+            self._held[path] += 1
+        try:
+            if not owner:
+                return self._call_and_share(key, fn)
+            with open(path, "a+") as lock_file:
+                state = self._acquire(lock_file, self._wait_for(deadline_at))
+                try:
+                    if state == "waited" and self.backend is not None:
+                        item = self.backend.get(self.namespace, key)
+                        if item is not None:
+                            with self._lock:
+                                self._stats["cross_worker_hits"] += 1
+                            return item[0]["value"]
+                    return self._call_and_share(key, fn)
+                finally:
+                    if state is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            with self._lock:
+                self._held[path] -= 1
+                if not self._held[path]:
+                    del self._held[path]
+
+    def _call_and_share(self, key, fn):
+        value = fn()
+        if self.backend is not None:
+            self.backend.set(self.namespace, key, {"value": value}, ttl=self.share_ttl)
+        return value
+
+    def _acquire(self, lock_file, timeout):
+        """
+        Take the file lock: "free" if nobody held it, "waited" if another worker held it first,
+        None if it was still held after `timeout` (fail open: the caller loads without it).
+        """
+        deadline = time.monotonic() + timeout
+        waited = False
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return "waited" if waited else "free"
+            except BlockingIOError:
+                pass
+            if time.monotonic() >= deadline:
+                with self._lock:
+                    self._stats["lock_timeouts"] += 1
+                logger.warning("⚠️ Single-flight lock still held by another worker, calling upstream")
+                return None
+            waited = True
+            time.sleep(0.02)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls), cross_worker=bool(self.lock_dir))
+
+
+def flight_lock_dir():
+    """SINGLE_FLIGHT=host coalesces across workers on this host (lock files in SINGLE_FLIGHT_LOCK_DIR)."""
+    if os.getenv("SINGLE_FLIGHT", "process").lower() != "host":
+        return None
+    return os.getenv("SINGLE_FLIGHT_LOCK_DIR") or os.path.join(tempfile.gettempdir(), "jobseeker-flight")
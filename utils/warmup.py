@@ -0,0 +1,76 @@
+import os
+import time
+import logging
+import threading
+
+from jinja2 import FileSystemBytecodeCache
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------
+# 🔥 Worker warm-up (after boot, off the request path)
+# -----------------------------------------------
+# Boot imports only what create_app needs; provider clients (and requests) load on the
+# first search. Warm-up pays those costs once the worker is up, so neither boot nor the
+# first user request does:
+#   background  (default) in a daemon thread right after create_app
+#   sync        before create_app returns (e.g. gunicorn --preload, forked workers share it)
+#   off         leave everything to the first request
+BOOT_WARMUP = os.getenv("BOOT_WARMUP", "background").lower()
+# Unset: Jinja's own per-user cache directory (created 0700, owner checked). Cached bytecode
+# is unmarshalled on load, so a directory set here must be one only the app user can write.
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR") or None
+
+
+def use_template_bytecode_cache(app, directory=TEMPLATE_CACHE_DIR):
+    """Share compiled templates across worker restarts (entries are checked against the source)."""
+    try:
+        if directory is None:
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+        else:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+    except (OSError, RuntimeError) as e:  # RuntimeError: Jinja found its default directory unsafe
+        logger.warning(f"⚠️ Template bytecode cache disabled: {e}")
+
+
+def precompile_templates(app):
+    """Compile every HTML template into the Jinja cache; returns how many compiled."""
+    compiled = 0
+    for name in app.jinja_env.list_templates(filter_func=lambda n: n.endswith(".html")):
+        try:
+            app.jinja_env.get_template(name)
+            compiled += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Template {name} failed to compile: {e}")
+    return compiled
+
+
+def import_providers():
+    """The provider clients the first search would otherwise import."""
+    import jobapi_client  # noqa: F401
+    import rapidapi_client  # noqa: F401
+
+
+def warm(app):
+    started = time.perf_counter()
+    compiled = precompile_templates(app)
+    try:
+        import_providers()
+    except Exception as e:
+        logger.warning(f"⚠️ Provider import during warm-up failed: {e}")
+    browsers = 0
+    try:
+        from services.browser_pool import warm_browsers
+        browsers = warm_browsers()
+    except Exception as e:
+        logger.warning(f"⚠️ Browser warm-up failed: {e}")
+    logger.info(f"🔥 Warm-up: {compiled} templates compiled, providers loaded, {browsers} browsers started in "
+                f"{(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+def start_warmup(app, mode=BOOT_WARMUP):
+    if mode == "sync":
+        warm(app)
+    elif mode == "background":
+        threading.Thread(target=warm, args=(app,), name="warmup", daemon=True).start()